@@ -30,26 +30,38 @@ from ._defaults import set_default_engine, set_default_format, set_jupyter_forma
 
 from .backend import (DOT_BINARY, UNFLATTEN_BINARY,
                       render, pipe, pipe_string, pipe_lines, pipe_lines_string,
-                      unflatten, version, view)
-from .exceptions import (ExecutableNotFound, CalledProcessError,
+                      unflatten, version, view,
+                      render_async, pipe_async, pipe_string_async,
+                      pipe_lines_async, pipe_lines_string_async,
+                      unflatten_async)
+from .exceptions import (ExecutableNotFound, CalledProcessError, BatchError,
                          RequiredArgumentError, FileExistsError,
                          UnknownSuffixWarning, FormatSuffixMismatchWarning,
                          DotSyntaxWarning)
 from .graphs import Graph, Digraph
 from .jupyter_integration import SUPPORTED_JUPYTER_FORMATS
 from .parameters import ENGINES, FORMATS, RENDERERS, FORMATTERS
+from .piping import pipe_many, pipe_parallel
+from .rendering import render_many, render_parallel
 from .quoting import escape, nohtml
 from .sources import Source
+from .writing import GraphWriter, DigraphWriter
 
 __all__ = ['ENGINES', 'FORMATS', 'RENDERERS', 'FORMATTERS',
            'DOT_BINARY', 'UNFLATTEN_BINARY',
            'SUPPORTED_JUPYTER_FORMATS',
            'Graph', 'Digraph',
            'Source',
+           'GraphWriter', 'DigraphWriter',
            'escape', 'nohtml',
            'render', 'pipe', 'pipe_string', 'pipe_lines', 'pipe_lines_string',
+           'pipe_many', 'render_many',
+           'pipe_parallel', 'render_parallel',
+           'render_async', 'pipe_async', 'pipe_string_async',
+           'pipe_lines_async', 'pipe_lines_string_async',
+           'unflatten_async',
            'unflatten', 'version', 'view',
-           'ExecutableNotFound', 'CalledProcessError',
+           'ExecutableNotFound', 'CalledProcessError', 'BatchError',
            'RequiredArgumentError', 'FileExistsError',
            'UnknownSuffixWarning', 'FormatSuffixMismatchWarning',
            'DotSyntaxWarning',
@@ -1,6 +1,8 @@
 """Generic re-useable self-contained helper functions."""
 
-from collections.abc import Callable, Iterator, Mapping
+from collections.abc import Callable, Iterable, Iterator, Mapping
+import concurrent.futures
+import contextvars
 import functools
 import inspect
 import itertools
@@ -15,6 +17,7 @@ __all__ = ['attach',
            'mapping_items',
            'promote_pathlike',
            'promote_pathlike_directory',
+           'map_parallel',
            'deprecate_positional_args']
 
 
@@ -105,6 +108,35 @@ def promote_pathlike_directory(directory: os.PathLike[str] | str | None, /, *,
                         else default or os.curdir)
 
 
+def map_parallel(func: Callable[[Any], Any], items: Iterable[Any], /, *,
+                 max_workers: int | None = None,
+                 ordered: bool = True) -> Iterator[tuple[int, Any]]:
+    """Yield ``(index, result)`` pairs calling ``func`` for ``items`` in a thread pool
+        (the result is the raised exception if the call failed).
+
+    >>> list(map_parallel(int, ['1', 'spam', '3']))  # doctest: +NO_EXE
+    [(0, 1), (1, ValueError("invalid literal for int() with base 10: 'spam'")), (2, 3)]
+    """
+    def call(item):
+        try:
+            return func(item)
+        except Exception as e:
+            return e
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(contextvars.copy_context().run, call, item): index
+                   for index, item in enumerate(items)}
+        try:
+            for future in (futures if ordered
+                           else concurrent.futures.as_completed(futures)):
+                yield futures[future], future.result()
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+
 def deprecate_positional_args(*,
                               supported_number: int,
                               ignore_arg: str | None = None,
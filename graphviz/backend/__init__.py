@@ -1,20 +1,36 @@
 """Execute rendering and unflattening subprocesses, open files in viewer."""
 
+from .caching import (DiskCache, ErrorCache, CacheInfo,
+                      get_disk_cache, set_disk_cache,
+                      get_error_cache, set_error_cache)
 from .dot_command import DOT_BINARY
-from .execute import ExecutableNotFound, CalledProcessError
+from .execute import ExecutableNotFound, CalledProcessError, BatchError
 from .mixins import Render, Pipe, Unflatten, View
-from .piping import pipe, pipe_string, pipe_lines, pipe_lines_string
-from .rendering import render
-from .unflattening import UNFLATTEN_BINARY, unflatten
+from .piping import (pipe, pipe_string, pipe_lines, pipe_lines_string,
+                     pipe_batch, pipe_multi,
+                     pipe_lines_to, pipe_lines_iter,
+                     pipe_async, pipe_string_async,
+                     pipe_lines_async, pipe_lines_string_async)
+from .rendering import render, render_async, render_batch, render_multi
+from .unflattening import UNFLATTEN_BINARY, unflatten, unflatten_async
 from .upstream_version import version
 from .viewing import view
 
 __all__ = ['DOT_BINARY', 'UNFLATTEN_BINARY',
-           'render',
+           'render', 'render_batch', 'render_multi',
            'pipe', 'pipe_string',
            'pipe_lines', 'pipe_lines_string',
+           'pipe_lines_to', 'pipe_lines_iter',
+           'pipe_batch', 'pipe_multi',
            'unflatten',
+           'render_async',
+           'pipe_async', 'pipe_string_async',
+           'pipe_lines_async', 'pipe_lines_string_async',
+           'unflatten_async',
            'version',
            'view',
-           'ExecutableNotFound', 'CalledProcessError',
+           'DiskCache', 'ErrorCache', 'CacheInfo',
+           'get_disk_cache', 'set_disk_cache',
+           'get_error_cache', 'set_error_cache',
+           'ExecutableNotFound', 'CalledProcessError', 'BatchError',
            'Render', 'Pipe', 'Unflatten', 'View']
@@ -0,0 +1,481 @@
+"""Cache layout outputs on disk and failures in memory keyed by input and command."""
+
+from collections.abc import Callable, Iterable, Sequence
+import contextlib
+import hashlib
+import logging
+import os
+import pathlib
+import shutil
+import tempfile
+import threading
+import time
+from typing import Final, NamedTuple
+
+from . import execute
+from . import upstream_version
+
+__all__ = ['DiskCache', 'ErrorCache', 'CacheInfo',
+           'get_disk_cache', 'set_disk_cache',
+           'get_error_cache', 'set_error_cache']
+
+DEFAULT_MAX_BYTES: Final = 2**30
+
+DEFAULT_ERROR_TTL: Final = 60.0
+
+DEFAULT_MAX_ERRORS: Final = 1_024
+
+TEMP_PREFIX: Final = '.tmp-'
+
+RESCAN_DIVISOR: Final = 16
+
+
+log = logging.getLogger(__name__)
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of a :class:`.DiskCache` (counted in this process)."""
+
+    hits: int
+
+    misses: int
+
+    evictions: int
+
+    currsize: int
+    """Size in bytes of the cached outputs (as of the last directory scan)."""
+
+    maxsize: int
+
+
+def input_hasher():
+    """Return a new BLAKE2b hash object for the input digest (see :func:`hash_input`)."""
+    return hashlib.blake2b(digest_size=32)
+
+
+def hash_input(data: bytes | Iterable[bytes]) -> bytes:
+    """Return the BLAKE2b digest of ``data`` (``bytes`` or iterable of chunks)."""
+    hasher = input_hasher()
+    for chunk in ([data] if isinstance(data, bytes) else data):
+        hasher.update(chunk)
+    return hasher.digest()
+
+
+def _digest(version: tuple[int, ...], cmd: Sequence[os.PathLike[str] | str],
+            input_digest: bytes, *,
+            executable: tuple[str, int] | None = None) -> str:
+    header = '\0'.join(['.'.join(map(str, version)),
+                        *(map(str, executable) if executable is not None else []),
+                        *(os.fspath(a) for a in cmd[1:])])
+    hasher = hashlib.blake2b(header.encode('utf-8') + b'\0\0', digest_size=32)
+    hasher.update(input_digest)
+    return hasher.hexdigest()
+
+
+def _stat_executable(cmd: Sequence[os.PathLike[str] | str]) -> tuple[str, int]:
+    """Return the resolved path and modification time of the executable of ``cmd``
+        (``-1`` if it is not found)."""
+    path = os.fspath(cmd[0])
+    path = shutil.which(path) or path
+    try:
+        return path, os.stat(path).st_mtime_ns
+    except OSError:
+        return path, -1
+
+
+class DiskCache:
+    """Content-addressed cache of layout outputs in ``directory``.
+
+    Args:
+        directory: Directory for the cached outputs (created if missing).
+        max_bytes: Maximal total size of the cached outputs in bytes,
+            least recently used outputs are evicted beyond it.
+        version: Graphviz version tuple included into the keys
+            (default: :func:`graphviz.version`, queried again
+            when the path or modification time of the executable changes).
+
+    Outputs are written atomically (temporary file and :func:`os.replace`)
+    and read hits update the file modification time,
+    so the directory can be shared between processes.
+    The directory is not locked: each process rescans it
+    after writing ``max_bytes // 16`` bytes (or beyond ``max_bytes``),
+    so with several writers it can exceed ``max_bytes`` by that much per process.
+
+    Example:
+        >>> import graphviz  # doctest: +NO_EXE
+        >>> cache = graphviz.backend.DiskCache('doctest-output/cache',
+        ...                                    max_bytes=2**20, version=(2, 44))
+        >>> key = cache.key(b'graph { spam }', ['dot', '-Kdot', '-Tsvg'])
+        >>> cache.get(key) is None
+        True
+        >>> cache.put(key, b'<svg/>')
+        >>> cache.get(key)
+        b'<svg/>'
+        >>> cache.clear()
+    """
+
+    def __init__(self, directory: os.PathLike[str] | str, *,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 version: tuple[int, ...] | None = None) -> None:
+        self.directory = pathlib.Path(directory)
+        self.max_bytes = max_bytes
+        self._fixed_version = version
+        self._version = version
+        self._executable: tuple[str, int] | None = None
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._evictions = 0
+        self._size: int | None = None
+        self._written = 0
+
+    def __repr__(self) -> str:
+        return (f'{self.__class__.__name__}({os.fspath(self.directory)!r},'
+                f' max_bytes={self.max_bytes!r})')
+
+    def key(self, data: bytes, cmd: Sequence[os.PathLike[str] | str]) -> str:
+        """Return the hex digest of ``data`` for the layout command ``cmd``.
+
+        Args:
+            data: Encoded DOT source (``bytes`` or iterable of chunks).
+            cmd: Layout command without input and output file arguments.
+
+        Returns:
+            Hexadecimal BLAKE2b digest of the Graphviz version,
+            the resolved path and modification time of the executable,
+            the arguments of ``cmd``, and ``data``.
+        """
+        return self._key(hash_input(data), cmd)
+
+    def _key(self, input_digest: bytes, cmd: Sequence[os.PathLike[str] | str]) -> str:
+        executable = _stat_executable(cmd)
+        return _digest(self._get_version(executable), cmd, input_digest,
+                       executable=executable)
+
+    def _get_version(self, executable: tuple[str, int]) -> tuple[int, ...]:
+        if self._fixed_version is not None:
+            return self._fixed_version
+        if self._version is None or executable != self._executable:
+            version = upstream_version.version()
+            with self._lock:
+                self._version = version
+                self._executable = executable
+        assert self._version is not None
+        return self._version
+
+    def _path(self, key: str) -> pathlib.Path:
+        return self.directory / key[:2] / key
+
+    def get(self, key: str) -> bytes | None:
+        """Return the cached output for ``key`` (``None`` if not cached)."""
+        path = self._path(key)
+        try:
+            result = path.read_bytes()
+        except FileNotFoundError:
+            with self._lock:
+                self._misses += 1
+            return None
+
+        with contextlib.suppress(OSError):  # evicted meanwhile
+            os.utime(path)
+        with self._lock:
+            self._hits += 1
+        return result
+
+    def put(self, key: str, output: bytes) -> None:
+        """Store ``output`` for ``key`` atomically, evict beyond :attr:`max_bytes`."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=TEMP_PREFIX, dir=path.parent)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(output)
+            os.replace(tmp_name, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_name)
+            raise
+
+        with self._lock:
+            self._written += len(output)
+            if self._size is not None:
+                self._size += len(output)
+            if (self._size is None or self._size > self.max_bytes
+                or self._written >= self.max_bytes // RESCAN_DIVISOR):  # noqa: E129
+                self._evict()
+
+    def _evict(self) -> None:
+        """Scan the directory and delete least recently used outputs beyond the limit
+            (counting the outputs written by other processes)."""
+        entries = []
+        for path in self.directory.glob('*/*'):
+            if path.name.startswith(TEMP_PREFIX):
+                continue
+            with contextlib.suppress(FileNotFoundError):
+                stat = path.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+        size = sum(s for _, s, _ in entries)
+        entries.sort(key=lambda e: e[0])
+        for _, file_size, path in entries:
+            if size <= self.max_bytes:
+                break
+            log.debug('evict %r', path)
+            with contextlib.suppress(FileNotFoundError):  # evicted by another process
+                path.unlink()
+                self._evictions += 1
+            size -= file_size
+        self._size = size
+        self._written = 0
+
+    def cache_info(self) -> CacheInfo:
+        """Return the hit/miss/eviction counters and the size of the cache."""
+        with self._lock:
+            if self._size is None:
+                self._evict()
+            assert self._size is not None
+            return CacheInfo(self._hits, self._misses, self._evictions,
+                             self._size, self.max_bytes)
+
+    def clear(self) -> None:
+        """Delete all cached outputs and reset the counters."""
+        with self._lock:
+            for path in self.directory.glob('*/*'):
+                if not path.name.startswith(TEMP_PREFIX):
+                    with contextlib.suppress(FileNotFoundError):
+                        path.unlink()
+            self._hits = self._misses = self._evictions = 0
+            self._size = 0
+            self._written = 0
+
+
+class ErrorCache:
+    """Short-lived in-memory cache of failed layout commands.
+
+    Args:
+        ttl: Seconds to re-raise a stored failure
+            without starting the layout subprocess again.
+        max_entries: Maximal number of stored failures
+            (the oldest are evicted beyond it).
+        version: Graphviz version tuple included into the keys
+            (default: the resolved path and modification time of the executable,
+            :func:`graphviz.version` is checked when a stored failure is found
+            at most every ``ttl`` seconds, the stored failures are cleared if it changes).
+
+    Example:
+        >>> import graphviz  # doctest: +NO_EXE
+        >>> errors = graphviz.backend.ErrorCache(ttl=30, version=(2, 44))
+        >>> key = errors.key(b'graph {', ['dot', '-Kdot', '-Tsvg'])
+        >>> errors.put(key, graphviz.CalledProcessError(1, ['dot'], b'',
+        ...                                             b'syntax error in line 1'))
+        >>> errors.get(key).stderr
+        b'syntax error in line 1'
+    """
+
+    def __init__(self, *, ttl: float = DEFAULT_ERROR_TTL,
+                 max_entries: int = DEFAULT_MAX_ERRORS,
+                 version: tuple[int, ...] | None = None,
+                 _clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._fixed_version = version
+        self._version = version
+        self._version_checked: float | None = None
+        self._clock = _clock
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[float, execute.CalledProcessError]] = {}
+        self._hits = self._misses = self._evictions = 0
+
+    def __repr__(self) -> str:
+        return (f'{self.__class__.__name__}(ttl={self.ttl!r},'
+                f' max_entries={self.max_entries!r})')
+
+    def key(self, data: bytes, cmd: Sequence[os.PathLike[str] | str]) -> str:
+        """Return the hex digest of ``data`` for ``cmd`` (see :meth:`.DiskCache.key`)."""
+        return self._key(hash_input(data), cmd)
+
+    def _key(self, input_digest: bytes, cmd: Sequence[os.PathLike[str] | str]) -> str:
+        if self._fixed_version is not None:
+            return _digest(self._fixed_version, cmd, input_digest)
+        return _digest((), cmd, input_digest, executable=_stat_executable(cmd))
+
+    def _check_version(self) -> bool:
+        """Return ``False`` if the Graphviz version changed (clearing the stored failures)."""
+        if self._fixed_version is not None:
+            return True
+        now = self._clock()
+        if self._version_checked is not None and now - self._version_checked < self.ttl:
+            return True
+        version = upstream_version.version()
+        with self._lock:
+            changed = self._version is not None and version != self._version
+            if changed:
+                log.debug('clear error cache for Graphviz version %r', version)
+                self._entries.clear()
+            self._version = version
+            self._version_checked = now
+        return not changed
+
+    def get(self, key: str) -> execute.CalledProcessError | None:
+        """Return a copy of the unexpired failure stored for ``key`` (or ``None``)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self._clock():
+                del self._entries[key]
+                self._evictions += 1
+                entry = None
+
+        if entry is not None and not self._check_version():
+            entry = None
+
+        with self._lock:
+            if entry is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+
+        e = entry[1]
+        return e.__class__(e.returncode, e.cmd, output=e.output, stderr=e.stderr)
+
+    def put(self, key: str, error: execute.CalledProcessError) -> None:
+        """Store ``error`` for ``key`` for :attr:`ttl` seconds."""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (self._clock() + self.ttl, error)
+            while len(self._entries) > self.max_entries:
+                del self._entries[next(iter(self._entries))]
+                self._evictions += 1
+
+    def cache_info(self) -> CacheInfo:
+        """Return the hit/miss/eviction counters and the number of stored failures."""
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._evictions,
+                             len(self._entries), self.max_entries)
+
+    def clear(self) -> None:
+        """Delete all stored failures and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+
+
+class CacheLookup:
+    """Look up and store the output of one layout command in the enabled caches."""
+
+    def __init__(self, cmd: Sequence[os.PathLike[str] | str], input_digest: bytes, *,
+                 disk_cache: DiskCache | None,
+                 error_cache: ErrorCache | None) -> None:
+        self._disk = ((disk_cache, disk_cache._key(input_digest, cmd))
+                      if disk_cache else None)
+        self._errors = ((error_cache, error_cache._key(input_digest, cmd))
+                        if error_cache else None)
+
+    def get(self) -> bytes | None:
+        """Return the cached output (or ``None``), raise a stored failure."""
+        if self._errors is not None:
+            (errors, key) = self._errors
+            if (error := errors.get(key)) is not None:
+                log.debug('error cache hit %r', key)
+                raise error
+        if self._disk is not None:
+            (disk, key) = self._disk
+            if (output := disk.get(key)) is not None:
+                log.debug('disk cache hit %r', key)
+                return output
+        return None
+
+    def put(self, output: bytes) -> None:
+        if self._disk is not None:
+            (disk, key) = self._disk
+            disk.put(key, output)
+
+    def put_error(self, error: execute.CalledProcessError) -> None:
+        if self._errors is not None:
+            (errors, key) = self._errors
+            errors.put(key, error)
+
+
+def enabled() -> bool:
+    """Return ``True`` if a :class:`.DiskCache` or :class:`.ErrorCache` is used."""
+    return _disk_cache is not None or _error_cache is not None
+
+
+def lookup_needed() -> bool:
+    """Return ``True`` if the used caches can hold an output or failure for any input
+        (i.e. the input must be hashed before starting the layout subprocess)."""
+    return (_disk_cache is not None
+            or (_error_cache is not None and _error_cache.cache_info().currsize > 0))
+
+
+def lookup(cmd: Sequence[os.PathLike[str] | str],
+           data: bytes | Iterable[bytes] | None = None, *,
+           input_digest: bytes | None = None) -> CacheLookup:
+    """Return a :class:`.CacheLookup` for ``cmd`` and ``data`` in the used caches
+        (``bytes`` or iterable of chunks, or its :func:`hash_input` ``input_digest``)."""
+    if input_digest is None:
+        assert data is not None
+        input_digest = hash_input(data)
+    return CacheLookup(cmd, input_digest,
+                       disk_cache=_disk_cache, error_cache=_error_cache)
+
+
+_disk_cache: DiskCache | None = None
+
+
+def get_disk_cache() -> DiskCache | None:
+    """Return the :class:`.DiskCache` used for piping and rendering (or ``None``)."""
+    return _disk_cache
+
+
+def set_disk_cache(cache: DiskCache | None) -> DiskCache | None:
+    """Use ``cache`` for the outputs of piping and rendering (``None``: disable).
+
+    Args:
+        cache: The :class:`.DiskCache` to look up outputs in
+            before starting a layout subprocess.
+
+    Returns:
+        The previously used cache (or ``None``).
+
+    Note:
+        Used by :func:`graphviz.pipe`, :func:`graphviz.pipe_string`,
+        :func:`graphviz.pipe_lines`, :func:`graphviz.pipe_lines_string`,
+        and :func:`graphviz.render` (and the methods calling them).
+        Outputs for cached inputs are returned
+        without starting a subprocess and without its ``stderr`` warnings.
+        External files referenced by the source (e.g. images)
+        are not part of the key.
+    """
+    global _disk_cache
+
+    old = _disk_cache
+    _disk_cache = cache
+    return old
+
+
+_error_cache: ErrorCache | None = None
+
+
+def get_error_cache() -> ErrorCache | None:
+    """Return the :class:`.ErrorCache` used for piping and rendering (or ``None``)."""
+    return _error_cache
+
+
+def set_error_cache(cache: ErrorCache | None) -> ErrorCache | None:
+    """Re-raise failures stored in ``cache`` without starting the layout subprocess.
+
+    Args:
+        cache: The :class:`.ErrorCache` storing :exc:`graphviz.CalledProcessError`
+            failures of piping and rendering (``None``: disable).
+
+    Returns:
+        The previously used cache (or ``None``).
+
+    Note:
+        Used by the same functions as :func:`set_disk_cache`.
+        Re-raised failures are new instances with the stored ``stderr``,
+        which is not written to :data:`sys.stderr` again.
+    """
+    global _error_cache
+
+    old = _error_cache
+    _error_cache = cache
+    return old
@@ -1,5 +1,6 @@
 """Check and assemble commands for running Graphviz ``dot``."""
 
+from collections.abc import Sequence
 import os
 import pathlib
 from typing import Final
@@ -12,31 +13,54 @@ __all__ = ['DOT_BINARY', 'command']
 DOT_BINARY: Final = pathlib.Path('dot')
 
 
-def command(engine: str, format_: str, *,
+def command(engine: str, format_: str | Sequence[str], *,
             renderer: str | None = None,
             formatter: str | None = None,
-            neato_no_op: bool | int | None = None) -> list[os.PathLike[str] | str]:
+            neato_no_op: bool | int | None = None,
+            outfiles: Sequence[os.PathLike[str] | str] | None = None,
+            ) -> list[os.PathLike[str] | str]:
     """Return ``subprocess.Popen`` argument list for rendering.
 
+    If ``format_`` is a sequence of formats, one ``-T`` flag is added for each
+    (followed by ``-o`` with the corresponding item of ``outfiles`` if given),
+    so that the graph is laid out once and written in all formats.
+
+    >>> command('dot', ['svg', 'png'], outfiles=['spam.svg', 'spam.png'])[1:]
+    ['-Kdot', '-Tsvg', '-ospam.svg', '-Tpng', '-ospam.png']
+
     See also:
         Upstream documentation:
         - https://www.graphviz.org/doc/info/command.html#-K
         - https://www.graphviz.org/doc/info/command.html#-T
+        - https://www.graphviz.org/doc/info/command.html#-o
         - https://www.graphviz.org/doc/info/command.html#-n
     """
     if formatter is not None and renderer is None:
         raise exceptions.RequiredArgumentError('formatter given without renderer')
 
+    formats = [format_] if isinstance(format_, str) or format_ is None else list(format_)
+    if not formats:
+        raise exceptions.RequiredArgumentError('format_: (at least one format required,'
+                                               f' got {format_!r})')
+    if outfiles is not None and len(outfiles) != len(formats):
+        raise ValueError(f'outfiles: {len(outfiles)} given'
+                         f' (must match the number of formats: {len(formats)})')
+
     parameters.verify_engine(engine, required=True)
-    parameters.verify_format(format_, required=True)
+    for f in formats:
+        parameters.verify_format(f, required=True)
     parameters.verify_renderer(renderer, required=False)
     parameters.verify_formatter(formatter, required=False)
 
-    output_format = [f for f in (format_, renderer, formatter) if f is not None]
-    output_format_flag = ':'.join(output_format)
-
     cmd: list[os.PathLike[str] | str]
-    cmd = [DOT_BINARY, f'-K{engine}', f'-T{output_format_flag}']
+    cmd = [DOT_BINARY, f'-K{engine}']
+
+    for i, format_ in enumerate(formats):
+        output_format = [f for f in (format_, renderer, formatter) if f is not None]
+        output_format_flag = ':'.join(output_format)
+        cmd.append(f'-T{output_format_flag}')
+        if outfiles is not None:
+            cmd.append(f'-o{os.fspath(outfiles[i])}')
 
     if neato_no_op:
         cmd.append(f'-n{neato_no_op:d}')
@@ -1,17 +1,23 @@
 """Run subprocesses with ``subprocess.run()`` and ``subprocess.Popen()``."""
 
-from collections.abc import Iterator, Sequence
+import asyncio
+from collections.abc import Callable, Iterable, Iterator, Sequence
+import concurrent.futures
+import contextlib
 import errno
-import io
 import logging
 import os
+import socket
 import subprocess
 import sys
+import threading
 from typing import TypeAlias, overload
 
 from .. import _compat
 
-__all__ = ['run_check', 'ExecutableNotFound', 'CalledProcessError']
+__all__ = ['run_check', 'run_check_iter', 'run_check_async',
+           'popen_input', 'start_reading', 'communicate_check',
+           'ExecutableNotFound', 'CalledProcessError', 'BatchError']
 
 
 log = logging.getLogger(__name__)
@@ -19,6 +25,10 @@ log = logging.getLogger(__name__)
 
 BytesOrStrIterator: TypeAlias = Iterator[bytes] | Iterator[str]
 
+INPUT_CHUNK_SIZE = 2**16
+
+OUTPUT_CHUNK_SIZE = 2**16
+
 
 @overload
 def run_check(cmd: Sequence[os.PathLike[str] | str], *,
@@ -52,10 +62,17 @@ def run_check(cmd: Sequence[os.PathLike[str] | str], *,
               input_lines: BytesOrStrIterator | None = None,
               encoding: str | None = None,
               quiet: bool = False,
+              sink=None,
+              chunk_size: int = OUTPUT_CHUNK_SIZE,
               **kwargs) -> subprocess.CompletedProcess:
     """Run the command described by ``cmd``
         with ``check=True`` and return its completed process.
 
+    With ``input_lines`` or ``sink``, ``stdin`` is written in chunks
+    from a thread while ``stdout`` and ``stderr`` are read,
+    ``stdout`` is passed in chunks of up to ``chunk_size`` to ``sink`` if given
+    (callable or object with ``write()``, ``stdout`` of the result is ``None``).
+
     Raises:
         CalledProcessError: if the returncode of the subprocess is non-zero.
     """
@@ -68,13 +85,18 @@ def run_check(cmd: Sequence[os.PathLike[str] | str], *,
 
     kwargs.setdefault('startupinfo', _compat.get_startupinfo())  # type: ignore[func-returns-value]
 
+    if sink is not None and input_lines is None:
+        input = kwargs.pop('input', None)
+        input_lines = iter([input] if input is not None else [])
+
     try:
         if input_lines is not None:
             assert kwargs.get('input') is None
             assert iter(input_lines) is input_lines
-            if kwargs.pop('capture_output'):
+            if kwargs.pop('capture_output', False):
                 kwargs['stdout'] = kwargs['stderr'] = subprocess.PIPE
-            proc = _run_input_lines(cmd, input_lines, kwargs=kwargs)
+            proc = _run_input_lines(cmd, input_lines, sink=sink,
+                                    chunk_size=chunk_size, kwargs=kwargs)
         else:
             proc = subprocess.run(cmd, **kwargs)
     except OSError as e:
@@ -82,6 +104,207 @@ def run_check(cmd: Sequence[os.PathLike[str] | str], *,
             raise ExecutableNotFound(cmd) from e
         raise
 
+    return _check(proc, quiet=quiet)
+
+
+def run_check_iter(cmd: Sequence[os.PathLike[str] | str], *,
+                   input_lines: Iterator[bytes],
+                   chunk_size: int = OUTPUT_CHUNK_SIZE,
+                   quiet: bool = False,
+                   **kwargs) -> Iterator[bytes]:
+    """Yield the ``stdout`` of the command described by ``cmd`` in chunks
+        (``stdin`` written from a thread, killed if iteration stops early).
+
+    Raises:
+        ExecutableNotFound: if the executable of ``cmd`` is not found.
+        CalledProcessError: if the returncode of the subprocess is non-zero
+            (after the last chunk).
+    """
+    log.debug('run iter %r', cmd)
+    popen = popen_input(cmd, capture_output=True, **kwargs)
+    done = False
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as pool:
+            writing = pool.submit(_write_input, popen.stdin, input_lines)
+            reading_stderr = pool.submit(_read_output, popen.stderr)
+            try:
+                read = popen.stdout.read1  # type: ignore[union-attr]
+                while chunk := read(chunk_size):
+                    yield chunk
+                done = True
+            finally:
+                if not done:
+                    popen.kill()
+    finally:
+        for stream in (popen.stdout, popen.stderr):
+            if stream is not None:
+                stream.close()
+        popen.wait()
+
+    writing.result()
+    proc = subprocess.CompletedProcess(popen.args, popen.returncode,
+                                       stdout=None, stderr=reading_stderr.result())
+    _check(proc, quiet=quiet)
+
+
+async def run_check_async(cmd: Sequence[os.PathLike[str] | str], *,
+                          input: bytes | str | None = None,
+                          input_lines: BytesOrStrIterator | None = None,
+                          encoding: str | None = None,
+                          capture_output: bool = False,
+                          quiet: bool = False,
+                          **kwargs) -> subprocess.CompletedProcess:
+    """Run the command described by ``cmd`` with :mod:`asyncio`
+        and return its completed process (kill it when cancelled).
+
+    Raises:
+        ExecutableNotFound: if the executable of ``cmd`` is not found.
+        CalledProcessError: if the returncode of the subprocess is non-zero.
+    """
+    log.debug('run async %r', cmd)
+    if input is not None:
+        assert input_lines is None
+        input_lines = iter([input])  # type: ignore[assignment]
+
+    if input_lines is not None:
+        kwargs['stdin'] = asyncio.subprocess.PIPE
+
+    if capture_output:
+        kwargs['stdout'] = kwargs['stderr'] = asyncio.subprocess.PIPE
+
+    kwargs.setdefault('startupinfo', _compat.get_startupinfo())  # type: ignore[func-returns-value]
+
+    try:
+        process = await asyncio.create_subprocess_exec(*cmd, **kwargs)
+    except OSError as e:
+        if e.errno == errno.ENOENT:
+            raise ExecutableNotFound(cmd) from e
+        raise
+
+    output = asyncio.gather(_read_all(process.stdout), _read_all(process.stderr))
+    try:
+        if input_lines is not None:
+            await _feed_input_lines(process.stdin, input_lines, encoding=encoding)
+        (stdout, stderr) = await output
+        returncode = await process.wait()
+    except BaseException:  # including asyncio.CancelledError
+        with contextlib.suppress(ProcessLookupError):
+            process.kill()
+        output.cancel()
+        # collect the readers so that no task is left pending or unretrieved
+        with contextlib.suppress(asyncio.CancelledError, Exception):
+            await output
+        await asyncio.shield(process.wait())
+        raise
+
+    proc: subprocess.CompletedProcess = subprocess.CompletedProcess(cmd, returncode,
+                                                                    stdout=stdout,
+                                                                    stderr=stderr)
+    if encoding is not None:
+        proc.stdout = proc.stdout.decode(encoding) if stdout is not None else None
+        proc.stderr = proc.stderr.decode(encoding) if stderr is not None else None
+    return _check(proc, quiet=quiet)
+
+
+async def _feed_input_lines(stdin: asyncio.StreamWriter | None,
+                            input_lines: BytesOrStrIterator, *,
+                            encoding: str | None) -> None:
+    """Write ``input_lines`` to ``stdin`` in chunks waiting for the pipe to drain."""
+    assert stdin is not None
+    try:
+        for chunk in _iterchunks(input_lines):
+            stdin.write(chunk.encode(encoding) if encoding is not None else chunk)
+            await stdin.drain()
+    except (BrokenPipeError, ConnectionResetError):  # pragma: no cover
+        pass  # subprocess exited early, its returncode is checked
+    finally:
+        stdin.close()
+
+
+async def _read_all(stream: asyncio.StreamReader | None) -> bytes | None:
+    return await stream.read() if stream is not None else None
+
+
+def popen_input(cmd: Sequence[os.PathLike[str] | str], *,
+                encoding: str | None = None,
+                capture_output: bool = False,
+                **kwargs) -> subprocess.Popen:
+    """Start the command described by ``cmd`` reading from a ``stdin`` pipe
+        and return its running process (finish with :func:`communicate_check`,
+        use :func:`start_reading` before writing to it incrementally).
+
+    Raises:
+        ExecutableNotFound: if the executable of ``cmd`` is not found.
+    """
+    log.debug('popen %r', cmd)
+    if encoding is not None:
+        kwargs['encoding'] = encoding
+
+    if capture_output:
+        kwargs['stdout'] = kwargs['stderr'] = subprocess.PIPE
+
+    kwargs.setdefault('startupinfo', _compat.get_startupinfo())  # type: ignore[func-returns-value]
+
+    try:
+        return subprocess.Popen(cmd, stdin=subprocess.PIPE, **kwargs)
+    except OSError as e:
+        if e.errno == errno.ENOENT:
+            raise ExecutableNotFound(cmd) from e
+        raise
+
+
+def start_reading(popen: subprocess.Popen) -> Callable[[], tuple]:
+    """Read ``stdout`` and ``stderr`` of the running ``popen`` from threads
+        (not blocking it on full pipes while writing to ``stdin``)
+        and return the function finishing it like :meth:`subprocess.Popen.communicate`.
+    """
+    output: dict[int, bytes | str | None] = {}
+
+    def read(fd: int, stream) -> None:
+        output[fd] = _read_output(stream)
+
+    threads = [threading.Thread(target=read, args=(fd, stream), daemon=True)
+               for fd, stream in ((1, popen.stdout), (2, popen.stderr))
+               if stream is not None]
+    for t in threads:
+        t.start()
+
+    def communicate() -> tuple:
+        if popen.stdin is not None:
+            with contextlib.suppress(BrokenPipeError):
+                popen.stdin.close()
+        for t in threads:
+            t.join()
+        for stream in (popen.stdout, popen.stderr):
+            if stream is not None:
+                stream.close()
+        popen.wait()
+        return output.get(1), output.get(2)
+
+    return communicate
+
+
+def communicate_check(popen: subprocess.Popen, *,
+                      quiet: bool = False,
+                      communicate: Callable[[], tuple] | None = None,
+                      ) -> subprocess.CompletedProcess:
+    """Close ``stdin`` of the running ``popen``, wait for it to terminate,
+        and return its completed process
+        (finish with ``communicate`` from :func:`start_reading` if given).
+
+    Raises:
+        CalledProcessError: if the returncode of the subprocess is non-zero.
+    """
+    if communicate is None:
+        communicate = popen.communicate
+    (stdout, stderr) = communicate()
+    proc = subprocess.CompletedProcess(popen.args, popen.returncode,
+                                       stdout=stdout, stderr=stderr)
+    return _check(proc, quiet=quiet)
+
+
+def _check(proc: subprocess.CompletedProcess, *,
+           quiet: bool) -> subprocess.CompletedProcess:
     if not quiet and proc.stderr:
         _write_stderr(proc.stderr)
 
@@ -93,19 +316,85 @@ def run_check(cmd: Sequence[os.PathLike[str] | str], *,
     return proc
 
 
-def _run_input_lines(cmd, input_lines, *, kwargs):
+def _run_input_lines(cmd, input_lines, *, sink=None,
+                     chunk_size: int = OUTPUT_CHUNK_SIZE, kwargs):
+    """Write ``input_lines`` from a thread while reading ``stdout`` and ``stderr``."""
+    write = _get_write(sink) if sink is not None else None
     popen = subprocess.Popen(cmd, stdin=subprocess.PIPE, **kwargs)
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as pool:
+            writing = pool.submit(_write_input, popen.stdin, input_lines)
+            reading_stderr = (pool.submit(_read_output, popen.stderr)
+                              if popen.stderr is not None else None)
+            try:
+                stdout = (_read_output(popen.stdout, write=write, size=chunk_size)
+                          if popen.stdout is not None else None)
+                stderr = reading_stderr.result() if reading_stderr is not None else None
+                writing.result()
+            except BaseException:
+                popen.kill()
+                raise
+    finally:
+        for stream in (popen.stdout, popen.stderr):
+            if stream is not None:
+                stream.close()
+        popen.wait()
 
-    assert isinstance(popen.stdin, io.IOBase)
-    stdin_write = popen.stdin.write
-    for line in input_lines:
-        stdin_write(line)
-
-    (stdout, stderr) = popen.communicate()
     return subprocess.CompletedProcess(popen.args, popen.returncode,
                                        stdout=stdout, stderr=stderr)
 
 
+def _write_input(stdin, input_lines: BytesOrStrIterator) -> None:
+    try:
+        for chunk in _iterchunks(input_lines):
+            stdin.write(chunk)
+    except BrokenPipeError:  # pragma: no cover
+        pass  # subprocess exited early, its returncode is checked
+    finally:
+        with contextlib.suppress(BrokenPipeError):
+            stdin.close()
+
+
+def _read_output(stream, *,
+                 write: Callable[[bytes], object] | None = None,
+                 size: int = OUTPUT_CHUNK_SIZE) -> bytes | str | None:
+    if write is None:
+        return stream.read()
+    read = getattr(stream, 'read1', stream.read)
+    while chunk := read(size):
+        write(chunk)
+    return None
+
+
+def _iterchunks(lines: Iterable, *, size: int = INPUT_CHUNK_SIZE) -> Iterator:
+    """Yield ``lines`` joined into chunks of at least ``size`` (except the last)."""
+    chunk: list = []
+    length = 0
+    for line in lines:
+        chunk.append(line)
+        length += len(line)
+        if length >= size:
+            yield chunk[0][:0].join(chunk)
+            chunk = []
+            length = 0
+    if chunk:
+        yield chunk[0][:0].join(chunk)
+
+
+def _get_write(sink) -> Callable[[bytes], object]:
+    """Return the function writing chunks to ``sink``
+        (callable, :class:`bytearray`, :class:`socket.socket`, or file object)."""
+    if isinstance(sink, socket.socket):
+        return sink.sendall
+    if isinstance(sink, bytearray):
+        return sink.extend
+    if callable(sink):
+        return sink
+    if (write := getattr(sink, 'write', None)) is not None:
+        return write
+    raise TypeError(f'sink must be callable or writable: {sink!r}')
+
+
 def _write_stderr(stderr) -> None:
     if isinstance(stderr, bytes):
         stderr_encoding = (getattr(sys.stderr, 'encoding', None)
@@ -132,3 +421,18 @@ class CalledProcessError(subprocess.CalledProcessError):
 
     def __str__(self) -> str:
         return f'{super().__str__()} [stderr: {self.stderr!r}]'
+
+
+class BatchError(CalledProcessError):
+    """:exc:`CalledProcessError` raised if a subprocess for a batch of inputs fails."""
+
+    def __init__(self, *args, index: int | None = None,
+                 results: list | None = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.index = index
+        """Position of the input that caused the failure (``None`` if unknown)."""
+        self.results = results if results is not None else []
+        """Outputs completed for the inputs (``None`` for inputs without output)."""
+
+    def __str__(self) -> str:
+        return f'{super().__str__()} [input index: {self.index!r}]'
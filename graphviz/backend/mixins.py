@@ -35,6 +35,16 @@ class Render(parameters.Parameters):
         """Simplify ``._render()`` mocking."""
         return rendering.render
 
+    @property
+    def _render_async(_):  # noqa: N805
+        """Simplify ``._render_async()`` mocking."""
+        return rendering.render_async
+
+    @property
+    def _render_multi(_):  # noqa: N805
+        """Simplify ``._render_multi()`` mocking."""
+        return rendering.render_multi
+
 
 class Pipe(parameters.Parameters):
     """Parameters for calling and calling ``graphviz.pipe()``."""
@@ -53,6 +63,31 @@ class Pipe(parameters.Parameters):
         """Simplify ``._pipe_lines_string()`` mocking."""
         return piping.pipe_lines_string
 
+    @property
+    def _pipe_lines_to(_):  # noqa: N805
+        """Simplify ``._pipe_lines_to()`` mocking."""
+        return piping.pipe_lines_to
+
+    @property
+    def _pipe_lines_iter(_):  # noqa: N805
+        """Simplify ``._pipe_lines_iter()`` mocking."""
+        return piping.pipe_lines_iter
+
+    @property
+    def _pipe_multi(_):  # noqa: N805
+        """Simplify ``._pipe_multi()`` mocking."""
+        return piping.pipe_multi
+
+    @property
+    def _pipe_lines_async(_):  # noqa: N805
+        """Simplify ``._pipe_lines_async()`` mocking."""
+        return piping.pipe_lines_async
+
+    @property
+    def _pipe_lines_string_async(_):  # noqa: N805
+        """Simplify ``._pipe_lines_string_async()`` mocking."""
+        return piping.pipe_lines_string_async
+
 
 class Unflatten:
 
@@ -61,6 +96,11 @@ class Unflatten:
         """Simplify ``._unflatten mocking."""
         return unflattening.unflatten
 
+    @property
+    def _unflatten_async(_):  # noqa: N805
+        """Simplify ``._unflatten_async mocking."""
+        return unflattening.unflatten_async
+
 
 class View:
     """Open filepath with its default viewing application
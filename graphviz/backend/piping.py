@@ -1,14 +1,34 @@
 """Pipe bytes, strings, or string iterators through Graphviz ``dot``."""
 
-from collections.abc import Iterator
+import bisect
+from collections.abc import Iterable, Iterator
+import functools
+import itertools
+import os
+import pathlib
+import re
+import tempfile
 
 from .. import _tools
 
+from . import caching
 from . import dot_command
 from . import execute
 
 __all__ = ['pipe', 'pipe_string',
-           'pipe_lines', 'pipe_lines_string']
+           'pipe_lines', 'pipe_lines_string',
+           'pipe_lines_to', 'pipe_lines_iter',
+           'pipe_batch', 'pipe_multi',
+           'pipe_async', 'pipe_string_async',
+           'pipe_lines_async', 'pipe_lines_string_async']
+
+BATCH_OUTFILE = re.compile(r'noname\.gv(?:\.(\d+))?\.')
+
+BATCH_ERROR_LINE = re.compile(rb'^Error: .*? line (\d+)', flags=re.MULTILINE)
+
+MULTI_OUTFILE = 'noname.gv'
+
+SPOOL_MAX_SIZE = 2**22
 
 
 @_tools.deprecate_positional_args(supported_number=3)
@@ -54,6 +74,9 @@ def pipe(engine: str, format: str, data: bytes,
                               renderer=renderer,
                               formatter=formatter,
                               neato_no_op=neato_no_op)
+    if caching.enabled():
+        return _run_cached(cmd, data, quiet=quiet)
+
     kwargs = {'input': data}
 
     proc = execute.run_check(cmd, capture_output=True, quiet=quiet, **kwargs)  # type: ignore[call-overload]  # https://github.com/python/mypy/issues/18481  # noqa: E501
@@ -105,6 +128,10 @@ def pipe_string(engine: str, format: str, input_string: str, *,
                               renderer=renderer,
                               formatter=formatter,
                               neato_no_op=neato_no_op)
+    if caching.enabled():
+        return _decode(_run_cached(cmd, input_string.encode(encoding), quiet=quiet),
+                       encoding)
+
     kwargs = {'input': input_string, 'encoding': encoding}
 
     proc = execute.run_check(cmd, capture_output=True, quiet=quiet, **kwargs)  # type: ignore[call-overload]  # https://github.com/python/mypy/issues/18481  # noqa: E501
@@ -156,12 +183,112 @@ def pipe_lines(engine: str, format: str, input_lines: Iterator[str], *,
                               renderer=renderer,
                               formatter=formatter,
                               neato_no_op=neato_no_op)
+    if caching.enabled():
+        return _run_cached_lines(cmd, (line.encode(input_encoding) for line in input_lines),
+                                 quiet=quiet)
+
     kwargs = {'input_lines': (line.encode(input_encoding) for line in input_lines)}
 
     proc = execute.run_check(cmd, capture_output=True, quiet=quiet, **kwargs)  # type: ignore[call-overload]  # https://github.com/python/mypy/issues/18481  # noqa: E501
     return proc.stdout
 
 
+def pipe_lines_to(engine: str, format: str, input_lines: Iterator[str], sink, *,
+                  input_encoding: str,
+                  renderer: str | None = None,
+                  formatter: str | None = None,
+                  neato_no_op: bool | int | None = None,
+                  quiet: bool = False,
+                  chunk_size: int = execute.OUTPUT_CHUNK_SIZE) -> None:
+    r"""Write ``input_lines`` piped through ``engine`` into ``format`` to ``sink``.
+
+    Args:
+        engine: Layout engine for rendering (``'dot'``, ``'neato'``, ...).
+        format: Output format for rendering (``'pdf'``, ``'png'``, ...).
+        input_lines: DOT source lines to render (including final newline).
+        sink: Binary file object, :class:`socket.socket`, :class:`bytearray`,
+            or callable receiving the ``bytes`` chunks of the output.
+        input_encoding: Encode input_lines for subprocess stdin (required).
+        renderer: Output renderer (``'cairo'``, ``'gd'``, ...).
+        formatter: Output formatter (``'cairo'``, ``'gd'``, ...).
+        neato_no_op: Neato layout engine no-op flag.
+        quiet: Suppress ``stderr`` output from the layout subprocess.
+        chunk_size: Maximal size of the chunks passed to ``sink``.
+
+    Raises:
+        ValueError: If ``engine``, ``format``, ``renderer``, or ``formatter``
+            are unknown.
+        graphviz.RequiredArgumentError: If ``formatter`` is given
+            but ``renderer`` is None.
+        TypeError: If ``sink`` is neither callable nor writable.
+        graphviz.ExecutableNotFound: If the Graphviz ``dot`` executable
+            is not found.
+        graphviz.CalledProcessError: If the returncode (exit status)
+            of the rendering ``dot`` subprocess is non-zero.
+
+    Example:
+        >>> doctest_mark_exe()
+        >>> import graphviz
+        >>> buf = bytearray()
+        >>> graphviz.backend.pipe_lines_to('dot', 'svg', iter(['graph { spam }\n']),
+        ...                                buf, input_encoding='ascii')
+        >>> buf[:14]
+        bytearray(b'<?xml version=')
+
+    Note:
+        The output is passed to ``sink`` while the layout command is running
+        instead of being collected in memory.
+    """
+    cmd = dot_command.command(engine, format,
+                              renderer=renderer,
+                              formatter=formatter,
+                              neato_no_op=neato_no_op)
+    encoded_lines = (line.encode(input_encoding) for line in input_lines)
+
+    execute.run_check(cmd, input_lines=encoded_lines, capture_output=True,
+                      quiet=quiet, sink=sink, chunk_size=chunk_size)
+
+
+def pipe_lines_iter(engine: str, format: str, input_lines: Iterator[str], *,
+                    input_encoding: str,
+                    renderer: str | None = None,
+                    formatter: str | None = None,
+                    neato_no_op: bool | int | None = None,
+                    quiet: bool = False,
+                    chunk_size: int = execute.OUTPUT_CHUNK_SIZE) -> Iterator[bytes]:
+    r"""Return an iterator over the chunks of ``input_lines``
+        piped through ``engine`` into ``format``.
+
+    See :func:`.pipe_lines_to` for the arguments and exceptions.
+
+    Returns:
+        Iterator yielding ``bytes`` chunks (of up to ``chunk_size``)
+        of the binary stdout of the layout command.
+
+    Example:
+        >>> doctest_mark_exe()
+        >>> import graphviz
+        >>> chunks = graphviz.backend.pipe_lines_iter('dot', 'svg',
+        ...                                           iter(['graph { spam }\n']),
+        ...                                           input_encoding='ascii')
+        >>> next(chunks)[:14]
+        b'<?xml version='
+
+    Note:
+        The layout command is started on the first :func:`next`
+        and killed if the iterator is closed before its end.
+        :exc:`graphviz.CalledProcessError` is raised after the last chunk.
+    """
+    cmd = dot_command.command(engine, format,
+                              renderer=renderer,
+                              formatter=formatter,
+                              neato_no_op=neato_no_op)
+    encoded_lines = (line.encode(input_encoding) for line in input_lines)
+
+    return execute.run_check_iter(cmd, input_lines=encoded_lines,
+                                  chunk_size=chunk_size, quiet=quiet)
+
+
 def pipe_lines_string(engine: str, format: str, input_lines: Iterator[str], *,
                       encoding: str,
                       renderer: str | None = None,
@@ -207,7 +334,381 @@ def pipe_lines_string(engine: str, format: str, input_lines: Iterator[str], *,
                               renderer=renderer,
                               formatter=formatter,
                               neato_no_op=neato_no_op)
+    if caching.enabled():
+        return _decode(_run_cached_lines(cmd, (line.encode(encoding) for line in input_lines),
+                                         quiet=quiet),
+                       encoding)
+
     kwargs = {'input_lines': input_lines, 'encoding': encoding}
 
     proc = execute.run_check(cmd, capture_output=True, quiet=quiet, **kwargs)  # type: ignore[call-overload]  # https://github.com/python/mypy/issues/18481  # noqa: E501
     return proc.stdout
+
+
+def _run_cached(cmd, data: bytes, *, quiet: bool) -> bytes:
+    """Return the cached output for ``data`` or run ``cmd`` and cache its result."""
+    lookup = caching.lookup(cmd, data)
+    if (output := lookup.get()) is not None:
+        return output
+    return _run_stored(lookup, cmd, quiet=quiet, input=data)
+
+
+def _run_cached_lines(cmd, input_lines: Iterator[bytes], *, quiet: bool) -> bytes:
+    """Return the cached output for ``input_lines`` or run ``cmd`` and cache its result
+        (spooling the input into a temporary file beyond ``SPOOL_MAX_SIZE``
+        unless only failures are cached and none is stored)."""
+    if not caching.lookup_needed():
+        hasher = caching.input_hasher()
+
+        def hashed_lines() -> Iterator[bytes]:
+            for line in input_lines:
+                hasher.update(line)
+                yield line
+
+        lines = hashed_lines()
+        try:
+            proc = execute.run_check(cmd, input_lines=lines, capture_output=True, quiet=quiet)
+        except execute.CalledProcessError as e:
+            for _ in lines:  # hash the lines not read by the failed subprocess
+                pass
+            caching.lookup(cmd, input_digest=hasher.digest()).put_error(e)
+            raise
+        return proc.stdout
+
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as spool:
+        def spooled_lines() -> Iterator[bytes]:
+            for line in input_lines:
+                spool.write(line)
+                yield line
+
+        lookup = caching.lookup(cmd, spooled_lines())
+        if (output := lookup.get()) is not None:
+            return output
+        spool.seek(0)
+        chunks = iter(functools.partial(spool.read, execute.INPUT_CHUNK_SIZE), b'')
+        return _run_stored(lookup, cmd, quiet=quiet, input_lines=chunks)
+
+
+def _run_stored(lookup: caching.CacheLookup, cmd, *, quiet: bool, **kwargs) -> bytes:
+    """Run ``cmd`` and store its output (or failure) with ``lookup``."""
+    try:
+        proc = execute.run_check(cmd, capture_output=True, quiet=quiet, **kwargs)
+    except execute.CalledProcessError as e:
+        lookup.put_error(e)
+        raise
+    lookup.put(proc.stdout)
+    return proc.stdout
+
+
+def _decode(output: bytes, encoding: str) -> str:
+    """Decode ``output`` with universal newlines (like text mode subprocess pipes)."""
+    return output.decode(encoding).replace('\r\n', '\n').replace('\r', '\n')
+
+
+async def pipe_async(engine: str, format: str, data: bytes, *,
+                     renderer: str | None = None,
+                     formatter: str | None = None,
+                     neato_no_op: bool | int | None = None,
+                     quiet: bool = False) -> bytes:
+    """Return ``data`` (``bytes``) piped through ``engine`` into ``format`` as ``bytes``
+        (coroutine).
+
+    See :func:`graphviz.pipe` for the arguments, return value, and exceptions.
+
+    Example:
+        >>> doctest_mark_exe()
+        >>> import asyncio
+        >>> import graphviz
+        >>> asyncio.run(graphviz.pipe_async('dot', 'svg', b'graph { spam }'))[:14]
+        b'<?xml version='
+
+    Note:
+        The layout subprocess is killed if the awaiting task is cancelled.
+    """
+    cmd = dot_command.command(engine, format,
+                              renderer=renderer,
+                              formatter=formatter,
+                              neato_no_op=neato_no_op)
+
+    proc = await execute.run_check_async(cmd, input=data,
+                                         capture_output=True, quiet=quiet)
+    return proc.stdout
+
+
+async def pipe_string_async(engine: str, format: str, input_string: str, *,
+                            encoding: str,
+                            renderer: str | None = None,
+                            formatter: str | None = None,
+                            neato_no_op: bool | int | None = None,
+                            quiet: bool = False) -> str:
+    """Return ``input_string`` piped through ``engine`` into ``format`` as string
+        (coroutine).
+
+    See :func:`graphviz.pipe_string` for the arguments, return value, and exceptions.
+
+    Note:
+        The layout subprocess is killed if the awaiting task is cancelled.
+    """
+    cmd = dot_command.command(engine, format,
+                              renderer=renderer,
+                              formatter=formatter,
+                              neato_no_op=neato_no_op)
+
+    proc = await execute.run_check_async(cmd, input=input_string, encoding=encoding,
+                                         capture_output=True, quiet=quiet)
+    return proc.stdout
+
+
+async def pipe_lines_async(engine: str, format: str, input_lines: Iterator[str], *,
+                           input_encoding: str,
+                           renderer: str | None = None,
+                           formatter: str | None = None,
+                           neato_no_op: bool | int | None = None,
+                           quiet: bool = False) -> bytes:
+    """Return ``input_lines`` piped through ``engine`` into ``format`` as ``bytes``
+        (coroutine).
+
+    See :func:`graphviz.pipe_lines` for the arguments, return value, and exceptions.
+
+    Note:
+        The lines are written to the ``stdin`` of the layout subprocess
+        while it is running (in chunks waiting for the pipe to drain).
+        The layout subprocess is killed if the awaiting task is cancelled.
+    """
+    cmd = dot_command.command(engine, format,
+                              renderer=renderer,
+                              formatter=formatter,
+                              neato_no_op=neato_no_op)
+    encoded_lines = (line.encode(input_encoding) for line in input_lines)
+
+    proc = await execute.run_check_async(cmd, input_lines=encoded_lines,
+                                         capture_output=True, quiet=quiet)
+    return proc.stdout
+
+
+async def pipe_lines_string_async(engine: str, format: str, input_lines: Iterator[str], *,
+                                  encoding: str,
+                                  renderer: str | None = None,
+                                  formatter: str | None = None,
+                                  neato_no_op: bool | int | None = None,
+                                  quiet: bool = False) -> str:
+    """Return ``input_lines`` piped through ``engine`` into ``format`` as string
+        (coroutine).
+
+    See :func:`graphviz.pipe_lines_string` for the arguments, return value,
+    and exceptions.
+
+    Note:
+        The lines are written to the ``stdin`` of the layout subprocess
+        while it is running (in chunks waiting for the pipe to drain).
+        The layout subprocess is killed if the awaiting task is cancelled.
+    """
+    cmd = dot_command.command(engine, format,
+                              renderer=renderer,
+                              formatter=formatter,
+                              neato_no_op=neato_no_op)
+
+    proc = await execute.run_check_async(cmd, input_lines=input_lines, encoding=encoding,
+                                         capture_output=True, quiet=quiet)
+    return proc.stdout
+
+
+def pipe_batch(engine: str, format: str, inputs: Iterable[bytes], *,
+               renderer: str | None = None,
+               formatter: str | None = None,
+               neato_no_op: bool | int | None = None,
+               quiet: bool = False) -> list[bytes]:
+    """Return the ``inputs`` piped through one ``engine`` process into ``format``.
+
+    Args:
+        engine: Layout engine for rendering (``'dot'``, ``'neato'``, ...).
+        format: Output format for rendering (``'pdf'``, ``'png'``, ...).
+        inputs: Binary (encoded) DOT sources with one graph each.
+        renderer: Output renderer (``'cairo'``, ``'gd'``, ...).
+        formatter: Output formatter (``'cairo'``, ``'gd'``, ...).
+        neato_no_op: Neato layout engine no-op flag.
+        quiet: Suppress ``stderr`` output from the layout subprocess.
+
+    Returns:
+        List with the binary output for each of the ``inputs``.
+
+    Raises:
+        ValueError: If ``engine``, ``format``, ``renderer``, or ``formatter``
+            are unknown or the number of outputs does not match the ``inputs``.
+        graphviz.RequiredArgumentError: If ``formatter`` is given
+            but ``renderer`` is None.
+        graphviz.ExecutableNotFound: If the Graphviz ``dot`` executable
+            is not found.
+        graphviz.BatchError: If the returncode (exit status)
+            of the rendering ``dot`` subprocess is non-zero
+            (with the position of the first failing input as ``index``
+            and the outputs of all other inputs as ``results``).
+
+    Example:
+        >>> doctest_mark_exe()
+        >>> import graphviz
+        >>> results = graphviz.backend.pipe_batch('dot', 'plain',
+        ...                                       [b'graph { spam }',
+        ...                                        b'graph { eggs }'])
+        >>> [r.splitlines()[1].split()[:2] for r in results]
+        [[b'node', b'spam'], [b'node', b'eggs']]
+
+    Note:
+        The sources are concatenated into the ``stdin`` of the layout command
+        (started in a temporary directory),
+        which writes the output for each graph into a separate file (``-O``).
+        If it fails, the inputs after the failing one are piped
+        through a new process.
+    """
+    cmd = dot_command.command(engine, format,
+                              renderer=renderer,
+                              formatter=formatter,
+                              neato_no_op=neato_no_op)
+    # https://www.graphviz.org/doc/info/command.html#-O
+    cmd.append('-O')
+
+    inputs = [data if data.endswith(b'\n') else data + b'\n' for data in inputs]
+
+    results: list[bytes | None] = [None] * len(inputs)
+    error: execute.BatchError | None = None
+    start = 0
+    while start < len(inputs):
+        try:
+            results[start:] = _run_batch(cmd, inputs[start:], quiet=quiet)
+        except execute.BatchError as e:
+            results[start:] = e.results
+            if error is None:
+                error = e
+                error.index = start + e.index if e.index is not None else None
+            if e.index is None:
+                break
+            # retry the inputs after the failed one that have no output
+            start += e.index + 1
+            while start < len(inputs) and results[start] is not None:
+                start += 1
+        else:
+            break
+
+    if error is not None:
+        error.results = results
+        raise error
+    if None in results:
+        raise ValueError(f'no output for input at index {results.index(None)}'
+                         ' (must contain exactly one graph)')
+    return results  # type: ignore[return-value]
+
+
+def _run_batch(cmd: list, inputs: list[bytes], *, quiet: bool) -> list[bytes | None]:
+    """Return the outputs of ``inputs`` piped through one ``cmd`` process."""
+    line_ends = list(itertools.accumulate(data.count(b'\n') for data in inputs))
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        try:
+            execute.run_check(cmd, input=b''.join(inputs),
+                              capture_output=True, quiet=quiet, cwd=tmpdir)
+        except execute.CalledProcessError as e:
+            results = _read_batch_outputs(tmpdir, len(inputs))
+            index = _batch_error_index(e.stderr, line_ends=line_ends, results=results)
+            raise execute.BatchError(e.returncode, e.cmd,
+                                     output=e.output, stderr=e.stderr,
+                                     index=index, results=results) from e
+        return _read_batch_outputs(tmpdir, len(inputs))
+
+
+def _read_batch_outputs(dirpath: str, n_inputs: int) -> list[bytes | None]:
+    """Return the outputs written with ``-O`` by their input position."""
+    results: list[bytes | None] = [None] * n_inputs
+    for entry in os.scandir(dirpath):
+        if (match := BATCH_OUTFILE.match(entry.name)) is None:  # pragma: no cover
+            continue
+        index = int(match.group(1)) - 1 if match.group(1) is not None else 0
+        if index >= n_inputs:
+            raise ValueError(f'more outputs than inputs ({n_inputs}):'
+                             ' inputs must contain exactly one graph')
+        with open(entry.path, 'rb') as f:
+            results[index] = f.read()
+    return results
+
+
+def _batch_error_index(stderr: bytes | None, *, line_ends: list[int],
+                       results: list[bytes | None]) -> int | None:
+    """Return the position of the failed input from the line number in ``stderr``
+        falling back to the first input without output."""
+    if stderr and (match := BATCH_ERROR_LINE.search(stderr)) is not None:
+        # line numbers continue over the graphs read from stdin
+        index = bisect.bisect_left(line_ends, int(match.group(1)))
+        if index < len(line_ends):
+            return index
+    return results.index(None) if None in results else None
+
+
+def pipe_multi(engine: str, formats: Iterable[str], data: bytes, *,
+               renderer: str | None = None,
+               formatter: str | None = None,
+               neato_no_op: bool | int | None = None,
+               quiet: bool = False) -> dict[str, bytes]:
+    """Return ``data`` laid out once by ``engine`` and written in all ``formats``.
+
+    Args:
+        engine: Layout engine for rendering (``'dot'``, ``'neato'``, ...).
+        formats: Output formats for rendering (``'svg'``, ``'png'``, ...).
+        data: Binary (encoded) DOT source bytes to render.
+        renderer: Output renderer (``'cairo'``, ``'gd'``, ...).
+        formatter: Output formatter (``'cairo'``, ``'gd'``, ...).
+        neato_no_op: Neato layout engine no-op flag.
+        quiet: Suppress ``stderr`` output from the layout subprocess.
+
+    Returns:
+        Mapping from each of the ``formats`` to its binary output.
+
+    Raises:
+        ValueError: If ``engine``, ``format``, ``renderer``, or ``formatter``
+            are unknown.
+        graphviz.RequiredArgumentError: If ``formats`` is empty
+            or ``formatter`` is given but ``renderer`` is None.
+        graphviz.ExecutableNotFound: If the Graphviz ``dot`` executable
+            is not found.
+        graphviz.CalledProcessError: If the returncode (exit status)
+            of the rendering ``dot`` subprocess is non-zero.
+
+    Example:
+        >>> doctest_mark_exe()
+        >>> import graphviz
+        >>> outputs = graphviz.backend.pipe_multi('dot', ['svg', 'png'],
+        ...                                       b'graph { hello -- world }')
+        >>> outputs['svg'][:14], outputs['png'][:4]
+        (b'<?xml version=', b'\\x89PNG')
+
+    Note:
+        The layout command is started from the current directory
+        with one ``-T`` and ``-o`` pair for each format
+        (writing into a temporary directory).
+    """
+    formats = list(dict.fromkeys(formats))
+    command = functools.partial(dot_command.command, engine,
+                                renderer=renderer,
+                                formatter=formatter,
+                                neato_no_op=neato_no_op)
+
+    lookups = None
+    if caching.enabled():
+        lookups = [caching.lookup(command(f), data)
+                   for f in formats]
+        if None not in (cached := [lookup.get() for lookup in lookups]):
+            return dict(zip(formats, cached))  # type: ignore[arg-type]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        outfiles = [os.path.join(tmpdir, f'{MULTI_OUTFILE}.{i:d}')
+                    for i, _ in enumerate(formats)]
+        cmd = command(formats, outfiles=outfiles)
+        try:
+            execute.run_check(cmd, input=data, capture_output=True, quiet=quiet)
+        except execute.CalledProcessError as e:
+            for lookup in lookups or []:
+                lookup.put_error(e)
+            raise
+        outputs = [pathlib.Path(o).read_bytes() for o in outfiles]
+
+    for lookup, output in zip(lookups or [], outputs):
+        lookup.put(output)
+    return dict(zip(formats, outputs))
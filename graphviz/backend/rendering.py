@@ -1,5 +1,7 @@
 """Render DOT source files with Graphviz ``dot``."""
 
+from collections.abc import Iterable, Iterator
+import functools
 import os
 import pathlib
 from typing import overload
@@ -10,14 +12,20 @@ from .. import _tools
 from .. import exceptions
 from .. import parameters
 
+from . import caching
 from . import dot_command
 from . import execute
 
-__all__ = ['get_format', 'get_filepath', 'render']
+__all__ = ['get_format', 'get_filepath',
+           'render', 'render_async', 'render_batch', 'render_multi']
 
 DOUBLE_SUFFIXES = {f'.{fmt}' for fmt in parameters.FORMATS
                    if fmt in ('xdot1.2', 'xdot1.4')}
 
+WINDOWS_MAX_COMMAND_LINE = 32_767
+
+POSIX_ARG_MAX_HEADROOM = 2_048
+
 
 def get_format(outfile: pathlib.Path, *, format: str | None) -> str:
     """Return format inferred from outfile suffix and/or given ``format``.
@@ -280,6 +288,88 @@ def render(engine: str,
     See also:
         Upstream docs: https://www.graphviz.org/doc/info/command.html
     """
+    (cmd, args, cwd, outfile) = _get_render_command(engine, format, filepath,
+                                                    renderer=renderer,
+                                                    formatter=formatter,
+                                                    neato_no_op=neato_no_op,
+                                                    outfile=outfile,
+                                                    raise_if_result_exists=raise_if_result_exists,
+                                                    overwrite_filepath=overwrite_filepath)
+
+    if not caching.enabled():
+        execute.run_check(cmd + args, cwd=cwd, quiet=quiet, capture_output=True)
+        return os.fspath(outfile)
+
+    lookup = caching.lookup(cmd, pathlib.Path(cwd or '', args[-1]).read_bytes())
+    if (output := lookup.get()) is not None:
+        outfile.write_bytes(output)
+        return os.fspath(outfile)
+
+    try:
+        execute.run_check(cmd + args, cwd=cwd, quiet=quiet, capture_output=True)
+    except execute.CalledProcessError as e:
+        lookup.put_error(e)
+        raise
+    lookup.put(outfile.read_bytes())
+
+    return os.fspath(outfile)
+
+
+async def render_async(engine: str,
+                       format: str | None = None,
+                       filepath: os.PathLike[str] | str | None = None, *,
+                       renderer: str | None = None,
+                       formatter: str | None = None,
+                       neato_no_op: bool | int | None = None,
+                       quiet: bool = False,
+                       outfile: os.PathLike[str] | str | None = None,
+                       raise_if_result_exists: bool = False,
+                       overwrite_filepath: bool = False) -> str:
+    r"""Render file with ``engine`` into ``format`` and return result filename
+        (coroutine).
+
+    See :func:`graphviz.render` for the arguments, return value, and exceptions.
+
+    Example:
+        >>> doctest_mark_exe()
+        >>> import asyncio
+        >>> import pathlib
+        >>> import graphviz
+        >>> assert pathlib.Path('doctest-output/spam.gv').write_text('graph { spam }') == 14
+        >>> asyncio.run(graphviz.render_async('dot', 'png',
+        ...                                   'doctest-output/spam.gv')).replace('\\', '/')
+        'doctest-output/spam.gv.png'
+
+    Note:
+        The layout subprocess is killed if the awaiting task is cancelled.
+    """
+    (cmd, args, cwd, outfile) = _get_render_command(engine, format, filepath,
+                                                    renderer=renderer,
+                                                    formatter=formatter,
+                                                    neato_no_op=neato_no_op,
+                                                    outfile=outfile,
+                                                    raise_if_result_exists=raise_if_result_exists,
+                                                    overwrite_filepath=overwrite_filepath)
+
+    await execute.run_check_async(cmd + args, cwd=cwd, quiet=quiet, capture_output=True)
+
+    return os.fspath(outfile)
+
+
+def _get_render_command(engine: str,
+                        format: str | None,
+                        filepath: os.PathLike[str] | str | None, *,
+                        renderer: str | None,
+                        formatter: str | None,
+                        neato_no_op: bool | int | None,
+                        outfile: os.PathLike[str] | str | None,
+                        raise_if_result_exists: bool,
+                        overwrite_filepath: bool
+                        ) -> tuple[list[os.PathLike[str] | str],
+                                   list[os.PathLike[str] | str],
+                                   pathlib.Path | None, pathlib.Path]:
+    """Return the layout command, its file arguments, its working directory,
+        and the path of the rendered file."""
     if raise_if_result_exists and overwrite_filepath:
         raise ValueError('overwrite_filepath cannot be combined'
                          ' with raise_if_result_exists')
@@ -298,11 +388,12 @@ def render(engine: str,
                              f' from input file {filepath.name!r}'
                              ' (pass overwrite_filepath=True to override)')
 
-        outfile_arg = (outfile.resolve() if outfile.parent != filepath.parent
-                       else outfile.name)
+        outfile_arg: os.PathLike[str] | str = (outfile.resolve()
+                                               if outfile.parent != filepath.parent
+                                               else outfile.name)
 
         # https://www.graphviz.org/doc/info/command.html#-o
-        args = ['-o', outfile_arg, filepath.name]
+        args: list[os.PathLike[str] | str] = ['-o', outfile_arg, filepath.name]
     elif filepath is None:
         raise exceptions.RequiredArgumentError('filepath: (required if outfile is not given,'
                                                f' got {filepath!r})')
@@ -325,11 +416,238 @@ def render(engine: str,
     if raise_if_result_exists and os.path.exists(outfile):
         raise exceptions.FileExistsError(f'output file exists: {os.fspath(outfile)!r}')
 
-    cmd += args
+    return cmd, args, filepath.parent if filepath.parent.parts else None, outfile
 
-    execute.run_check(cmd,
-                      cwd=filepath.parent if filepath.parent.parts else None,
-                      quiet=quiet,
-                      capture_output=True)
 
-    return os.fspath(outfile)
+def get_max_args_length() -> int:
+    """Return the number of bytes available for command-line arguments."""
+    if os.name == 'nt':
+        return WINDOWS_MAX_COMMAND_LINE
+    try:
+        arg_max = os.sysconf('SC_ARG_MAX')
+    except (AttributeError, OSError, ValueError):  # pragma: no cover
+        arg_max = -1
+    if arg_max < 0:  # pragma: no cover
+        arg_max = 131_072  # POSIX minimum of Linux before 2.6.23
+    # the environment and the pointers to each string count against ARG_MAX
+    environ = sum(len(k) + len(v) + 2 + 8 for k, v in os.environb.items())
+    return arg_max - environ - POSIX_ARG_MAX_HEADROOM
+
+
+def iter_arg_chunks(args: Iterable[str], *, max_length: int) -> Iterator[list[str]]:
+    """Yield lists of ``args`` with a total length not exceeding ``max_length``."""
+    chunk: list[str] = []
+    length = 0
+    for arg in args:
+        # terminating null byte and argv pointer (or space and quotes on Windows)
+        arg_length = len(os.fsencode(arg)) + 9
+        if chunk and length + arg_length > max_length:
+            yield chunk
+            (chunk, length) = ([], 0)
+        chunk.append(arg)
+        length += arg_length
+    if chunk:
+        yield chunk
+
+
+def render_batch(engine: str, format: str,
+                 filepaths: Iterable[os.PathLike[str] | str], *,
+                 renderer: str | None = None,
+                 formatter: str | None = None,
+                 neato_no_op: bool | int | None = None,
+                 quiet: bool = False) -> list[str]:
+    r"""Render files with ``engine`` into ``format`` in as few processes as possible.
+
+    Args:
+        engine: Layout engine for rendering (``'dot'``, ``'neato'``, ...).
+        format: Output format for rendering (``'pdf'``, ``'png'``, ...).
+        filepaths: Paths to the DOT source files to render.
+        renderer: Output renderer (``'cairo'``, ``'gd'``, ...).
+        formatter: Output formatter (``'cairo'``, ``'gd'``, ...).
+        neato_no_op: Neato layout engine no-op flag.
+        quiet: Suppress ``stderr`` output from the layout subprocesses.
+
+    Returns:
+        List with the (possibly relative) path of the rendered file
+            for each of the ``filepaths`` (see :func:`get_outfile`).
+
+    Raises:
+        ValueError: If ``engine``, ``format``, ``renderer``, or ``formatter``
+            are unknown.
+        graphviz.RequiredArgumentError: If ``formatter`` is given
+            but ``renderer`` is None.
+        graphviz.ExecutableNotFound: If the Graphviz ``dot`` executable
+            is not found.
+        graphviz.BatchError: If the returncode (exit status)
+            of a rendering ``dot`` subprocess is non-zero
+            (with the position of the first failed file as ``index``
+            and ``None`` for failed files in ``results``),
+            raised after rendering all files.
+
+    Example:
+        >>> doctest_mark_exe()
+        >>> import pathlib
+        >>> import graphviz
+        >>> for name in ('spam', 'eggs'):
+        ...     _ = pathlib.Path(f'doctest-output/{name}.gv').write_text(f'graph {{ {name} }}')
+        >>> outfiles = graphviz.backend.render_batch('dot', 'png',
+        ...                                          ['doctest-output/spam.gv',
+        ...                                           'doctest-output/eggs.gv'])
+        >>> [o.replace('\\', '/') for o in outfiles]
+        ['doctest-output/spam.gv.png', 'doctest-output/eggs.gv.png']
+
+    Note:
+        The files are grouped by directory, each group is passed
+        to a layout command (``-O``) started from that directory
+        in chunks that stay below the command-line length limit.
+        Existing output files are removed before rendering.
+    """
+    paths = [pathlib.Path(f) for f in filepaths]
+    outfiles = [get_outfile(p, format=format, renderer=renderer, formatter=formatter)
+                for p in paths]
+
+    cmd = dot_command.command(engine, format,
+                              renderer=renderer,
+                              formatter=formatter,
+                              neato_no_op=neato_no_op)
+    # https://www.graphviz.org/doc/info/command.html#-O
+    cmd.append('-O')
+
+    groups: dict[pathlib.Path, list[int]] = {}
+    for i, path in enumerate(paths):
+        groups.setdefault(path.parent, []).append(i)
+
+    max_length = (get_max_args_length()
+                  - sum(len(os.fsencode(a)) + 9 for a in cmd))
+
+    results: list[str | None] = [os.fspath(o) for o in outfiles]
+    error: execute.CalledProcessError | None = None
+    for directory, indexes in groups.items():
+        names: dict[str, list[int]] = {}
+        for i in indexes:
+            names.setdefault(paths[i].name, []).append(i)
+
+        for chunk in iter_arg_chunks(names, max_length=max_length):
+            # remove stale outfiles so that a missing outfile means failure
+            for name in chunk:
+                outfiles[names[name][0]].unlink(missing_ok=True)
+            try:
+                execute.run_check(cmd + chunk,
+                                  cwd=directory if directory.parts else None,
+                                  quiet=quiet,
+                                  capture_output=True)
+            except execute.CalledProcessError as e:
+                error = error or e
+                for name in chunk:
+                    if (_error_refers_to(e.stderr, name)
+                        or not outfiles[names[name][0]].exists()):  # noqa: E129
+                        for i in names[name]:
+                            results[i] = None
+
+    if error is not None:
+        index = results.index(None) if None in results else None
+        raise execute.BatchError(error.returncode, error.cmd,
+                                 output=error.output, stderr=error.stderr,
+                                 index=index, results=results)
+    return results  # type: ignore[return-value]
+
+
+def _error_refers_to(stderr: bytes | None, name: str) -> bool:
+    """Return whether an error message in ``stderr`` names the file ``name``."""
+    if not stderr:
+        return False
+    return b'Error: ' + os.fsencode(name) + b':' in stderr
+
+
+def render_multi(engine: str, formats: Iterable[str],
+                 filepath: os.PathLike[str] | str, *,
+                 renderer: str | None = None,
+                 formatter: str | None = None,
+                 neato_no_op: bool | int | None = None,
+                 quiet: bool = False,
+                 raise_if_result_exists: bool = False) -> list[str]:
+    r"""Render file with ``engine`` laid out once into all ``formats``.
+
+    Args:
+        engine: Layout engine for rendering (``'dot'``, ``'neato'``, ...).
+        formats: Output formats for rendering (``'svg'``, ``'png'``, ...).
+        filepath: Path to the DOT source file to render.
+        renderer: Output renderer (``'cairo'``, ``'gd'``, ...).
+        formatter: Output formatter (``'cairo'``, ``'gd'``, ...).
+        neato_no_op: Neato layout engine no-op flag.
+        quiet: Suppress ``stderr`` output from the layout subprocess.
+        raise_if_result_exists: Raise :exc:`graphviz.FileExistsError`
+            if one of the result files exists.
+
+    Returns:
+        List with the (possibly relative) path of the rendered file
+            for each of the ``formats`` (see :func:`get_outfile`).
+
+    Raises:
+        ValueError: If ``engine``, ``format``, ``renderer``, or ``formatter``
+            are unknown.
+        graphviz.RequiredArgumentError: If ``formats`` is empty
+            or ``formatter`` is given but ``renderer`` is None.
+        graphviz.ExecutableNotFound: If the Graphviz ``dot`` executable
+            is not found.
+        graphviz.CalledProcessError: If the returncode (exit status)
+            of the rendering ``dot`` subprocess is non-zero.
+        graphviz.FileExistsError: If ``raise_if_exists``
+            and one of the result files exists.
+
+    Example:
+        >>> doctest_mark_exe()
+        >>> import pathlib
+        >>> import graphviz
+        >>> assert pathlib.Path('doctest-output/spam.gv').write_text('graph { spam }') == 14
+        >>> outfiles = graphviz.backend.render_multi('dot', ['svg', 'png'],
+        ...                                          'doctest-output/spam.gv')
+        >>> [o.replace('\\', '/') for o in outfiles]
+        ['doctest-output/spam.gv.svg', 'doctest-output/spam.gv.png']
+
+    Note:
+        The layout command is started from the directory of ``filepath``
+        with one ``-T`` flag for each format (``-O``).
+    """
+    filepath = _tools.promote_pathlike(filepath)
+    formats = list(dict.fromkeys(formats))
+    outfiles = [get_outfile(filepath, format=f, renderer=renderer, formatter=formatter)
+                for f in formats]
+
+    command = functools.partial(dot_command.command, engine,
+                                renderer=renderer,
+                                formatter=formatter,
+                                neato_no_op=neato_no_op)
+    # https://www.graphviz.org/doc/info/command.html#-O
+    cmd = command(formats) + ['-O', filepath.name]
+
+    if raise_if_result_exists:
+        for outfile in outfiles:
+            if os.path.exists(outfile):
+                raise exceptions.FileExistsError('output file exists:'
+                                                 f' {os.fspath(outfile)!r}')
+
+    cwd = filepath.parent if filepath.parent.parts else None
+    results = [os.fspath(o) for o in outfiles]
+
+    if not caching.enabled():
+        execute.run_check(cmd, cwd=cwd, quiet=quiet, capture_output=True)
+        return results
+
+    data = filepath.read_bytes()
+    lookups = [caching.lookup(command(f), data) for f in formats]
+    if None not in (cached := [lookup.get() for lookup in lookups]):
+        for outfile, output in zip(outfiles, cached):
+            outfile.write_bytes(output)  # type: ignore[arg-type]
+        return results
+
+    try:
+        execute.run_check(cmd, cwd=cwd, quiet=quiet, capture_output=True)
+    except execute.CalledProcessError as e:
+        for lookup in lookups:
+            lookup.put_error(e)
+        raise
+    for lookup, outfile in zip(lookups, outfiles):
+        lookup.put(outfile.read_bytes())
+
+    return results
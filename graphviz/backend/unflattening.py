@@ -10,7 +10,7 @@ from .. import exceptions
 
 from . import execute
 
-__all__ = ['UNFLATTEN_BINARY', 'unflatten']
+__all__ = ['UNFLATTEN_BINARY', 'unflatten', 'unflatten_async']
 
 UNFLATTEN_BINARY: Final = pathlib.Path('unflatten')
 
@@ -48,6 +48,35 @@ def unflatten(source: str,
         Upstream documentation:
         https://www.graphviz.org/pdf/unflatten.1.pdf
     """
+    cmd = _get_unflatten_command(stagger=stagger, fanout=fanout, chain=chain)
+
+    proc = execute.run_check(cmd, input=source, encoding=encoding,
+                             capture_output=True)
+    return proc.stdout
+
+
+async def unflatten_async(source: str, *,
+                          stagger: int | None = None,
+                          fanout: bool = False,
+                          chain: int | None = None,
+                          encoding: str = DEFAULT_ENCODING) -> str:
+    """Return DOT ``source`` piped through ``unflatten`` preprocessor as string
+        (coroutine).
+
+    See :func:`graphviz.unflatten` for the arguments, return value, and exceptions.
+
+    Note:
+        The unflatten subprocess is killed if the awaiting task is cancelled.
+    """
+    cmd = _get_unflatten_command(stagger=stagger, fanout=fanout, chain=chain)
+
+    proc = await execute.run_check_async(cmd, input=source, encoding=encoding,
+                                         capture_output=True)
+    return proc.stdout
+
+
+def _get_unflatten_command(*, stagger: int | None, fanout: bool,
+                           chain: int | None) -> list[os.PathLike[str] | str]:
     if fanout and stagger is None:
         raise exceptions.RequiredArgumentError('fanout given without stagger')
 
@@ -58,7 +87,4 @@ def unflatten(source: str,
         cmd.append('-f')
     if chain is not None:
         cmd += ['-c', str(chain)]
-
-    proc = execute.run_check(cmd, input=source, encoding=encoding,
-                             capture_output=True)
-    return proc.stdout
+    return cmd
@@ -0,0 +1,268 @@
+"""Memoize the outputs of piping and layouts in least recently used caches."""
+
+from collections.abc import Callable, Hashable, Iterator
+from typing import TypeVar
+import collections
+import concurrent.futures
+import contextlib
+import contextvars
+import sys
+import threading
+
+from .backend import CacheInfo
+
+__all__ = ['PipeCache', 'get_pipe_cache',
+           'set_pipe_cache_size', 'pipe_cache_info', 'pipe_cache',
+           'LayoutCache', 'get_layout_cache',
+           'set_layout_cache_size', 'layout_cache_info']
+
+DEFAULT_PIPE_CACHE_SIZE = 2**26
+
+DEFAULT_LAYOUT_CACHE_SIZE = 128
+
+T = TypeVar('T')
+
+
+class PipeCache:
+    """Least recently used memo of piped outputs limited to ``max_bytes``.
+
+    Entries hold the ``bytes`` output and its decoded strings
+    (decoded once per ``encoding``).
+    Concurrent misses for the same key wait for the first ``pipe()`` call.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._entries: collections.OrderedDict[Hashable, dict[str | None, bytes | str]]
+        self._entries = collections.OrderedDict()
+        self._pending: dict[Hashable, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+        self._size = 0
+        self._hits = self._misses = self._evictions = 0
+
+    def get(self, key: Hashable, pipe: Callable[[], bytes], *,
+            encoding: str | None = None,
+            decode: Callable[[bytes, str], str] = bytes.decode) -> bytes | str:
+        """Return the memoized output for ``key`` (call ``pipe()`` on miss)."""
+        output = pending = None
+        with self._lock:
+            if (entry := self._entries.get(key)) is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                if (result := entry.get(encoding)) is not None:
+                    return result
+                output = entry.get(None)
+            elif (pending := self._pending.get(key)) is not None:
+                self._hits += 1
+            else:
+                self._misses += 1
+                future = self._pending[key] = concurrent.futures.Future()
+
+        if pending is not None:
+            output = pending.result()
+        elif output is None:
+            output = self._add_pending(key, future, pipe)
+        if encoding is None:
+            return output
+        assert isinstance(output, bytes)
+        return self._add(key, encoding, decode(output, encoding))
+
+    def _add_pending(self, key: Hashable, future: concurrent.futures.Future,
+                     pipe: Callable[[], bytes]) -> bytes:
+        """Add the output of ``pipe()`` for ``key``, pass it to the waiting calls."""
+        try:
+            output = self._add(key, None, pipe())
+        except BaseException as e:
+            with self._lock:
+                del self._pending[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._pending[key]
+        future.set_result(output)
+        return output
+
+    def _add(self, key: Hashable, encoding: str | None, value):
+        """Add ``value`` to the entry for ``key``, return the stored value."""
+        with self._lock:
+            if (entry := self._entries.get(key)) is None:
+                entry = self._entries[key] = {}
+            else:
+                self._entries.move_to_end(key)
+            if encoding not in entry:
+                entry[encoding] = value
+                self._size += sys.getsizeof(value)
+            result = entry[encoding]
+            while self._size > self.max_bytes and self._entries:
+                (_, evicted) = self._entries.popitem(last=False)
+                self._size -= sum(map(sys.getsizeof, evicted.values()))
+                self._evictions += 1
+        return result
+
+    def cache_info(self) -> CacheInfo:
+        """Return the hit/miss/eviction counters and the size in bytes."""
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._evictions,
+                             self._size, self.max_bytes)
+
+    def clear(self) -> None:
+        """Discard all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self._hits = self._misses = self._evictions = 0
+
+
+_pipe_cache: PipeCache | None = None
+
+_context_pipe_cache: contextvars.ContextVar[PipeCache | None]
+_context_pipe_cache = contextvars.ContextVar('_context_pipe_cache', default=None)
+
+
+def get_pipe_cache() -> PipeCache | None:
+    """Return the :class:`.PipeCache` used by :meth:`.Graph.pipe` (or ``None``)
+        in the current context (see :func:`pipe_cache`)."""
+    if (cache := _context_pipe_cache.get()) is not None:
+        return cache
+    return _pipe_cache
+
+
+def set_pipe_cache_size(max_bytes: int | None) -> int | None:
+    """Memoize the outputs of :meth:`.Graph.pipe` up to ``max_bytes`` (``None``: disable).
+
+    Args:
+        max_bytes: Memory budget for the memoized outputs in bytes.
+
+    Returns:
+        The old memory budget (``None`` if disabled).
+
+    Note:
+        Discards the current cache contents and resets the counters.
+        Sets the memo for all threads
+        (except inside :func:`pipe_cache` blocks).
+        Outputs are memoized by the source digest (see :meth:`.Graph.fingerprint`),
+        ``encoding``, ``engine``, ``format``, ``renderer``, ``formatter``,
+        and ``neato_no_op``.
+        Memoized ``bytes`` are returned without copying,
+        strings are decoded once per ``encoding``.
+    """
+    global _pipe_cache
+
+    old_max_bytes = _pipe_cache.max_bytes if _pipe_cache is not None else None
+    _pipe_cache = PipeCache(max_bytes) if max_bytes is not None else None
+    return old_max_bytes
+
+
+def pipe_cache_info() -> CacheInfo | None:
+    """Return the hit/miss/eviction counters of the :meth:`.Graph.pipe` memo.
+
+    >>> with pipe_cache(max_bytes=2**20):  # doctest: +NO_EXE
+    ...     pipe_cache_info()
+    CacheInfo(hits=0, misses=0, evictions=0, currsize=0, maxsize=1048576)
+
+    >>> pipe_cache_info() is None
+    True
+    """
+    return cache.cache_info() if (cache := get_pipe_cache()) is not None else None
+
+
+@contextlib.contextmanager
+def pipe_cache(max_bytes: int = DEFAULT_PIPE_CACHE_SIZE) -> Iterator[PipeCache]:
+    """Memoize the outputs of :meth:`.Graph.pipe` inside the ``with``-block.
+
+    Args:
+        max_bytes: Memory budget for the memoized outputs in bytes.
+
+    Returns:
+        Context manager restoring the previous memo on exit
+        (see :func:`set_pipe_cache_size`).
+
+    Note:
+        The memo is set in a :mod:`contextvars` context variable,
+        so it is not used by other threads
+        (except the ones started by :func:`graphviz.pipe_parallel`).
+    """
+    cache = PipeCache(max_bytes)
+    token = _context_pipe_cache.set(cache)
+    try:
+        yield cache
+    finally:
+        _context_pipe_cache.reset(token)
+
+
+class LayoutCache:
+    """Least recently used memo of layouts limited to ``maxsize`` entries."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._entries: collections.OrderedDict[Hashable, object] = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._evictions = 0
+
+    def get(self, key: Hashable, layout: Callable[[], T]) -> T:
+        """Return the memoized layout for ``key`` (call ``layout()`` on miss)."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return self._entries[key]  # type: ignore[return-value]
+            self._misses += 1
+
+        result = layout()
+        with self._lock:
+            self._entries[key] = result
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return result
+
+    def cache_info(self) -> CacheInfo:
+        """Return the hit/miss/eviction counters and the number of layouts."""
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._evictions,
+                             len(self._entries), self.maxsize)
+
+    def clear(self) -> None:
+        """Discard all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+
+
+_layout_cache: LayoutCache | None = LayoutCache(DEFAULT_LAYOUT_CACHE_SIZE)
+
+
+def get_layout_cache() -> LayoutCache | None:
+    """Return the :class:`.LayoutCache` used by :meth:`.Graph.layout` (or ``None``)."""
+    return _layout_cache
+
+
+def set_layout_cache_size(maxsize: int | None) -> int | None:
+    """Memoize up to ``maxsize`` layouts of :meth:`.Graph.layout` (``None``: disable).
+
+    Args:
+        maxsize: Maximal number of memoized layouts.
+
+    Returns:
+        The old maximal number of layouts (``None`` if disabled).
+
+    Note:
+        Discards the current cache contents and resets the counters.
+    """
+    global _layout_cache
+
+    old_maxsize = _layout_cache.maxsize if _layout_cache is not None else None
+    _layout_cache = LayoutCache(maxsize) if maxsize is not None else None
+    return old_maxsize
+
+
+def layout_cache_info() -> CacheInfo | None:
+    """Return the hit/miss/eviction counters of the :meth:`.Graph.layout` memo.
+
+    >>> set_layout_cache_size(DEFAULT_LAYOUT_CACHE_SIZE)  # doctest: +NO_EXE
+    128
+
+    >>> layout_cache_info()
+    CacheInfo(hits=0, misses=0, evictions=0, currsize=0, maxsize=128)
+    """
+    return _layout_cache.cache_info() if _layout_cache is not None else None
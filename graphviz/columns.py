@@ -0,0 +1,354 @@
+"""Parse ``json0``, ``xdot_json``, and ``plain`` layout output into flat arrays."""
+
+import array
+from collections.abc import Iterable, Iterator
+import codecs
+import importlib
+import json
+import math
+import typing
+from typing import Final
+
+from . import encoding as _encoding
+from . import plain
+
+__all__ = ['JSON_FORMATS', 'LayoutColumns']
+
+JSON_FORMATS = frozenset({'json', 'json0', 'dot_json', 'xdot_json'})
+
+POINTS_PER_INCH = 72
+
+FLOAT_TYPECODE: Final = 'd'
+
+INDEX_TYPECODE: Final = 'q'
+
+JSON_ARRAYS = ('objects', 'edges')
+
+JSON_WHITESPACE = ' \t\n\r'
+
+_json_decoder = json.JSONDecoder()
+
+
+class LayoutColumns:
+    """Node positions and edge control points of a layout in flat arrays.
+
+    Coordinates are in points, node ``width`` and ``height`` in inches
+    (as in the ``pos``, ``width``, and ``height`` attributes).
+    The control points of edge ``i`` are ``points_x[offsets[i]:offsets[i + 1]]``
+    and ``points_y[offsets[i]:offsets[i + 1]]``.
+
+    Example:
+        >>> import graphviz  # doctest: +NO_EXE
+        >>> columns = graphviz.columns.LayoutColumns.from_plain(
+        ...     'graph 1 0.75 1.5\\n'
+        ...     'node spam 0.375 1.25 0.75 0.5 spam solid ellipse black lightgrey\\n'
+        ...     'node eggs 0.375 0.25 0.75 0.5 eggs solid ellipse black lightgrey\\n'
+        ...     'edge spam eggs 4 0.375 0.99 0.375 0.88 0.375 0.76 0.375 0.65'
+        ...     ' solid black\\n'
+        ...     'stop\\n')
+        >>> columns
+        <LayoutColumns nodes=2 edges=1 points=4>
+        >>> columns.names
+        ['spam', 'eggs']
+        >>> columns.x, columns.y
+        (array('d', [27.0, 27.0]), array('d', [90.0, 18.0]))
+        >>> columns.tails, columns.heads, columns.offsets
+        (array('q', [0]), array('q', [1]), array('q', [0, 4]))
+    """
+
+    __slots__ = ('bb', 'names', 'x', 'y', 'width', 'height',
+                 'tails', 'heads', 'offsets', 'points_x', 'points_y',
+                 '_index')
+
+    def __init__(self) -> None:
+        self.bb: tuple[float, float, float, float] | None = None
+        """Bounding box ``(llx, lly, urx, ury)`` of the graph (points)."""
+
+        self.names: list[str] = []
+        """Node names (in output order)."""
+
+        self.x = array.array(FLOAT_TYPECODE)
+        """Node center x coordinates."""
+
+        self.y = array.array(FLOAT_TYPECODE)
+        """Node center y coordinates."""
+
+        self.width = array.array(FLOAT_TYPECODE)
+        """Node widths (inches)."""
+
+        self.height = array.array(FLOAT_TYPECODE)
+        """Node heights (inches)."""
+
+        self.tails = array.array(INDEX_TYPECODE)
+        """Edge tail node indexes (into :attr:`.names`)."""
+
+        self.heads = array.array(INDEX_TYPECODE)
+        """Edge head node indexes (into :attr:`.names`)."""
+
+        self.offsets = array.array(INDEX_TYPECODE, [0])
+        """Start of the control points of each edge (plus the end of the last)."""
+
+        self.points_x = array.array(FLOAT_TYPECODE)
+        """Edge control point x coordinates."""
+
+        self.points_y = array.array(FLOAT_TYPECODE)
+        """Edge control point y coordinates."""
+
+        self._index: dict[object, int] = {}
+
+    def __repr__(self) -> str:
+        return (f'<{self.__class__.__name__} nodes={len(self.names)}'
+                f' edges={len(self.tails)} points={len(self.points_x)}>')
+
+    @classmethod
+    def from_json(cls, data: bytes | str | Iterable[bytes], *,
+                  encoding: str = _encoding.DEFAULT_ENCODING) -> 'LayoutColumns':
+        """Return the columns parsed from ``json0`` (or ``json``, ``xdot_json``) output.
+
+        Args:
+            data: Layout output or iterable of its ``bytes`` chunks
+                (e.g. from :meth:`.Graph.pipe_iter`), parsed incrementally.
+            encoding: Encoding for decoding ``bytes``.
+
+        Raises:
+            ValueError: If ``data`` is not valid layout output.
+        """
+        self = cls()
+        subgraph_cnt = 0
+        for key, value in iterjson(_iterchunks(data), encoding=encoding):
+            try:
+                subgraph_cnt = self._add_json(key, value, subgraph_cnt=subgraph_cnt)
+            except (KeyError, TypeError) as e:
+                raise ValueError(f'invalid JSON layout output {key!r}: {e!r}') from e
+        return self
+
+    def _add_json(self, key: str, value: typing.Any, *, subgraph_cnt: int) -> int:
+        """Add the top-level ``value`` or array item under ``key``
+            and return the number of subgraph objects still to be skipped."""
+        if key == 'bb':
+            self.bb = _parse_bb(value)
+        elif key == '_subgraph_cnt':
+            subgraph_cnt = value
+        elif key == 'objects':
+            if subgraph_cnt:  # subgraphs come first, followed by the nodes
+                return subgraph_cnt - 1
+            (x, y) = _parse_point(value.get('pos'))
+            self.add_node(value['name'], x, y,
+                          width=_parse_float(value.get('width')),
+                          height=_parse_float(value.get('height')),
+                          key=value.get('_gvid'))
+        elif key == 'edges':
+            self.add_edge(self._lookup(value['tail']), self._lookup(value['head']),
+                          _iterpoints(value.get('pos', '')))
+        return subgraph_cnt
+
+    @classmethod
+    def from_plain(cls, data: bytes | str | Iterable[bytes], *,
+                   encoding: str = _encoding.DEFAULT_ENCODING) -> 'LayoutColumns':
+        """Return the columns parsed from ``plain`` (or ``plain-ext``) output.
+
+        Args:
+            data: Layout output or iterable of its ``bytes`` chunks
+                (e.g. from :meth:`.Graph.pipe_iter`), parsed line by line.
+            encoding: Encoding for decoding ``bytes``.
+
+        Raises:
+            ValueError: If ``data`` is not valid layout output.
+        """
+        self = cls()
+        for record in plain.iterparse(data, encoding=encoding):
+            if isinstance(record, plain.PlainGraph):
+                (width, height) = (v * POINTS_PER_INCH for v in (record.width, record.height))
+                self.bb = (0.0, 0.0, width, height)
+            elif isinstance(record, plain.PlainNode):
+                self.add_node(record.name,
+                              record.x * POINTS_PER_INCH, record.y * POINTS_PER_INCH,
+                              width=record.width, height=record.height)
+            elif isinstance(record, plain.PlainEdge):
+                self.add_edge(self._lookup(record.tail), self._lookup(record.head),
+                              ((x * POINTS_PER_INCH, y * POINTS_PER_INCH)
+                               for x, y in record.points))
+            else:
+                break
+        return self
+
+    def add_node(self, name: str, x: float, y: float, *,
+                 width: float = math.nan, height: float = math.nan,
+                 key: object = None) -> int:
+        """Append a node and return its index.
+
+        Args:
+            name: Node name.
+            x: Center x coordinate (points).
+            y: Center y coordinate (points).
+            width: Width (inches).
+            height: Height (inches).
+            key: Identifier of the node for edges (default: ``name``).
+        """
+        index = len(self.names)
+        self.names.append(name)
+        self.x.append(x)
+        self.y.append(y)
+        self.width.append(width)
+        self.height.append(height)
+        self._index[name if key is None else key] = index
+        return index
+
+    def add_edge(self, tail: int, head: int,
+                 points: Iterable[tuple[float, float]]) -> int:
+        """Append an edge between the node indexes and return its index."""
+        for x, y in points:
+            self.points_x.append(x)
+            self.points_y.append(y)
+        self.tails.append(tail)
+        self.heads.append(head)
+        self.offsets.append(len(self.points_x))
+        return len(self.tails) - 1
+
+    def _lookup(self, key: object) -> int:
+        try:
+            return self._index[key]
+        except KeyError:
+            raise ValueError(f'unknown node in layout output: {key!r}') from None
+
+    def to_numpy(self) -> dict[str, typing.Any]:
+        """Return the arrays as NumPy arrays sharing their memory.
+
+        Returns:
+            Mapping from the attribute names to :class:`numpy.ndarray`.
+
+        Raises:
+            ImportError: If :mod:`numpy` is not installed.
+
+        Note:
+            Do not append to the columns while the returned arrays are used.
+        """
+        numpy = importlib.import_module('numpy')
+        names = ('x', 'y', 'width', 'height', 'tails', 'heads', 'offsets',
+                 'points_x', 'points_y')
+        return {n: numpy.frombuffer(getattr(self, n), dtype=getattr(self, n).typecode)
+                for n in names}
+
+
+def _iterchunks(data: bytes | str | Iterable[bytes]) -> Iterator[bytes | str]:
+    if isinstance(data, (bytes, str)):
+        return iter([data])
+    return iter(data)
+
+
+class _JsonReader:
+    """Decode JSON values from ``chunks`` read on demand."""
+
+    __slots__ = ('_chunks', '_decoder', 'buffer', 'pos')
+
+    def __init__(self, chunks: Iterator[bytes | str], *, encoding: str) -> None:
+        self._chunks: Iterator[bytes | str] | None = chunks
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self.buffer = ''
+        self.pos = 0
+
+    def fill(self) -> bool:
+        """Append the next chunk to the buffer (return ``False`` at the end)."""
+        if self._chunks is None:
+            return False
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self._chunks = None
+            text = self._decoder.decode(b'', final=True)
+        else:
+            text = chunk if isinstance(chunk, str) else self._decoder.decode(chunk)
+        self.buffer = self.buffer[self.pos:] + text
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character (``''`` at the end)."""
+        while True:
+            end = len(self.buffer)
+            while self.pos < end and self.buffer[self.pos] in JSON_WHITESPACE:
+                self.pos += 1
+            if self.pos < end:
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char: str) -> None:
+        if (found := self.peek()) != char:
+            raise ValueError(f'invalid JSON layout output: expected {char!r}'
+                             f' at {found or "end"!r}')
+        self.pos += 1
+
+    def decode(self) -> typing.Any:
+        """Return the next value (reading more chunks if it is incomplete)."""
+        self.peek()
+        while True:
+            try:
+                (value, end) = _json_decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                if self.fill():
+                    continue
+                raise ValueError(f'invalid JSON layout output: {e}') from e
+            # a number at the end of the buffer might continue in the next chunk
+            if end == len(self.buffer) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iterjson(chunks: Iterator[bytes | str], *, encoding: str,
+             arrays: Iterable[str] = JSON_ARRAYS) -> Iterator[tuple[str, typing.Any]]:
+    """Yield ``(key, value)`` pairs of the top-level JSON object in ``chunks``
+        with one pair for each item of the ``arrays`` values.
+
+    >>> list(iterjson(iter([b'{"bb": "0,0,1,1", "objects": [{"na', b'me": "spam"}, 1]}']),
+    ...               encoding='utf-8'))  # doctest: +NO_EXE
+    [('bb', '0,0,1,1'), ('objects', {'name': 'spam'}), ('objects', 1)]
+    """
+    arrays = frozenset(arrays)
+    reader = _JsonReader(chunks, encoding=encoding)
+    reader.expect('{')
+    while (char := reader.peek()) != '}':
+        if char == ',':
+            reader.pos += 1
+            continue
+        if not isinstance(key := reader.decode(), str):
+            raise ValueError(f'invalid JSON layout output: key {key!r}')
+        reader.expect(':')
+        if key in arrays and reader.peek() == '[':
+            reader.pos += 1
+            while (char := reader.peek()) != ']':
+                if char == ',':
+                    reader.pos += 1
+                    continue
+                yield key, reader.decode()
+            reader.pos += 1
+        else:
+            yield key, reader.decode()
+
+
+def _parse_float(value: str | float | None) -> float:
+    return math.nan if value is None else float(value)
+
+
+def _parse_point(pos: str | None) -> tuple[float, float]:
+    if pos is None:
+        return (math.nan, math.nan)
+    (x, y) = pos.rstrip('!').split(',')[:2]
+    return (float(x), float(y))
+
+
+def _parse_bb(bb: str) -> tuple[float, float, float, float]:
+    (llx, lly, urx, ury) = map(float, bb.split(','))
+    return (llx, lly, urx, ury)
+
+
+def _iterpoints(pos: str) -> Iterator[tuple[float, float]]:
+    """Yield the spline control points of an edge ``pos``
+        (without ``'s,x,y'`` and ``'e,x,y'`` arrow end points)."""
+    for spline in pos.split(';'):
+        for point in spline.split():
+            if point.startswith(('s,', 'e,')):
+                continue
+            (x, y) = point.split(',')[:2]
+            yield (float(x), float(y))
@@ -0,0 +1,335 @@
+"""Store plain edges compactly as integer pairs of interned node identifiers."""
+
+from array import array
+import bisect
+from collections.abc import Callable, Iterable, Iterator
+import itertools
+import operator
+import sys
+
+from . import records
+
+__all__ = ['SymbolTable', 'EdgeBlock', 'CompactList']
+
+TYPECODE = 'I'
+
+
+class SymbolTable:
+    """Intern node identifiers as consecutive integers, quote each one once."""
+
+    __slots__ = ('_ids', 'quoted', '_quote')
+
+    def __init__(self, *, quote: Callable[[str], str]) -> None:
+        self._ids: dict = {}
+        self.quoted: list[str] = []
+        """Quoted identifiers in order of their integer symbols."""
+        self._quote = quote
+
+    def __len__(self) -> int:
+        return len(self.quoted)
+
+    def intern(self, identifier: str) -> int:
+        """Return the integer symbol of ``identifier`` (quote if new)."""
+        # keep nohtml() apart from the equal plain str
+        key = (identifier if identifier.__class__ is str
+               else (identifier.__class__, identifier))
+        try:
+            return self._ids[key]
+        except KeyError:
+            symbol = self._ids[key] = len(self.quoted)
+            self.quoted.append(self._quote(identifier))
+            return symbol
+
+    def copy(self) -> 'SymbolTable':
+        result = self.__class__(quote=self._quote)
+        result._ids = dict(self._ids)
+        result.quoted = list(self.quoted)
+        return result
+
+    def memory_usage(self) -> int:
+        """Return the approximate size in bytes (including the quoted strings)."""
+        return (sys.getsizeof(self._ids) + sys.getsizeof(self.quoted)
+                + sum(map(sys.getsizeof, self.quoted)))
+
+
+class EdgeBlock:
+    """Run of consecutive plain edges as parallel arrays of tail and head symbols."""
+
+    __slots__ = ('tails', 'heads')
+
+    def __init__(self) -> None:
+        self.tails = array(TYPECODE)
+        self.heads = array(TYPECODE)
+
+    def __len__(self) -> int:
+        return len(self.tails)
+
+    def copy(self) -> 'EdgeBlock':
+        result = self.__class__()
+        result.tails = array(TYPECODE, self.tails)
+        result.heads = array(TYPECODE, self.heads)
+        return result
+
+    def memory_usage(self) -> int:
+        """Return the size in bytes of the block and its arrays."""
+        return (sys.getsizeof(self) + sys.getsizeof(self.tails)
+                + sys.getsizeof(self.heads))
+
+
+class CompactList(records.LineList):
+    """List of verbatim DOT source lines storing plain edges as integer pairs.
+
+    Node identifiers of edges without attributes are interned
+    into a :class:`.SymbolTable`, the edges are stored as runs of integer pairs
+    in :class:`array.array` buffers and only formatted into ``tail -> head``
+    lines on iteration.
+
+    Behaves like a list of DOT source lines. :func:`len` is ``O(1)``
+    and indexing ``O(log n)`` (amortized).
+    Changing or removing lines other than appending and clearing
+    first formats the affected edges into lines (``O(n)``).
+
+    Example:
+        >>> import graphviz  # doctest: +NO_EXE
+        >>> dot = graphviz.Digraph(storage='compact')
+        >>> dot.edges(['AB', 'AC'])
+        >>> dot.edge('B', 'C', color='red')
+
+        >>> dot.body
+        ['\\tA -> B\\n', '\\tA -> C\\n', '\\tB -> C [color=red]\\n']
+
+        >>> dot.body.memory_usage() > 0
+        True
+    """
+
+    _storage = 'compact'
+
+    symbols: SymbolTable
+
+    def __init__(self, iterable: Iterable = (), /, *, syntax) -> None:
+        if type(iterable) is type(self):
+            self.symbols = iterable.symbols.copy()
+            iterable = (i.copy() if isinstance(i, EdgeBlock) else i
+                        for i in iterable._iteritems())
+        else:
+            self.symbols = SymbolTable(quote=syntax._quote_edge)
+        super().__init__(iterable, syntax=syntax)
+        self._reset_index()
+
+    def _reset_index(self) -> None:
+        self._starts: list[int] = []
+        self._indexed_length = 0
+
+    def _update_index(self) -> None:
+        """Index the line offsets of the items before the last one
+            (only the last item can grow by appending edges)."""
+        starts = self._starts
+        length = self._indexed_length
+        for item in list.__getitem__(self, slice(len(starts), -1)):
+            starts.append(length)
+            length += len(item) if isinstance(item, EdgeBlock) else 1
+        self._indexed_length = length
+
+    def _locate(self, index: int) -> tuple[int, int]:
+        """Return item index and offset in the item of line ``index``."""
+        index = operator.index(index)
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('list index out of range')
+        if index >= self._indexed_length:
+            return len(self._starts), index - self._indexed_length
+        pos = bisect.bisect_right(self._starts, index) - 1
+        return pos, index - self._starts[pos]
+
+    def _expand(self, index: int | None = None) -> int:
+        """Format the edges (of the item at line ``index``) into lines,
+            return the item index of line ``index``."""
+        if index is None:
+            list.__setitem__(self, slice(None), list(self))
+            self._reset_index()
+            return 0
+        (pos, offset) = self._locate(index)
+        item = list.__getitem__(self, pos)
+        if isinstance(item, EdgeBlock):
+            list.__setitem__(self, slice(pos, pos + 1), list(self._iterblock(item)))
+            self._reset_index()
+        return pos + offset
+
+    def add_edges(self, tails: Iterable, heads: Iterable[str] | None = None) -> None:
+        """Append plain edges from parallel ``tails`` and ``heads``
+            (or ``(tail, head)`` pairs in ``tails`` if ``heads`` is ``None``, ``O(1)`` each).
+
+        Raises:
+            ValueError: If ``heads`` differ in length from the ``tails``
+                (nothing is appended).
+        """
+        pairs = tails if heads is None else zip(tails, heads, strict=True)
+        intern = self.symbols.intern
+        block = EdgeBlock()
+        tails_append = block.tails.append
+        heads_append = block.heads.append
+        for tail, head in pairs:
+            tails_append(intern(tail))
+            heads_append(intern(head))
+
+        last = list.__getitem__(self, -1) if list.__len__(self) else None
+        if isinstance(last, EdgeBlock):
+            last.tails.extend(block.tails)
+            last.heads.extend(block.heads)
+        elif block:
+            list.append(self, block)
+
+    def add_edge(self, tail_name: str, head_name: str) -> None:
+        """Append a plain edge (``O(1)``)."""
+        (tail, head) = (self.symbols.intern(tail_name), self.symbols.intern(head_name))
+        last = list.__getitem__(self, -1) if list.__len__(self) else None
+        if not isinstance(last, EdgeBlock):
+            last = EdgeBlock()
+            list.append(self, last)
+        last.tails.append(tail)
+        last.heads.append(head)
+
+    def _iterblock(self, block: EdgeBlock, start: int = 0) -> Iterator[str]:
+        quoted = self.symbols.quoted
+        edge = self._syntax._edge_plain
+        (tails, heads) = ((block.tails[start:], block.heads[start:]) if start
+                          else (block.tails, block.heads))
+        for tail, head in zip(tails, heads):
+            yield edge(tail=quoted[tail], head=quoted[head])
+
+    def __iter__(self) -> Iterator[str]:
+        for item in self._iteritems():
+            if isinstance(item, EdgeBlock):
+                yield from self._iterblock(item)
+            else:
+                yield item
+
+    def _iterfrom(self, start: int) -> Iterator:
+        """Yield the lines and other items from line index ``start`` on."""
+        if start >= len(self):
+            return
+        (pos, offset) = self._locate(start)
+        items = self._iteritems()
+        for item in itertools.islice(items, pos, pos + 1):
+            if isinstance(item, EdgeBlock):
+                yield from self._iterblock(item, offset)
+            else:
+                yield item
+        for item in items:
+            if isinstance(item, EdgeBlock):
+                yield from self._iterblock(item)
+            else:
+                yield item
+
+    def __len__(self) -> int:
+        self._update_index()
+        if not list.__len__(self):
+            return 0
+        last = list.__getitem__(self, -1)
+        return self._indexed_length + (len(last) if isinstance(last, EdgeBlock) else 1)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        (pos, offset) = self._locate(index)
+        item = list.__getitem__(self, pos)
+        if not isinstance(item, EdgeBlock):
+            return item
+        quoted = self.symbols.quoted
+        return self._syntax._edge_plain(tail=quoted[item.tails[offset]],
+                                        head=quoted[item.heads[offset]])
+
+    def __contains__(self, value) -> bool:
+        return value in iter(self)
+
+    def index(self, *args) -> int:
+        return list(self).index(*args)
+
+    def count(self, value) -> int:
+        return list(self).count(value)
+
+    def copy(self) -> 'CompactList':
+        """Return an independent copy (copying the arrays)."""
+        return self.__class__(self, syntax=self._syntax)
+
+    def __reduce__(self):
+        return _rebuild, (self.__class__, list(self._iteritems()),
+                          self.symbols._ids, self.symbols.quoted, self._syntax)
+
+    def memory_usage(self) -> int:
+        """Return the approximate size in bytes of the stored lines, arrays, and symbols."""
+        return (list.__sizeof__(self) + self.symbols.memory_usage()
+                + sum(i.memory_usage() if isinstance(i, EdgeBlock) else sys.getsizeof(i)
+                      for i in self._iteritems()))
+
+    # format the affected edges into lines before and reindex after changes
+
+    def __setitem__(self, index, value) -> None:
+        if isinstance(index, slice):
+            self._expand()
+        else:
+            index = self._expand(index)
+        super().__setitem__(index, value)
+        self._reset_index()
+
+    def __delitem__(self, index) -> None:
+        if isinstance(index, slice):
+            self._expand()
+        else:
+            index = self._expand(index)
+        super().__delitem__(index)
+        self._reset_index()
+
+    def __imul__(self, value):
+        if operator.index(value) < 1:
+            self.clear()
+        else:
+            items = list(self._iteritems())
+            for _ in range(value - 1):
+                list.extend(self, (i.copy() if isinstance(i, EdgeBlock) else i
+                                   for i in items))
+        return self
+
+    def insert(self, index, value) -> None:
+        index = operator.index(index)
+        length = len(self)
+        if index < 0:
+            index = max(index + length, 0)
+        index = self._expand(index) if index < length else list.__len__(self)
+        super().insert(index, value)
+        self._reset_index()
+
+    def pop(self, index=-1):
+        if not self:
+            raise IndexError('pop from empty list')
+        result = super().pop(self._expand(index))
+        self._reset_index()
+        return result
+
+    def remove(self, value) -> None:
+        del self[self.index(value)]
+
+    def clear(self) -> None:
+        super().clear()
+        self.symbols = SymbolTable(quote=self._syntax._quote_edge)
+        self._reset_index()
+
+    def sort(self, *args, **kwargs) -> None:
+        self._expand()
+        super().sort(*args, **kwargs)
+
+    def reverse(self) -> None:
+        self._expand()
+        super().reverse()
+
+
+def _rebuild(cls: type[CompactList], items: list, ids: dict, quoted: list[str],
+             syntax) -> CompactList:
+    """Return the unpickled :class:`.CompactList` of ``cls`` with the ``items``
+        (with :class:`.EdgeBlock` symbols of the ``ids`` and ``quoted`` identifiers)."""
+    result = cls(syntax=syntax)
+    (result.symbols._ids, result.symbols.quoted) = (ids, quoted)
+    list.extend(result, items)
+    return result
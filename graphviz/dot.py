@@ -1,13 +1,19 @@
 """Create DOT code with method-calls."""
 
-from collections.abc import Iterable, Iterator, Mapping
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
 import contextlib
+import hashlib
+from typing import Any
 
 from . import _tools
 from . import base
+from . import compact
+from . import fingerprinting
 from . import quoting
+from . import records
+from . import topology
 
-__all__ = ['GraphSyntax', 'DigraphSyntax', 'Dot']
+__all__ = ['GraphSyntax', 'DigraphSyntax', 'SubgraphRef', 'Dot']
 
 
 def comment(line: str) -> str:
@@ -66,6 +72,124 @@ def node(left: str, right: str) -> str:
     return f'\t{left}{right}\n'
 
 
+def _iter_attr_list_rows(columns: Sequence[Iterable], *,
+                         attr_columns: Mapping[str, Any],
+                         quote: Callable[[str], str],
+                         quote_attr_list: Callable[[str], str]) -> Iterator[tuple[str, ...]]:
+    """Yield rows of quoted ``columns`` items plus their assembled attribute list.
+
+    Quotes each distinct item and attribute value only once.
+    Orders the attributes like :func:`.quoting.attr_list` (``label`` first).
+
+    >>> list(_iter_attr_list_rows([['A', 'B']],  # doctest: +NO_EXE
+    ...                           attr_columns={'shape': 'box', 'label': ['spam eggs', None]},
+    ...                           quote=quoting.quote, quote_attr_list=quoting.quote))
+    [('A', ' [label="spam eggs" shape=box]'), ('B', ' [shape=box]')]
+    """
+    def make_quote(quote):
+        memo: dict[str, str] = {}
+
+        def quote_memo(value) -> str:
+            if not isinstance(value, str):
+                value = str(value)
+            elif isinstance(value, quoting.NoHtml):  # keep apart from equal str
+                return quote(value)
+            try:
+                return memo[value]
+            except KeyError:
+                result = memo[value] = quote(value)
+                return result
+
+        return quote_memo
+
+    keys = sorted((k for k, v in attr_columns.items() if v is not None),
+                  key=lambda k: (k != 'label', k))
+
+    # per key: fixed 'key=value' str, or (quoted_key, value quote) for columns
+    templates: list[str | tuple[str, Callable[[Any], str]]] = []
+    varying: list[Iterable] = []
+    for key in keys:
+        value = attr_columns[key]
+        if isinstance(value, str) or not isinstance(value, Iterable):  # broadcast
+            value = value if isinstance(value, str) else str(value)
+            templates.append(f'{quote_attr_list(key)}={quote_attr_list(value)}')
+        else:
+            templates.append((quote_attr_list(key), make_quote(quote_attr_list)))
+            varying.append(value)
+
+    n_columns = len(columns)
+    quote_columns = [make_quote(quote) for _ in columns]
+
+    for row in zip(*columns, *varying, strict=True):
+        values = iter(row[n_columns:])
+        attrs = []
+        for t in templates:
+            if isinstance(t, str):
+                attrs.append(t)
+            elif (value := next(values)) is not None:
+                (quoted_key, quote_value) = t
+                attrs.append(f'{quoted_key}={quote_value(value)}')
+        attr_list = f' [{" ".join(attrs)}]' if attrs else ''
+        yield (*(q(v) for q, v in zip(quote_columns, row)), attr_list)
+
+
+class SubgraphRef(str):
+    """Line in the ``body`` of its parent graph referencing a subgraph.
+
+    The line itself is a comment naming the subgraph (e.g. for ``''.join(body)``),
+    generating the source replaces it by the current lines of the subgraph
+    indented by one tab.
+    """
+
+    graph: 'Dot'
+    """The referenced subgraph."""
+
+    def __new__(cls, graph: 'Dot') -> 'SubgraphRef':
+        self = super().__new__(cls, f'\t// subgraph {graph.name or ""}\n')
+        self.graph = graph
+        return self
+
+    def __getnewargs__(self) -> tuple['Dot']:  # type: ignore[override]
+        return (self.graph,)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.graph!r})'
+
+    def _iterlines(self, *, indent: str,
+                   parents: tuple['Dot', ...] = ()) -> Iterator[str]:
+        if any(p is self.graph for p in parents):
+            raise ValueError(f'subgraph cycle: {self.graph!r}'
+                             ' is contained in itself')
+        return self.graph._iterlines(subgraph=True, indent=indent,
+                                     parents=parents)
+
+
+class SourceCache:
+    """Generated source of a graph and the state it was generated from."""
+
+    __slots__ = ('source', 'appended', 'head', 'body', 'changes', 'length', 'refs',
+                 'hasher', 'encoded')
+
+    def __init__(self, source: str, *, head: str, body: records.TrackedList,
+                 changes: int, length: int,
+                 refs: list[tuple[SubgraphRef, str]]) -> None:
+        self.source = source
+        self.appended: list[str] = []
+        """Lines generated from appended body items not yet joined into ``source``."""
+        self.head = head
+        self.body = body
+        self.changes = changes
+        self.length = length
+        self.refs = refs
+        self.hasher: hashlib.blake2b | None = None
+        """Hasher updated with the source without its final line (set on demand)."""
+        self.encoded: tuple[str, bytes] | None = None
+
+
+BODY_TYPES = {'records': records.RecordList,
+              'compact': compact.CompactList}
+
+
 class Dot(quoting.Quote, base.Base):
     """Assemble DOT source code."""
 
@@ -75,6 +199,8 @@ class Dot(quoting.Quote, base.Base):
 
     _comment = staticmethod(comment)
 
+    _source_cache: SourceCache | None = None
+
     @staticmethod
     def _head(name: str) -> str:  # pragma: no cover
         """Return DOT head line."""
@@ -114,7 +240,8 @@ class Dot(quoting.Quote, base.Base):
                  node_attr: Mapping[str, str] | None = None,
                  edge_attr: Mapping[str, str] | None = None,
                  body: Iterable[str] | None = None,
-                 strict: bool = False, **kwargs) -> None:
+                 strict: bool = False,
+                 storage: str = records.DEFAULT_STORAGE, **kwargs) -> None:
         super().__init__(**kwargs)
 
         self.name: str | None = name
@@ -132,8 +259,15 @@ class Dot(quoting.Quote, base.Base):
         self.edge_attr: dict[str, str] = dict(edge_attr) if edge_attr is not None else {}
         """Attribute-value pairs applying to all edges."""
 
-        self.body: list[str] = list(body) if body is not None else []
-        """Verbatim DOT source lines including final newline."""
+        records.verify_storage(storage)
+        body = body if body is not None else []
+        self.body: list[str] = (BODY_TYPES[storage](body, syntax=self.__class__)
+                                if storage in BODY_TYPES
+                                else records.copy_lines(body))
+        """Verbatim DOT source lines including final newline
+            (:class:`.SubgraphRef` lines added by :meth:`.subgraph` by reference,
+            :class:`.records.RecordList` with ``storage='records'``,
+            :class:`.compact.CompactList` with ``storage='compact'``)."""
 
         self.strict: bool = strict
         """Rendering should merge multi-edges."""
@@ -145,8 +279,35 @@ class Dot(quoting.Quote, base.Base):
                                     graph_attr=dict(self.graph_attr),
                                     node_attr=dict(self.node_attr),
                                     edge_attr=dict(self.edge_attr),
-                                    body=list(self.body),
-                                    strict=self.strict)
+                                    body=self.body.copy(),
+                                    strict=self.strict,
+                                    storage=records.get_storage(self.body))
+
+    def copy(self):
+        """Return a copied instance of the object.
+
+        Returns:
+            An independent copy of the current object.
+
+        Note:
+            The ``body`` lines and the generated source are shared
+            until either graph changes them (appending does not),
+            so copying is ``O(1)`` in the number of lines.
+        """
+        result = super().copy()
+        cache = self._source_cache
+        if (cache is not None and isinstance(result.body, records.CopyOnWriteList)
+            and cache.body is self.body and cache.changes == self.body._changes):  # noqa: E129
+            result._source_cache = copied = SourceCache(cache.source, head=cache.head,
+                                                        body=result.body,
+                                                        changes=result.body._changes,
+                                                        length=cache.length,
+                                                        refs=list(cache.refs))
+            copied.appended = list(cache.appended)
+            if cache.hasher is not None:
+                copied.hasher = cache.hasher.copy()
+            copied.encoded = cache.encoded
+        return result
 
     @_tools.deprecate_positional_args(supported_number=0, ignore_arg='self')
     def clear(self, keep_attrs: bool = False) -> None:
@@ -166,7 +327,140 @@ class Dot(quoting.Quote, base.Base):
 
         Yields: Line ending with a newline (``'\n'``).
         """
-        if self.comment:
+        return self._iterlines(subgraph=subgraph)
+
+    def _iterlines(self, *, subgraph: bool = False, indent: str = '',
+                   parents: tuple['Dot', ...] = ()) -> Iterator[str]:
+        """Yield the lines prefixed with ``indent`` expanding subgraph references."""
+        yield from (indent + line for line in self._iterhead(subgraph=subgraph))
+
+        yield from self._iterbody(self.body, indent=indent, parents=(*parents, self))
+
+        yield indent + self._tail
+
+    @staticmethod
+    def _iterbody(items: Iterable, *, indent: str = '',
+                  parents: tuple['Dot', ...],
+                  refs: list['SubgraphRef'] | None = None) -> Iterator[str]:
+        """Yield the body ``items`` prefixed with ``indent`` expanding subgraph references."""
+        for line in items:
+            if isinstance(line, SubgraphRef):
+                if refs is not None:
+                    refs.append(line)
+                yield from line._iterlines(indent=indent + '\t', parents=parents)
+            else:
+                yield indent + line
+
+    def _update_source_cache(self, *, parents: tuple['Dot', ...] = ()) -> SourceCache | None:
+        """Return the source cache brought up to date (``None`` if the body is untracked)."""
+        if any(p is self for p in parents):
+            raise ValueError(f'subgraph cycle: {self!r} is contained in itself')
+        parents = (*parents, self)
+
+        body = self.body
+        if not isinstance(body, records.TrackedList) or not body._cacheable:
+            return None
+
+        head = ''.join(self._iterhead())
+        length = len(body)
+        refs: list[SubgraphRef] = []
+        cache = self._source_cache
+        if (cache is not None and cache.body is body and cache.changes == body._changes
+            and cache.length <= length and cache.head == head
+            and all(r.graph._cached_source(parents=parents) == source
+                    for r, source in cache.refs)):  # noqa: E129
+            if cache.length < length:
+                appended = ''.join(self._iterbody(body._iterfrom(cache.length),
+                                                  parents=parents, refs=refs))
+                cache.appended.append(appended)
+                if cache.hasher is not None:
+                    cache.hasher.update(appended.encode(fingerprinting.SOURCE_ENCODING))
+                cache.length = length
+                cache.encoded = None
+        else:
+            body_text = ''.join(self._iterbody(body, parents=parents, refs=refs))
+            cache = self._source_cache = SourceCache(f'{head}{body_text}{self._tail}',
+                                                     head=head, body=body,
+                                                     changes=body._changes,
+                                                     length=length, refs=[])
+
+        cache.refs += [(r, r.graph._cached_source(parents=parents)) for r in refs]
+        return cache
+
+    def _cached_source(self, *, parents: tuple['Dot', ...] = ()) -> str:
+        """Return the generated source reusing or extending the cached one."""
+        cache = self._update_source_cache(parents=parents)
+        if cache is None:
+            return ''.join(self._iterlines(parents=parents))
+
+        if cache.appended:
+            tail = self._tail
+            cache.source = ''.join([cache.source[:-len(tail)], *cache.appended, tail])
+            cache.appended.clear()
+        return cache.source
+
+    def _source_hasher(self) -> hashlib.blake2b:
+        """Return a new hasher updated with the encoded source (updated incrementally)."""
+        cache = self._update_source_cache()
+        if cache is None:
+            return fingerprinting.new_hasher(''.join(self).encode(fingerprinting.SOURCE_ENCODING))
+
+        if cache.hasher is None:
+            source = self._cached_source()
+            cache.hasher = fingerprinting.new_hasher(source[:-len(self._tail)]
+                                                     .encode(fingerprinting.SOURCE_ENCODING))
+        hasher = cache.hasher.copy()
+        hasher.update(self._tail.encode(fingerprinting.SOURCE_ENCODING))
+        return hasher
+
+    def _itertopology(self, *, subgraph: bool = False, indent: str = '',
+                      parents: tuple['Dot', ...] = ()) -> Iterator[str]:
+        """Yield the lines without comments and cosmetic attributes
+            (stripped from the attribute mappings and records)."""
+        if any(p is self for p in parents):
+            raise ValueError(f'subgraph cycle: {self!r} is contained in itself')
+        parents = (*parents, self)
+
+        yield from (indent + line for line in self._iterhead(subgraph=subgraph, strip=True))
+
+        body = self.body
+        items = body._iteritems() if isinstance(body, records.LineList) else body
+        for item in items:
+            if isinstance(item, SubgraphRef):
+                yield from item.graph._itertopology(subgraph=True, indent=indent + '\t',
+                                                    parents=parents)
+            elif isinstance(item, str):
+                if (line := topology.strip_line(item)):
+                    yield indent + line
+            elif isinstance(item, records.Record):
+                if (line := self._strip_record(item)):
+                    yield indent + line
+            else:
+                assert isinstance(body, compact.CompactList)
+                yield from (indent + line for line in body._iterblock(item))
+
+        yield indent + self._tail
+
+    @classmethod
+    def _strip_record(cls, record: records.Record) -> str:
+        """Return the line of ``record`` without cosmetic attributes."""
+        if record.removed:
+            return ''
+        result = record.copy()
+        result.attrs = dict(topology.strip_attrs(record.attrs))
+        result.attributes = topology.strip_attrs(record.attributes) or None
+        if 'label' in topology.get_cosmetic_attributes():
+            result.label = None
+        if (isinstance(result, records.AttrRecord) and result.kw is None
+            and not result.attrs and not result.attributes):  # noqa: E129
+            return ''
+        return result.format(cls)
+
+    def _iterhead(self, *, subgraph: bool = False,
+                  strip: bool = False) -> Iterator[str]:
+        """Yield the comment, head, and graph/node/edge attribute lines
+            (without comment and cosmetic attributes if ``strip``)."""
+        if self.comment and not strip:
             yield self._comment(self.comment)
 
         if subgraph:
@@ -179,13 +473,11 @@ class Dot(quoting.Quote, base.Base):
 
         for kw in ('graph', 'node', 'edge'):
             attrs = getattr(self, f'{kw}_attr')
+            if strip:
+                attrs = dict(topology.strip_attrs(attrs))
             if attrs:
                 yield self._attr(kw, self._attr_list(None, kwargs=attrs))
 
-        yield from self.body
-
-        yield self._tail
-
     @_tools.deprecate_positional_args(supported_number=2, ignore_arg='self',
                                       category=DeprecationWarning)
     def node(self, name: str,
@@ -204,6 +496,10 @@ class Dot(quoting.Quote, base.Base):
             See the sections :ref:`backslash-escapes` and
             :ref:`quoting-and-html-like-labels` in the user guide for details.
         """
+        if isinstance(self.body, records.RecordList):
+            self.body.append(records.NodeRecord(name, label=label, attrs=attrs,
+                                                attributes=_attributes))
+            return
         name = self._quote(name)
         attr_list = self._attr_list(label, kwargs=attrs, attributes=_attributes)
         line = self._node(name, attr_list)
@@ -236,30 +532,128 @@ class Dot(quoting.Quote, base.Base):
             See the sections :ref:`backslash-escapes` and
             :ref:`quoting-and-html-like-labels` in the user guide for details.
         """
+        if isinstance(self.body, records.RecordList):
+            self.body.append(records.EdgeRecord(tail_name, head_name,
+                                                label=label, attrs=attrs,
+                                                attributes=_attributes))
+            return
+        if (isinstance(self.body, compact.CompactList)
+            and label is None and not attrs and not _attributes):  # noqa: E129
+            self.body.add_edge(tail_name, head_name)
+            return
         tail_name = self._quote_edge(tail_name)
         head_name = self._quote_edge(head_name)
         attr_list = self._attr_list(label, kwargs=attrs, attributes=_attributes)
         line = self._edge(tail=tail_name, head=head_name, attr=attr_list)
         self.body.append(line)
 
-    def edges(self, tail_head_iter: Iterable[tuple[str, str]]) -> None:
+    def nodes(self, names: Iterable[str], **attr_columns) -> None:
+        """Create a bunch of nodes with per-node attributes.
+
+        Args:
+            names: Iterable of unique node identifiers.
+            attr_columns: Attribute columns, either iterables parallel to
+                ``names`` (e.g. lists or NumPy arrays, ``None`` items omit
+                the attribute for that node) or single values
+                (e.g. strings or numbers) used for all nodes.
+
+        Raises:
+            ValueError: If the attribute columns differ in length from ``names``.
+
+        Example:
+            >>> import graphviz  # doctest: +NO_EXE
+            >>> dot = graphviz.Digraph()
+            >>> dot.nodes(['A', 'B'], label=['King Arthur', None], shape='box')
+            >>> print(dot.source)  # doctest: +NORMALIZE_WHITESPACE
+            digraph {
+                A [label="King Arthur" shape=box]
+                B [shape=box]
+            }
+
+        Note:
+            Items that are not strings (e.g. numbers from NumPy arrays)
+            are converted with :class:`str`.
+        """
+        if isinstance(self.body, records.RecordList):
+            self.body += records.iter_records(records.NodeRecord, [names],
+                                              attr_columns=attr_columns)
+            return
+        node = self._node
+        rows = _iter_attr_list_rows([names], attr_columns=attr_columns,
+                                    quote=self._quote,
+                                    quote_attr_list=self._quote)
+        self.body += [node(name, attr_list) for name, attr_list in rows]
+
+    def edges(self, tail_head_iter: Iterable[tuple[str, str]],
+              heads: Iterable[str] | None = None, **attr_columns) -> None:
         """Create a bunch of edges.
 
         Args:
             tail_head_iter: Iterable of ``(tail_name, head_name)`` pairs
-                (format:``node[:port[:compass]]``).
-
+                (format:``node[:port[:compass]]``),
+                or iterable of ``tail_name`` items if ``heads`` is given.
+            heads: Iterable of ``head_name`` items parallel to the
+                ``tail_name`` items given as first argument.
+            attr_columns: Attribute columns, either iterables parallel to
+                the edges (e.g. lists or NumPy arrays, ``None`` items omit
+                the attribute for that edge) or single values
+                (e.g. strings or numbers) used for all edges.
+
+        Raises:
+            ValueError: If ``heads`` or the attribute columns
+                differ in length from the tails.
+
+        Example:
+            >>> import graphviz  # doctest: +NO_EXE
+            >>> dot = graphviz.Digraph()
+            >>> dot.edges(['A', 'A'], ['B', 'C'], color=['red', None])
+            >>> print(dot.source)  # doctest: +NORMALIZE_WHITESPACE
+            digraph {
+                A -> B [color=red]
+                A -> C
+            }
 
         Note:
             The ``tail_name`` and ``head_name`` strings are separated
             by (optional) colon(s) into ``node`` name, ``port`` name,
             and ``compass`` (e.g. ``sw``).
             See :ref:`details in the User Guide <node-ports-compass>`.
+
+            Items that are not strings (e.g. numbers from NumPy arrays)
+            are converted with :class:`str`.
         """
-        edge = self._edge_plain
-        quote = self._quote_edge
-        self.body += [edge(tail=quote(t), head=quote(h))
-                      for t, h in tail_head_iter]
+        if not attr_columns and not isinstance(self.body, records.LineList):
+            edge_plain = self._edge_plain
+            quote = self._quote_edge
+            pairs: Iterable = (tail_head_iter if heads is None
+                               else zip(tail_head_iter, heads, strict=True))
+            self.body += [edge_plain(tail=quote(t), head=quote(h))
+                          for t, h in pairs]
+            return
+
+        if isinstance(self.body, compact.CompactList) and not attr_columns:
+            self.body.add_edges(tail_head_iter, heads)  # without copying the columns
+            return
+
+        columns: list[Iterable]
+        if heads is None:
+            pairs = list(tail_head_iter)
+            columns = [[t for t, _ in pairs], [h for _, h in pairs]]
+        else:
+            columns = [tail_head_iter, heads]
+
+        if isinstance(self.body, records.RecordList):
+            self.body += records.iter_records(records.EdgeRecord, columns,
+                                              attr_columns=attr_columns)
+            return
+
+        rows = _iter_attr_list_rows(columns,
+                                    attr_columns=attr_columns,
+                                    quote=self._quote_edge,
+                                    quote_attr_list=self._quote)
+        edge = self._edge
+        self.body += [edge(tail=t, head=h, attr=attr_list)
+                      for t, h, attr_list in rows]
 
     @_tools.deprecate_positional_args(supported_number=1, ignore_arg='self',
                                       category=DeprecationWarning)
@@ -277,7 +671,9 @@ class Dot(quoting.Quote, base.Base):
         if kw is not None and kw.lower() not in ('graph', 'node', 'edge'):
             raise ValueError('attr statement must target graph, node, or edge:'
                              f' {kw!r}')
-        if attrs or _attributes:
+        if (attrs or _attributes) and isinstance(self.body, records.RecordList):
+            self.body.append(records.AttrRecord(kw, attrs=attrs, attributes=_attributes))
+        elif attrs or _attributes:
             if kw is None:
                 a_list = self._a_list(None, kwargs=attrs, attributes=_attributes)
                 line = self._attr_plain(a_list)
@@ -293,8 +689,9 @@ class Dot(quoting.Quote, base.Base):
                  graph_attr: Mapping[str, str] | None = None,
                  node_attr: Mapping[str, str] | None = None,
                  edge_attr: Mapping[str, str] | None = None,
-                 body=None):
-        """Add the current content of the given sole ``graph`` argument
+                 body=None, *,
+                 by_reference: bool = False):
+        """Add the given sole ``graph`` argument
             as subgraph or return a context manager
             returning a new graph instance
             created with the given (``name``, ``comment``, etc.) arguments
@@ -315,6 +712,8 @@ class Dot(quoting.Quote, base.Base):
                 (``with``-block use).
             body: Verbatim lines to add to the subgraph ``body``
                 (``with``-block use).
+            by_reference: Add a reference to the subgraph
+                instead of a copy of its current lines.
 
         See the :ref:`usage examples in the User Guide <subgraphs-clusters>`.
 
@@ -322,24 +721,32 @@ class Dot(quoting.Quote, base.Base):
         uses ``strict=None`` and the parent graph's values
         for ``directory``, ``format``, ``engine``, and ``encoding`` by default.
 
+        With ``by_reference=True``, the subgraph is added to the ``body``
+        as :class:`.SubgraphRef` line so that later changes of the subgraph
+        are included in the source and the same subgraph instance can be added
+        to several graphs without copying its lines.
+        Its lines are indented when the source is generated.
+
         Note:
             If the ``name`` of the subgraph begins with
             ``'cluster'`` (all lowercase)
             the layout engine will treat it as a special cluster subgraph.
         """
         if graph is None:
-            kwargs = self._copy_kwargs()
+            # inherit the rendering parameters without copying the content
+            kwargs = super()._copy_kwargs()
             kwargs.pop('filename', None)
             kwargs.update(name=name, comment=comment,
                           graph_attr=graph_attr, node_attr=node_attr, edge_attr=edge_attr,
-                          body=body, strict=None)
+                          body=body, strict=None,
+                          storage=records.get_storage(self.body))
             subgraph = self.__class__(**kwargs)
 
             @contextlib.contextmanager
             def subgraph_contextmanager(*, parent):
                 """Return subgraph and add to parent on exit."""
                 yield subgraph
-                parent.subgraph(subgraph)
+                parent.subgraph(subgraph, by_reference=by_reference)
 
             return subgraph_contextmanager(parent=self)
 
@@ -351,4 +758,11 @@ class Dot(quoting.Quote, base.Base):
             raise ValueError(f'{self!r} cannot add subgraph of different kind:'
                              f' {graph!r}')
 
-        self.body += [f'\t{line}' for line in graph.__iter__(subgraph=True)]
+        if not by_reference or graph is self:
+            self.body += [f'\t{line}' for line in graph.__iter__(subgraph=True)]
+            return
+
+        if graph.strict:
+            raise ValueError('subgraphs cannot be strict')
+
+        self.body.append(SubgraphRef(graph))
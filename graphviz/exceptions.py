@@ -2,9 +2,9 @@
 
 import builtins as _builtins
 
-from .backend.execute import ExecutableNotFound, CalledProcessError
+from .backend.execute import ExecutableNotFound, CalledProcessError, BatchError
 
-__all__ = ['ExecutableNotFound', 'CalledProcessError',
+__all__ = ['ExecutableNotFound', 'CalledProcessError', 'BatchError',
            'RequiredArgumentError', 'FileExistsError',
            'UnknownSuffixWarning', 'FormatSuffixMismatchWarning',
            'DotSyntaxWarning']
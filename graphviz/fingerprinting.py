@@ -0,0 +1,77 @@
+"""Hash the DOT source and rendering parameters into a content fingerprint."""
+
+from collections.abc import Iterator
+import hashlib
+from typing import Final
+
+from . import base
+from . import parameters
+from . import topology as topology_
+
+__all__ = ['DIGEST_SIZE', 'Fingerprint']
+
+DIGEST_SIZE: Final = 32
+
+SOURCE_ENCODING: Final = 'utf-8'
+
+
+def new_hasher(data: bytes = b'') -> hashlib.blake2b:
+    """Return a new BLAKE2b hasher (updated with ``data``)."""
+    return hashlib.blake2b(data, digest_size=DIGEST_SIZE)
+
+
+class Fingerprint(base.Base, parameters.Parameters):
+    """Fingerprint of the DOT source and rendering parameters."""
+
+    def fingerprint(self, *, parameters: bool = False,
+                    topology: bool = False) -> str:
+        """Return the BLAKE2b hex digest of the UTF-8 encoded DOT source.
+
+        Args:
+            parameters: Also include ``engine``, ``format``,
+                ``renderer``, and ``formatter`` (e.g. for a render cache key).
+            topology: Only include the layout-relevant statements,
+                ignoring comments and cosmetic attributes
+                (see :func:`graphviz.topology.set_cosmetic_attributes`).
+
+        Returns:
+            Hexadecimal digest string.
+
+        Example:
+            >>> import graphviz  # doctest: +NO_EXE
+            >>> dot = graphviz.Graph()
+            >>> dot.edge('spam', 'eggs')
+            >>> dot.fingerprint() == graphviz.Source(dot.source).fingerprint()
+            True
+            >>> dot.fingerprint() == dot.fingerprint(parameters=True)
+            False
+
+            >>> red = dot.copy()
+            >>> red.node('spam', color='red')
+            >>> blue = dot.copy()
+            >>> blue.node('spam', color='blue', tooltip='Spam')
+            >>> red.fingerprint() == blue.fingerprint()
+            False
+            >>> red.fingerprint(topology=True) == blue.fingerprint(topology=True)
+            True
+        """
+        hasher = self._topology_hasher() if topology else self._source_hasher()
+        if parameters:
+            values = (self.engine, self.format, self.renderer, self.formatter)
+            hasher.update(b'\0' + '\0'.join(v or '' for v in values).encode('ascii'))
+        return hasher.hexdigest()
+
+    def _source_hasher(self) -> hashlib.blake2b:
+        """Return a new hasher updated with the encoded source."""
+        return new_hasher(self.source.encode(SOURCE_ENCODING))
+
+    def _topology_hasher(self) -> hashlib.blake2b:
+        """Return a new hasher updated with the encoded layout-relevant lines."""
+        hasher = new_hasher()
+        for line in self._itertopology():
+            hasher.update(line.encode(SOURCE_ENCODING))
+        return hasher
+
+    def _itertopology(self) -> Iterator[str]:
+        """Yield the source lines without cosmetic attributes."""
+        return topology_.iter_stripped(self)
@@ -35,7 +35,9 @@ from collections.abc import Iterable, Mapping
 from .encoding import DEFAULT_ENCODING
 from . import _tools
 from . import dot
+from . import fingerprinting
 from . import jupyter_integration
+from . import layouts
 from . import piping
 from . import rendering
 from . import unflattening
@@ -45,8 +47,8 @@ __all__ = ['Graph', 'Digraph']
 
 class BaseGraph(dot.Dot,
                 rendering.Render,
-                jupyter_integration.JupyterIntegration, piping.Pipe,
-                unflattening.Unflatten):
+                jupyter_integration.JupyterIntegration, layouts.Layout, piping.Pipe,
+                unflattening.Unflatten, fingerprinting.Fingerprint):
     """Dot language creation and source code rendering."""
 
     @_tools.deprecate_positional_args(supported_number=1, ignore_arg='self')
@@ -62,14 +64,15 @@ class BaseGraph(dot.Dot,
                  body: Iterable[str] | None = None,
                  strict: bool = False, *,
                  renderer: str | None = None,
-                 formatter: str | None = None) -> None:
+                 formatter: str | None = None,
+                 storage: str = 'lines') -> None:
         if filename is None and name is not None:
             filename = f'{name}.{self._default_extension}'
 
         super().__init__(name=name, comment=comment,
                          graph_attr=graph_attr,
                          node_attr=node_attr, edge_attr=edge_attr,
-                         body=body, strict=strict,
+                         body=body, strict=strict, storage=storage,
                          filename=filename, directory=directory,
                          encoding=encoding,
                          format=format, engine=engine,
@@ -77,8 +80,23 @@ class BaseGraph(dot.Dot,
 
     @property
     def source(self) -> str:
-        """The generated DOT source code as string."""
-        return ''.join(self)
+        """The generated DOT source code as string.
+
+        Cached until the graph changes.
+        Extended in place if only lines have been appended to the ``body``.
+        """
+        return self._cached_source()
+
+    @property
+    def encoded_source(self) -> bytes:
+        """The generated DOT source code encoded with :attr:`encoding` (cached)."""
+        source = self._cached_source()
+        cache = self._source_cache
+        if cache is None or cache.source is not source:
+            return source.encode(self.encoding)
+        if cache.encoded is None or cache.encoded[0] != self.encoding:
+            cache.encoded = (self.encoding, source.encode(self.encoding))
+        return cache.encoded[1]
 
 
 class Graph(dot.GraphSyntax, BaseGraph):
@@ -101,6 +119,10 @@ class Graph(dot.GraphSyntax, BaseGraph):
         body: Iterable of verbatim lines (including their final newline)
             to add to the graph ``body``.
         strict (bool): Rendering should merge multi-edges.
+        storage: Keep the ``body`` as verbatim lines (``'lines'``),
+            as statement records formatted on iteration (``'records'``,
+            see :class:`.records.RecordList`), or with plain edges
+            as integer pairs (``'compact'``, see :class:`.compact.CompactList`).
 
     Note:
         All parameters are `optional` and can be changed under their
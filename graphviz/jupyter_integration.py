@@ -73,6 +73,10 @@ class JupyterIntegration(piping.Pipe):
         Returns:
             Mapping from mimetypes to data.
 
+        Note:
+            If several mimetypes are requested, the graph is laid out once
+            and rendered into all their formats (see :meth:`.pipe_multi`).
+
         Example:
             >>> doctest_mark_exe()
             >>> import graphviz
@@ -97,9 +101,19 @@ class JupyterIntegration(piping.Pipe):
         """
         include = set(include) if include is not None else {self._jupyter_mimetype}
         include -= set(exclude or [])
-        return {mimetype: getattr(self, method_name)()
-                for mimetype, method_name in MIME_TYPES.items()
-                if mimetype in include}
+        mimetypes = [m for m in MIME_TYPES if m in include]
+        if len(mimetypes) > 1:
+            return self._repr_mimebundle_multi(mimetypes)
+        return {mimetype: getattr(self, MIME_TYPES[mimetype])()
+                for mimetype in mimetypes}
+
+    def _repr_mimebundle_multi(self, mimetypes: Iterable[str]) -> dict[str, bytes | str]:
+        """Return the graph laid out once and rendered for each of the ``mimetypes``."""
+        formats = {m: get_jupyter_mimetype_format(m) for m in mimetypes}
+        outputs = self.pipe_multi(formats.values())
+        return {mimetype: (self._decode_output(outputs[format], SVG_ENCODING)
+                           if format == 'svg' else outputs[format])
+                for mimetype, format in formats.items()}
 
     def _repr_image_jpeg(self) -> bytes:
         """Return the rendered graph as JPEG bytes."""
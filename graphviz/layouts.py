@@ -0,0 +1,588 @@
+"""Lay out once and render format or style variants with ``neato -n2``."""
+
+from collections.abc import Iterable, Iterator, Mapping
+import json
+import logging
+import math
+import re
+
+from . import backend
+from . import caching
+from . import columns
+from . import encoding as _encoding
+from . import piping
+from . import plain
+from . import quoting
+from . import topology
+
+__all__ = ['LAYOUT_FORMAT', 'Positions', 'Layout', 'IncrementalLayout']
+
+LAYOUT_FORMAT = 'json0'
+
+NO_OP_ENGINE = 'neato'
+
+NO_OP = 2
+
+DOT_FORMATS = frozenset({'canon', 'dot', 'gv', 'xdot', 'xdot1.2', 'xdot1.4'})
+
+SEED_DISTANCE = 36.0
+
+GOLDEN_ANGLE = math.pi * (3 - math.sqrt(5))
+
+STATEMENT_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|[<\[\]{};\n]|[^"<\[\]{};\n]+|"',
+                             flags=re.DOTALL)
+
+ID = r'"(?:[^"\\]|\\.)*"|-?(?:\.[0-9]+|[0-9]+(?:\.[0-9]*)?)|\w+'
+
+NODE_ID = re.compile(rf'\s*(?P<id>{ID})(?:\s*:\s*(?:{ID})){{0,2}}\s*', flags=re.DOTALL)
+
+KEYWORDS = frozenset({'node', 'edge', 'graph', 'digraph', 'subgraph', 'strict'})
+
+
+log = logging.getLogger(__name__)
+
+
+class Positions:
+    """Node positions (in points) of a graph laid out by ``engine``.
+
+    Example:
+        >>> import graphviz  # doctest: +NO_EXE
+        >>> positions = graphviz.layouts.Positions('dot', {'spam': '27,18'})
+        >>> print(''.join(positions.iterlines(['graph {\\n', '\\tspam\\n', '}\\n'])))
+        ... # doctest: +NORMALIZE_WHITESPACE
+        graph {
+            spam
+            spam [pos="27,18"]
+        }
+        <BLANKLINE>
+    """
+
+    __slots__ = ('engine', 'nodes')
+
+    def __init__(self, engine: str, nodes: Mapping[str, str]) -> None:
+        self.engine = engine
+        """Layout engine that computed the positions."""
+
+        self.nodes = dict(nodes)
+        """Mapping from node names to their ``pos`` (``'x,y'`` in points)."""
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} engine={self.engine!r} nodes={len(self.nodes)}>'
+
+    @classmethod
+    def from_json(cls, data: bytes | str, *, engine: str) -> 'Positions':
+        """Return the node positions from ``json0`` (or ``json``) layout output."""
+        graph = json.loads(data)
+        objects = graph.get('objects', [])
+        # subgraphs come first, followed by the nodes
+        nodes = objects[graph.get('_subgraph_cnt', 0):]
+        return cls(engine, {n['name']: n['pos'] for n in nodes if 'pos' in n})
+
+    @classmethod
+    def from_dot(cls, data: bytes | str, *, engine: str,
+                 encoding: str = _encoding.DEFAULT_ENCODING) -> 'Positions':
+        """Return the node positions from ``dot`` (or ``xdot``) layout output."""
+        if isinstance(data, bytes):
+            data = data.decode(encoding)
+        nodes = {}
+        for head, a_list in iterstatements(data):
+            if (not a_list or (names := node_names(head)) is None or len(names) != 1
+                or (items := topology.split_a_list(a_list)) is None):  # noqa: E129
+                continue
+            for _, value, name in items:
+                if name == 'pos':
+                    nodes[names[0]] = quoting.unquote(value)
+        return cls(engine, nodes)
+
+    def coordinates(self) -> dict[str, tuple[float, float]]:
+        """Return the parsed ``(x, y)`` of the nodes (skipping invalid ``pos``)."""
+        result = {}
+        for name, pos in self.nodes.items():
+            try:
+                (x, y) = map(float, pos.rstrip('!').split(',')[:2])
+            except ValueError:
+                continue
+            result[name] = (x, y)
+        return result
+
+    def iterlines(self, lines: Iterable[str]) -> Iterator[str]:
+        """Yield ``lines`` with a ``pos`` statement for each node
+            inserted before the closing brace of the graph."""
+        return insert_lines(lines, (f'\t{quoting.quote(quoting.nohtml(name))} [pos="{pos}"]\n'
+                                    for name, pos in self.nodes.items()))
+
+
+def insert_lines(lines: Iterable[str], inserted: Iterable[str]) -> Iterator[str]:
+    """Yield ``lines`` with ``inserted`` before the closing brace of the graph."""
+    tail: list[str] = []
+    for line in lines:
+        if '}' in line:
+            yield from tail
+            tail = [line]
+        elif tail:
+            tail.append(line)
+        else:
+            yield line
+
+    if not tail:
+        raise ValueError('cannot insert positions into source'
+                         ' without closing brace')
+
+    (last, *rest) = tail
+    index = last.rindex('}')
+    if last[:index].strip():
+        yield last[:index] + '\n'
+    yield from inserted
+    yield last[index:]
+    yield from rest
+
+
+def iterstatements(text: str) -> Iterator[tuple[str, str]]:
+    r"""Yield ``(head, a_list)`` pairs of the DOT statements in ``text``.
+
+    >>> list(iterstatements('graph {\n\tspam\t[pos="27,18",\n\t\twidth=0.75];\n}\n'))
+    ... # doctest: +NO_EXE
+    [('graph ', ''), ('\tspam\t', 'pos="27,18",\n\t\twidth=0.75')]
+    """
+    text = text.replace('\\\n', '')
+    head: list[str] = []
+    a_list: list[str] = []
+    in_a_list = False
+    pos = 0
+    while pos < len(text):
+        match = STATEMENT_TOKEN.match(text, pos)
+        assert match is not None
+        (token, pos) = (match.group(), match.end())
+        if token == '<':
+            end = topology.html_end(text, pos)
+            if end is None:
+                end = len(text)
+            (token, pos) = (text[pos - 1:end], end)
+
+        if in_a_list:
+            if token == ']':
+                in_a_list = False
+            else:
+                a_list.append(token)
+        elif token == '[':
+            if a_list:
+                a_list.append(' ')
+            in_a_list = True
+        elif token in ('{', '}', ';', '\n'):
+            if a_list or ''.join(head).strip():
+                yield ''.join(head), ''.join(a_list)
+            head, a_list = [], []
+        else:
+            head.append(token)
+
+    if a_list or ''.join(head).strip():
+        yield ''.join(head), ''.join(a_list)
+
+
+def node_names(head: str) -> list[str] | None:
+    r"""Return the node names of a node or edge statement ``head``
+        (``None`` for other statements).
+
+    >>> node_names('\tspam:n -> "eggs \\"ham\\""')  # doctest: +NO_EXE
+    ['spam', 'eggs "ham"']
+
+    >>> node_names('\tnode ') is None
+    True
+    """
+    names = []
+    pos = 0
+    while True:
+        if (match := NODE_ID.match(head, pos)) is None:
+            return None
+        names.append(match['id'])
+        pos = match.end()
+        if pos == len(head):
+            break
+        if not head.startswith(('--', '->'), pos):
+            return None
+        pos += 2
+
+    if names[0].lower() in KEYWORDS:
+        return None
+    return [quoting.unquote(n) for n in names]
+
+
+class Layout(piping.Pipe):
+    """Lay out the source once and pipe it with the computed node positions."""
+
+    def layout(self, *, engine: str | None = None,
+               quiet: bool = False) -> Positions:
+        """Return the node positions computed by the layout command (memoized).
+
+        Args:
+            engine: Layout engine for computing the positions
+                (``'dot'``, ``'neato'``, ...).
+            quiet (bool): Suppress ``stderr`` output
+                from the layout subprocess.
+
+        Returns:
+            Positions of the nodes (see :meth:`.pipe_positioned`).
+
+        Raises:
+            ValueError: If ``engine`` is unknown.
+            graphviz.ExecutableNotFound: If the Graphviz ``dot`` executable
+                is not found.
+            graphviz.CalledProcessError: If the returncode (exit status)
+                of the layout subprocess is non-zero.
+
+        Example:
+            >>> doctest_mark_exe()
+            >>> import graphviz
+            >>> dot = graphviz.Graph()
+            >>> dot.edge('spam', 'eggs')
+            >>> dot.layout()
+            <Positions engine='dot' nodes=2>
+
+        Note:
+            The positions are memoized by ``engine`` and the source
+            without comments and cosmetic attributes
+            (see :meth:`.fingerprint` with ``topology=True``)
+            in :func:`graphviz.caching.get_layout_cache`,
+            so restyled graphs reuse the positions.
+        """
+        engine = self._get_parameters(engine=engine, verify=True)['engine']
+
+        def layout() -> Positions:
+            log.debug('lay out %r with engine %r', self, engine)
+            output = self._pipe_lines(engine, LAYOUT_FORMAT, iter(self),
+                                      input_encoding=self.encoding, quiet=quiet)
+            return Positions.from_json(output, engine=engine)
+
+        if (cache := caching.get_layout_cache()) is None:
+            return layout()
+        return cache.get(self._layout_key(engine), layout)
+
+    def _layout_key(self, engine: str) -> tuple:
+        return (self._topology_hasher().digest(), engine)
+
+    def layout_columns(self, format: str = LAYOUT_FORMAT, *,
+                       engine: str | None = None,
+                       quiet: bool = False) -> columns.LayoutColumns:
+        """Return the node positions and edge control points of the layout
+            in flat arrays parsed while streaming the layout output.
+
+        Args:
+            format: Layout output format (``'json0'``, ``'xdot_json'``,
+                ``'plain'``, ...).
+            engine: Layout engine for computing the positions
+                (``'dot'``, ``'neato'``, ...).
+            quiet (bool): Suppress ``stderr`` output
+                from the layout subprocess.
+
+        Returns:
+            Columns of the layout (see :meth:`.LayoutColumns.to_numpy`).
+
+        Raises:
+            ValueError: If ``format`` is not a supported layout output format
+                or ``engine`` is unknown.
+            graphviz.ExecutableNotFound: If the Graphviz ``dot`` executable
+                is not found.
+            graphviz.CalledProcessError: If the returncode (exit status)
+                of the layout subprocess is non-zero.
+
+        Example:
+            >>> doctest_mark_exe()
+            >>> import graphviz
+            >>> dot = graphviz.Graph()
+            >>> dot.edge('spam', 'eggs')
+            >>> dot.layout_columns()
+            <LayoutColumns nodes=2 edges=1 points=4>
+        """
+        if format in columns.JSON_FORMATS:
+            parse = columns.LayoutColumns.from_json
+        elif format in plain.PLAIN_FORMATS:
+            parse = columns.LayoutColumns.from_plain
+        else:
+            supported = sorted(columns.JSON_FORMATS | plain.PLAIN_FORMATS)
+            raise ValueError(f'unknown layout output format: {format!r}'
+                             f' (must be one of {supported})')
+
+        chunks = self.pipe_iter(format, engine=engine, quiet=quiet)
+        return parse(chunks, encoding=self.encoding)
+
+    def iter_plain(self, format: str = 'plain', *,
+                   engine: str | None = None,
+                   quiet: bool = False,
+                   chunk_size: int = backend.execute.OUTPUT_CHUNK_SIZE,
+                   ) -> Iterator[plain.PlainGraph | plain.PlainNode
+                                 | plain.PlainEdge | plain.PlainStop]:
+        """Return an iterator over the records of the ``plain`` layout output
+            parsed while streaming it from the layout command.
+
+        Args:
+            format: ``'plain'`` or ``'plain-ext'`` (with edge ports).
+            engine: Layout engine for computing the positions
+                (``'dot'``, ``'neato'``, ...).
+            quiet (bool): Suppress ``stderr`` output
+                from the layout subprocess.
+            chunk_size: Maximal number of bytes read at once from ``stdout``.
+
+        Returns:
+            Iterator yielding :class:`.PlainGraph`, :class:`.PlainNode`,
+                :class:`.PlainEdge`, and :class:`.PlainStop` records.
+
+        Raises:
+            ValueError: If ``format`` is not ``'plain'`` or ``'plain-ext'``,
+                ``engine`` is unknown, or the output contains an invalid line.
+            graphviz.ExecutableNotFound: If the Graphviz ``dot`` executable
+                is not found.
+            graphviz.CalledProcessError: If the returncode (exit status)
+                of the layout subprocess is non-zero.
+
+        Example:
+            >>> doctest_mark_exe()
+            >>> import graphviz
+            >>> dot = graphviz.Graph()
+            >>> dot.edge('spam', 'eggs')
+            >>> [r.name for r in dot.iter_plain() if isinstance(r, graphviz.plain.PlainNode)]
+            ['spam', 'eggs']
+
+        Note:
+            The layout command is started on the first :func:`next`
+            and killed if the iterator is closed before its end
+            (see :meth:`.pipe_iter`).
+        """
+        if format not in plain.PLAIN_FORMATS:
+            raise ValueError(f'unknown plain output format: {format!r}'
+                             f' (must be one of {sorted(plain.PLAIN_FORMATS)})')
+
+        chunks = self.pipe_iter(format, engine=engine, quiet=quiet, chunk_size=chunk_size)
+        return plain.iterparse(chunks, encoding=self.encoding)
+
+    def pipe_positioned(self, format: str | None = None, *,
+                        positions: Positions | None = None,
+                        renderer: str | None = None,
+                        formatter: str | None = None,
+                        quiet: bool = False,
+                        encoding: str | None = None) -> bytes | str:
+        """Return the source with node positions piped through ``neato -n2``.
+
+        Args:
+            format: The output format used for rendering
+                (``'pdf'``, ``'png'``, etc.).
+            positions: Node positions from :meth:`.layout`
+                (default: call :meth:`.layout`, reusing the memoized positions
+                if only cosmetic attributes changed).
+            renderer: The output renderer used for rendering
+                (``'cairo'``, ``'gd'``, ...).
+            formatter: The output formatter used for rendering
+                (``'cairo'``, ``'gd'``, ...).
+            quiet (bool): Suppress ``stderr`` output
+                from the layout subprocess.
+            encoding: Encoding for decoding the stdout.
+
+        Returns:
+            Bytes or if encoding is given decoded string
+                (stdout of the layout command).
+
+        Raises:
+            ValueError: If ``format``, ``renderer``, or ``formatter``
+                are unknown or the source has no closing brace.
+            graphviz.RequiredArgumentError: If ``formatter`` is given
+                but ``renderer`` is None.
+            graphviz.ExecutableNotFound: If the Graphviz ``dot`` executable
+                is not found.
+            graphviz.CalledProcessError: If the returncode (exit status)
+                of the rendering ``neato`` subprocess is non-zero
+                (e.g. for nodes without position).
+
+        Example:
+            >>> doctest_mark_exe()
+            >>> import graphviz
+            >>> dot = graphviz.Graph()
+            >>> dot.edge('spam', 'eggs')
+            >>> positions = dot.layout()
+            >>> dot.node('spam', color='red')
+            >>> dot.pipe_positioned('svg', positions=positions)[:14]
+            b'<?xml version='
+
+        Note:
+            Only the nodes are positioned, so changes that keep the nodes
+            (e.g. colors or fonts) do not need a new layout.
+            Edges are routed again according to the ``splines`` graph attribute.
+        """
+        if positions is None:
+            positions = self.layout(quiet=quiet)
+
+        (args, kwargs) = self._get_pipe_parameters(engine=NO_OP_ENGINE,
+                                                   format=format,
+                                                   renderer=renderer,
+                                                   formatter=formatter,
+                                                   neato_no_op=NO_OP,
+                                                   quiet=quiet,
+                                                   verify=True)
+
+        return self._pipe_input_lines(args, kwargs, positions.iterlines(iter(self)),
+                                      encoding=encoding)
+
+
+class IncrementalLayout:
+    """Warm-start the layouts of an evolving graph from the previous positions.
+
+    Args:
+        engine: Layout engine using ``pos`` as initial node positions
+            (``'neato'``, ``'fdp'``, ...).
+        pin: Keep the nodes of the previous layout fixed
+            (``pos`` with ``'!'``).
+        positions: Positions of the previous layout.
+
+    Example:
+        >>> import graphviz  # doctest: +NO_EXE
+        >>> session = graphviz.layouts.IncrementalLayout(pin=True)
+        >>> session.update('{"objects": [{"name": "spam", "pos": "36,18"}]}')
+        <Positions engine='neato' nodes=1>
+        >>> dot = graphviz.Graph()
+        >>> dot.edge('spam', 'eggs')
+        >>> print(''.join(session.iterlines(dot)))  # doctest: +NORMALIZE_WHITESPACE
+        graph {
+            spam -- eggs
+            spam [pos="0.5,0.25!"]
+            eggs [pos="1,0.25"]
+        }
+        <BLANKLINE>
+    """
+
+    __slots__ = ('engine', 'pin', 'positions')
+
+    def __init__(self, engine: str = 'neato', *, pin: bool = False,
+                 positions: Positions | None = None) -> None:
+        self.engine = engine
+        """Layout engine of :meth:`.layout`."""
+
+        self.pin = pin
+        """Pin the nodes of the previous layout (:class:`bool`)."""
+
+        self.positions = positions
+        """Positions of the previous layout (``None`` before the first one)."""
+
+    def __repr__(self) -> str:
+        return (f'<{self.__class__.__name__} engine={self.engine!r}'
+                f' pin={self.pin!r} positions={self.positions!r}>')
+
+    def update(self, data: bytes | str, *, format: str = LAYOUT_FORMAT,
+               encoding: str = _encoding.DEFAULT_ENCODING) -> Positions:
+        """Set the previous positions from layout output.
+
+        Args:
+            data: Output of the previous layout run.
+            format: Its output format (``'json'``, ``'json0'``, ``'xdot_json'``,
+                ``'dot'``, ``'xdot'``, ...).
+            encoding: Encoding for decoding ``dot`` or ``xdot`` bytes.
+
+        Returns:
+            The parsed positions.
+
+        Raises:
+            ValueError: If ``format`` is not a supported layout output format.
+        """
+        if format in columns.JSON_FORMATS:
+            self.positions = Positions.from_json(data, engine=self.engine)
+        elif format in DOT_FORMATS:
+            self.positions = Positions.from_dot(data, engine=self.engine,
+                                                encoding=encoding)
+        else:
+            raise ValueError(f'unknown layout output format: {format!r}'
+                             f' (must be one of {sorted(columns.JSON_FORMATS | DOT_FORMATS)})')
+        return self.positions
+
+    def seed(self, lines: Iterable[str]) -> dict[str, str]:
+        """Return the initial ``pos`` (in inches) for the nodes of ``lines``.
+
+        Nodes of the previous layout keep their position (pinned with ``pin``),
+        new nodes are placed around their positioned neighbours,
+        nodes without positioned neighbours are left to the engine.
+        """
+        names: dict[str, None] = {}
+        neighbours: dict[str, list[str]] = {}
+        for statement_head, _ in iterstatements(''.join(lines)):
+            if (statement := node_names(statement_head)) is None:
+                continue
+            names.update(dict.fromkeys(statement))
+            for tail, head in zip(statement, statement[1:]):
+                neighbours.setdefault(tail, []).append(head)
+                neighbours.setdefault(head, []).append(tail)
+
+        previous = self.positions.coordinates() if self.positions is not None else {}
+        placed = {n: previous[n] for n in names if n in previous}
+        result = {n: _format_pos(xy, pin=self.pin) for n, xy in placed.items()}
+
+        pending = [n for n in names if n not in placed]
+        seeded = 0
+        while pending:
+            rest = []
+            for name in pending:
+                if not (known := [placed[n] for n in neighbours.get(name, ()) if n in placed]):
+                    rest.append(name)
+                    continue
+                angle = seeded * GOLDEN_ANGLE
+                seeded += 1
+                x = sum(x for x, _ in known) / len(known) + SEED_DISTANCE * math.cos(angle)
+                y = sum(y for _, y in known) / len(known) + SEED_DISTANCE * math.sin(angle)
+                placed[name] = (x, y)
+                result[name] = _format_pos((x, y), pin=False)
+            if len(rest) == len(pending):
+                break
+            pending = rest
+        return result
+
+    def iterlines(self, source: Layout) -> Iterator[str]:
+        """Yield the lines of ``source`` with the initial node positions
+            (see :meth:`.seed`) inserted before the closing brace of the graph."""
+        lines = list(source)
+        if self.positions is None:
+            return iter(lines)
+        seed = self.seed(lines)
+        return insert_lines(lines, (f'\t{quoting.quote(quoting.nohtml(name))} [pos="{pos}"]\n'
+                                    for name, pos in seed.items()))
+
+    def layout(self, source: Layout, *, quiet: bool = False) -> Positions:
+        """Lay out ``source`` starting from the previous positions
+            and keep the result for the next call.
+
+        Args:
+            source: Graph or source of the next layout.
+            quiet (bool): Suppress ``stderr`` output
+                from the layout subprocess.
+
+        Returns:
+            Positions of the nodes (see :meth:`.Graph.pipe_positioned`).
+
+        Raises:
+            ValueError: If :attr:`.engine` is unknown.
+            graphviz.ExecutableNotFound: If the Graphviz ``dot`` executable
+                is not found.
+            graphviz.CalledProcessError: If the returncode (exit status)
+                of the layout subprocess is non-zero.
+
+        Example:
+            >>> doctest_mark_exe()
+            >>> import graphviz
+            >>> session = graphviz.layouts.IncrementalLayout()
+            >>> dot = graphviz.Graph()
+            >>> dot.edge('spam', 'eggs')
+            >>> session.layout(dot)
+            <Positions engine='neato' nodes=2>
+            >>> dot.edge('eggs', 'ham')
+            >>> positions = session.layout(dot)
+            >>> dot.pipe_positioned('svg', positions=positions)[:14]
+            b'<?xml version='
+
+        Note:
+            The ``'dot'`` engine ignores initial positions.
+        """
+        engine = source._get_parameters(engine=self.engine, verify=True)['engine']
+        log.debug('lay out %r incrementally with engine %r', source, engine)
+        output = source._pipe_lines(engine, LAYOUT_FORMAT, self.iterlines(source),
+                                    input_encoding=source.encoding, quiet=quiet)
+        self.positions = Positions.from_json(output, engine=engine)
+        return self.positions
+
+
+def _format_pos(xy: tuple[float, float], *, pin: bool) -> str:
+    (x, y) = (c / columns.POINTS_PER_INCH for c in xy)
+    return f'{x:g},{y:g}' + ('!' if pin else '')
@@ -1,24 +1,32 @@
 """Pipe DOT code objects through Graphviz ``dot``."""
 
 import codecs
+from collections.abc import Iterable, Iterator
+import functools
 import logging
 from typing import overload
 
 from . import _tools
 from . import backend
+from . import caching
 from . import exceptions
-from . import base
 from . import encoding
+from . import fingerprinting
 
-__all__ = ['Pipe']
+__all__ = ['Pipe', 'pipe_many', 'pipe_parallel']
 
 
 log = logging.getLogger(__name__)
 
 
-class Pipe(encoding.Encoding, base.Base, backend.Pipe):
+class Pipe(encoding.Encoding, fingerprinting.Fingerprint, backend.Pipe):
     """Pipe source lines through the Graphviz layout command."""
 
+    @property
+    def encoded_source(self) -> bytes:
+        """The DOT source code encoded with :attr:`encoding`."""
+        return self.source.encode(self.encoding)
+
     @overload
     def pipe(self,
              format: str | None = ...,
@@ -141,7 +149,14 @@ class Pipe(encoding.Encoding, base.Base, backend.Pipe):
                                                    quiet=quiet,
                                                    verify=True)
 
-        args.append(iter(self))
+        if (cache := caching.get_pipe_cache()) is not None:
+            return self._pipe_cached(cache, args, kwargs, encoding=encoding)
+
+        return self._pipe_input_lines(args, kwargs, iter(self), encoding=encoding)
+
+    def _pipe_input_lines(self, args: list, kwargs: dict, input_lines: Iterator[str], *,
+                          encoding: str | None) -> bytes | str:
+        args = [*args, input_lines]
 
         if encoding is not None:
             if codecs.lookup(encoding) is codecs.lookup(self.encoding):
@@ -150,11 +165,395 @@ class Pipe(encoding.Encoding, base.Base, backend.Pipe):
             try:
                 raw = self._pipe_lines(*args, input_encoding=self.encoding, **kwargs)
             except exceptions.CalledProcessError as e:
-                if (output := e.output) is not None:
-                    output = output.decode(self.encoding)
-                if (stderr := e.stderr) is not None:
-                    stderr = stderr.decode(self.encoding)
-                raise e.__class__(e.returncode, e.cmd, output=output, stderr=stderr)
+                raise self._decoded_error(e)
             else:
                 return raw.decode(encoding)
         return self._pipe_lines(*args, input_encoding=self.encoding, **kwargs)
+
+    def _pipe_cache_key(self, args: list, kwargs: dict) -> tuple:
+        return (self._source_hasher().digest(), self.encoding,
+                *args, *(v for k, v in kwargs.items() if k != 'quiet'))
+
+    def _pipe_cached(self, cache: caching.PipeCache, args: list, kwargs: dict, *,
+                     encoding: str | None) -> bytes | str:
+        key = self._pipe_cache_key(args, kwargs)
+
+        def pipe() -> bytes:
+            try:
+                return self._pipe_lines(*args, iter(self),
+                                        input_encoding=self.encoding, **kwargs)
+            except exceptions.CalledProcessError as e:
+                if encoding is not None:
+                    raise self._decoded_error(e)
+                raise
+
+        return cache.get(key, pipe, encoding=encoding, decode=self._decode_output)
+
+    def _decode_output(self, raw: bytes, encoding: str) -> str:
+        if codecs.lookup(encoding) is codecs.lookup(self.encoding):
+            # same result as a text mode pipe (universal newlines)
+            return backend.piping._decode(raw, encoding)
+        return raw.decode(encoding)
+
+    def pipe_multi(self, formats: Iterable[str], *,
+                   renderer: str | None = None,
+                   formatter: str | None = None,
+                   neato_no_op: bool | int | None = None,
+                   quiet: bool = False,
+                   engine: str | None = None) -> dict[str, bytes]:
+        """Return the source laid out once and piped into each of ``formats``.
+
+        Args:
+            formats: The output formats used for rendering
+                (``'svg'``, ``'png'``, etc.).
+            renderer: The output renderer used for rendering
+                (``'cairo'``, ``'gd'``, ...).
+            formatter: The output formatter used for rendering
+                (``'cairo'``, ``'gd'``, ...).
+            neato_no_op: Neato layout engine no-op flag.
+            quiet (bool): Suppress ``stderr`` output
+                from the layout subprocess.
+            engine: Layout engine for rendering
+                (``'dot'``, ``'neato'``, ...).
+
+        Returns:
+            Mapping from each of the ``formats`` to its output bytes.
+
+        Raises:
+            ValueError: If ``engine``, ``format``, ``renderer``, or ``formatter``
+                are unknown.
+            graphviz.RequiredArgumentError: If ``formats`` is empty
+                or ``formatter`` is given but ``renderer`` is None.
+            graphviz.ExecutableNotFound: If the Graphviz ``dot`` executable
+                is not found.
+            graphviz.CalledProcessError: If the returncode (exit status)
+                of the rendering ``dot`` subprocess is non-zero.
+
+        Example:
+            >>> doctest_mark_exe()
+            >>> import graphviz
+            >>> source = graphviz.Source('graph { spam }')
+            >>> outputs = source.pipe_multi(['svg', 'png'])
+            >>> outputs['svg'][:14], outputs['png'][:4]
+            (b'<?xml version=', b'\\x89PNG')
+
+        Note:
+            Runs one layout command writing all ``formats``
+            (see :func:`graphviz.backend.pipe_multi`).
+        """
+        formats = list(dict.fromkeys(formats))
+        for format_ in formats:
+            self._verify_format(format_)
+
+        (args, kwargs) = self._get_pipe_parameters(engine=engine,
+                                                   renderer=renderer,
+                                                   formatter=formatter,
+                                                   neato_no_op=neato_no_op,
+                                                   quiet=quiet,
+                                                   verify=True)
+        engine = args[0]
+
+        if (cache := caching.get_pipe_cache()) is None:
+            return self._pipe_multi(engine, formats, self.encoded_source, **kwargs)
+
+        outputs: dict[str, bytes] = {}
+
+        def pipe(format_: str) -> bytes:
+            if not outputs:  # lay out once for all formats missing in the cache
+                outputs.update(self._pipe_multi(engine, formats, self.encoded_source,
+                                                **kwargs))
+            return outputs[format_]
+
+        result = {}
+        for format_ in formats:
+            key = self._pipe_cache_key([engine, format_], kwargs)
+            output = cache.get(key, functools.partial(pipe, format_))
+            assert isinstance(output, bytes)
+            result[format_] = output
+        return result
+
+    def pipe_to(self, sink, format: str | None = None, *,
+                renderer: str | None = None,
+                formatter: str | None = None,
+                neato_no_op: bool | int | None = None,
+                quiet: bool = False,
+                engine: str | None = None,
+                chunk_size: int = backend.execute.OUTPUT_CHUNK_SIZE) -> None:
+        """Write the source piped through the Graphviz layout command to ``sink``.
+
+        Args:
+            sink: Binary file object, :class:`socket.socket`, :class:`bytearray`,
+                or callable receiving the ``bytes`` chunks of the output.
+            format: The output format used for rendering
+                (``'pdf'``, ``'png'``, etc.).
+            renderer: The output renderer used for rendering
+                (``'cairo'``, ``'gd'``, ...).
+            formatter: The output formatter used for rendering
+                (``'cairo'``, ``'gd'``, ...).
+            neato_no_op: Neato layout engine no-op flag.
+            quiet (bool): Suppress ``stderr`` output
+                from the layout subprocess.
+            engine: Layout engine for rendering
+                (``'dot'``, ``'neato'``, ...).
+            chunk_size: Maximal size of the chunks written to ``sink``.
+
+        Raises:
+            ValueError: If ``engine``, ``format``, ``renderer``, or ``formatter``
+                are unknown.
+            graphviz.RequiredArgumentError: If ``formatter`` is given
+                but ``renderer`` is None.
+            TypeError: If ``sink`` is neither callable nor writable.
+            graphviz.ExecutableNotFound: If the Graphviz ``dot`` executable
+                is not found.
+            graphviz.CalledProcessError: If the returncode (exit status)
+                of the rendering ``dot`` subprocess is non-zero.
+
+        Example:
+            >>> doctest_mark_exe()
+            >>> import io
+            >>> import graphviz
+            >>> source = graphviz.Source('graph { spam }', format='svg')
+            >>> buf = io.BytesIO()
+            >>> source.pipe_to(buf)
+            >>> buf.getvalue()[:14]
+            b'<?xml version='
+
+        Note:
+            The output is written while the layout command is running,
+            so memory use does not grow with the size of the output.
+        """
+        (args, kwargs) = self._get_pipe_parameters(engine=engine,
+                                                   format=format,
+                                                   renderer=renderer,
+                                                   formatter=formatter,
+                                                   neato_no_op=neato_no_op,
+                                                   quiet=quiet,
+                                                   verify=True)
+
+        args += [iter(self), sink]
+
+        self._pipe_lines_to(*args, input_encoding=self.encoding,
+                            chunk_size=chunk_size, **kwargs)
+
+    def pipe_iter(self, format: str | None = None, *,
+                  renderer: str | None = None,
+                  formatter: str | None = None,
+                  neato_no_op: bool | int | None = None,
+                  quiet: bool = False,
+                  engine: str | None = None,
+                  chunk_size: int = backend.execute.OUTPUT_CHUNK_SIZE,
+                  ) -> Iterator[bytes]:
+        """Return an iterator over the chunks of the source
+            piped through the Graphviz layout command.
+
+        See :meth:`.pipe_to` for the arguments and exceptions.
+
+        Returns:
+            Iterator yielding ``bytes`` chunks (of up to ``chunk_size``).
+
+        Example:
+            >>> doctest_mark_exe()
+            >>> import graphviz
+            >>> source = graphviz.Source('graph { spam }', format='svg')
+            >>> b''.join(source.pipe_iter())[:14]
+            b'<?xml version='
+
+        Note:
+            The layout command is started on the first :func:`next`
+            and killed if the iterator is closed before its end.
+            :exc:`graphviz.CalledProcessError` is raised after the last chunk.
+        """
+        (args, kwargs) = self._get_pipe_parameters(engine=engine,
+                                                   format=format,
+                                                   renderer=renderer,
+                                                   formatter=formatter,
+                                                   neato_no_op=neato_no_op,
+                                                   quiet=quiet,
+                                                   verify=True)
+
+        args.append(iter(self))
+
+        return self._pipe_lines_iter(*args, input_encoding=self.encoding,
+                                     chunk_size=chunk_size, **kwargs)
+
+    async def pipe_async(self, format: str | None = None, *,
+                         renderer: str | None = None,
+                         formatter: str | None = None,
+                         neato_no_op: bool | int | None = None,
+                         quiet: bool = False,
+                         engine: str | None = None,
+                         encoding: str | None = None) -> bytes | str:
+        """Coroutine returning the source piped through the Graphviz layout command.
+
+        See :meth:`.pipe` for the arguments, return value, and exceptions.
+
+        Example:
+            >>> doctest_mark_exe()
+            >>> import asyncio
+            >>> import graphviz
+            >>> source = graphviz.Source('graph { spam }', format='svg')
+            >>> asyncio.run(source.pipe_async())[:14]
+            b'<?xml version='
+
+        Note:
+            The source lines are written into ``stdin``
+            of the layout subprocess while the event loop reads its output.
+            Cancelling the awaiting task kills the subprocess.
+        """
+        (args, kwargs) = self._get_pipe_parameters(engine=engine,
+                                                   format=format,
+                                                   renderer=renderer,
+                                                   formatter=formatter,
+                                                   neato_no_op=neato_no_op,
+                                                   quiet=quiet,
+                                                   verify=True)
+
+        args.append(iter(self))
+
+        if encoding is not None:
+            if codecs.lookup(encoding) is codecs.lookup(self.encoding):
+                return await self._pipe_lines_string_async(*args, encoding=encoding,
+                                                           **kwargs)
+            try:
+                raw = await self._pipe_lines_async(*args, input_encoding=self.encoding,
+                                                   **kwargs)
+            except exceptions.CalledProcessError as e:
+                raise self._decoded_error(e)
+            else:
+                return raw.decode(encoding)
+        return await self._pipe_lines_async(*args, input_encoding=self.encoding,
+                                            **kwargs)
+
+    def _decoded_error(self, e: exceptions.CalledProcessError,
+                       ) -> exceptions.CalledProcessError:
+        if (output := e.output) is not None:
+            output = output.decode(self.encoding)
+        if (stderr := e.stderr) is not None:
+            stderr = stderr.decode(self.encoding)
+        return e.__class__(e.returncode, e.cmd, output=output, stderr=stderr)
+
+
+def pipe_many(graphs: Iterable[Pipe], format: str | None = None, *,
+              renderer: str | None = None,
+              formatter: str | None = None,
+              neato_no_op: bool | int | None = None,
+              quiet: bool = False,
+              engine: str | None = None,
+              encoding: str | None = None) -> list[bytes] | list[str]:
+    """Return the sources of ``graphs`` piped through one layout command per parameters.
+
+    Args:
+        graphs: :class:`.Graph`, :class:`.Digraph`, or :class:`.Source` objects
+            (one graph each).
+        format: The output format used for rendering
+            (default: ``format`` of each graph).
+        renderer: The output renderer used for rendering
+            (default: ``renderer`` of each graph).
+        formatter: The output formatter used for rendering
+            (default: ``formatter`` of each graph).
+        neato_no_op: Neato layout engine no-op flag.
+        quiet (bool): Suppress ``stderr`` output
+            from the layout subprocesses.
+        engine: Layout engine for rendering
+            (default: ``engine`` of each graph).
+        encoding: Encoding for decoding the outputs.
+
+    Returns:
+        List with the bytes or if encoding is given decoded string
+            for each of the ``graphs`` (in the same order).
+
+    Raises:
+        ValueError: If ``engine``, ``format``, ``renderer``, or ``formatter``
+            are unknown.
+        graphviz.RequiredArgumentError: If ``formatter`` is given
+            but ``renderer`` is None.
+        graphviz.ExecutableNotFound: If the Graphviz ``dot`` executable
+            is not found.
+        graphviz.BatchError: If the returncode (exit status)
+            of a rendering ``dot`` subprocess is non-zero
+            (with the position of the first failing graph as ``index``
+            and the outputs of all other graphs as ``results``).
+
+    Example:
+        >>> doctest_mark_exe()
+        >>> import graphviz
+        >>> graphs = [graphviz.Graph(), graphviz.Source('graph { spam }')]
+        >>> [out[:5] for out in graphviz.pipe_many(graphs, format='svg')]
+        [b'<?xml', b'<?xml']
+
+    Note:
+        Graphs with the same ``engine``, ``format``, ``renderer``, and ``formatter``
+        are streamed into the ``stdin`` of the same layout process,
+        avoiding its startup cost for each graph
+        (see :func:`graphviz.backend.pipe_batch`).
+    """
+    graphs = list(graphs)
+    batches: dict[tuple, tuple[list, dict, list[int]]] = {}
+    for index, graph in enumerate(graphs):
+        (args, kwargs) = graph._get_pipe_parameters(engine=engine,
+                                                    format=format,
+                                                    renderer=renderer,
+                                                    formatter=formatter,
+                                                    neato_no_op=neato_no_op,
+                                                    quiet=quiet,
+                                                    verify=True)
+        key = (*args, *kwargs.values())
+        batches.setdefault(key, (args, kwargs, []))[2].append(index)
+
+    results: list = [None] * len(graphs)
+    error: exceptions.BatchError | None = None
+    for (engine_, format_), kwargs, indexes in batches.values():
+        inputs = [graphs[i].encoded_source for i in indexes]
+        log.debug('pipe %d graphs in one batch', len(inputs))
+        try:
+            outputs = backend.pipe_batch(engine_, format_, inputs, **kwargs)
+        except exceptions.BatchError as e:
+            outputs = e.results
+            e.index = indexes[e.index] if e.index is not None else None
+            if (error is None or error.index is None
+                or (e.index is not None and e.index < error.index)):  # noqa: E129
+                error = e
+        for i, output in zip(indexes, outputs):
+            results[i] = output
+
+    if error is not None:
+        error.results = results
+        raise error
+
+    if encoding is not None:
+        return [r.decode(encoding) for r in results]
+    return results
+
+
+def pipe_parallel(graphs: Iterable[Pipe], max_workers: int | None = None, *,
+                  ordered: bool = True,
+                  **kwargs) -> Iterator[tuple[int, bytes | str | Exception]]:
+    """Pipe ``graphs`` with up to ``max_workers`` concurrent layout subprocesses.
+
+    Args:
+        graphs: :class:`.Graph`, :class:`.Digraph`, or :class:`.Source` objects.
+        max_workers: Maximal number of concurrent layout subprocesses
+            (default: :func:`os.cpu_count`).
+        ordered: Yield the results in the order of ``graphs``
+            (``False``: as they complete).
+        kwargs: Arguments for :meth:`.Graph.pipe` of each graph
+            (``format``, ``engine``, ``encoding``, ``quiet``, ...).
+
+    Yields:
+        ``(index, result)`` pairs with the position in ``graphs``
+        and the output of the layout command
+        or the exception raised when piping the graph
+        (e.g. :exc:`graphviz.CalledProcessError`).
+
+    Example:
+        >>> doctest_mark_exe()
+        >>> import graphviz
+        >>> graphs = [graphviz.Graph(), graphviz.Source('graph { spam }')]
+        >>> [(i, out[:5]) for i, out in graphviz.pipe_parallel(graphs, format='svg')]
+        [(0, b'<?xml'), (1, b'<?xml')]
+
+    Note:
+        An exception raised for one graph does not stop piping the others.
+    """
+    return _tools.map_parallel(lambda graph: graph.pipe(**kwargs), graphs,
+                               max_workers=max_workers, ordered=ordered)
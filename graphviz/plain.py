@@ -0,0 +1,253 @@
+"""Parse ``plain`` and ``plain-ext`` layout output into records while streaming."""
+
+from collections.abc import Iterable, Iterator
+import codecs
+import re
+
+from . import encoding as _encoding
+from . import quoting
+from . import topology
+
+__all__ = ['PLAIN_FORMATS',
+           'PlainGraph', 'PlainNode', 'PlainEdge', 'PlainStop',
+           'iterparse']
+
+PLAIN_FORMATS = frozenset({'plain', 'plain-ext'})
+
+QUOTED = re.compile(r'"(?:[^"\\]|\\.)*"')
+
+TOKEN = re.compile(r'(?:"(?:[^"\\]|\\.)*"|[^\s"])+|"')
+
+
+class PlainRecord:
+    """Statement of ``plain`` layout output."""
+
+    __slots__: tuple[str, ...] = ()
+
+    def __repr__(self) -> str:
+        args = [f'{name}={getattr(self, name)!r}' for name in self.__slots__]
+        return f'{self.__class__.__name__}({", ".join(args)})'
+
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, n) == getattr(other, n) for n in self.__slots__)
+
+
+class PlainGraph(PlainRecord):
+    """``graph`` statement with the size of the graph (inches)."""
+
+    __slots__ = ('scale', 'width', 'height')
+
+    def __init__(self, scale: float, width: float, height: float) -> None:
+        self.scale = scale
+        self.width = width
+        self.height = height
+
+
+class PlainNode(PlainRecord):
+    """``node`` statement with center and size of the node (inches)."""
+
+    __slots__ = ('name', 'x', 'y', 'width', 'height',
+                 'label', 'style', 'shape', 'color', 'fillcolor')
+
+    def __init__(self, name: str, x: float, y: float, width: float, height: float,
+                 label: str, style: str, shape: str, color: str, fillcolor: str) -> None:
+        self.name = name
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.label = label
+        self.style = style
+        self.shape = shape
+        self.color = color
+        self.fillcolor = fillcolor
+
+
+class PlainEdge(PlainRecord):
+    """``edge`` statement with the spline control points (inches)."""
+
+    __slots__ = ('tail', 'head', 'points', 'label', 'label_x', 'label_y',
+                 'style', 'color', 'tailport', 'headport')
+
+    def __init__(self, tail: str, head: str, points: tuple[tuple[float, float], ...],
+                 style: str, color: str, *,
+                 label: str | None = None,
+                 label_x: float | None = None, label_y: float | None = None,
+                 tailport: str | None = None, headport: str | None = None) -> None:
+        self.tail = tail
+        self.head = head
+        self.points = points
+        self.label = label
+        self.label_x = label_x
+        self.label_y = label_y
+        self.style = style
+        self.color = color
+        self.tailport = tailport
+        self.headport = headport
+
+
+class PlainStop(PlainRecord):
+    """``stop`` statement ending the output of a graph."""
+
+    __slots__ = ()
+
+
+def iterparse(data: bytes | str | Iterable[bytes], *,
+              encoding: str = _encoding.DEFAULT_ENCODING
+              ) -> Iterator[PlainGraph | PlainNode | PlainEdge | PlainStop]:
+    r"""Yield the records of ``plain`` (or ``plain-ext``) layout output.
+
+    Args:
+        data: Layout output or iterable of its ``bytes`` chunks
+            (e.g. from :meth:`.Graph.pipe_iter`), parsed line by line.
+        encoding: Encoding for decoding ``bytes``.
+
+    Returns:
+        Iterator over the records of each line.
+
+    Raises:
+        ValueError: If ``data`` contains an invalid line.
+
+    Example:
+        >>> import graphviz  # doctest: +NO_EXE
+        >>> for record in graphviz.plain.iterparse(
+        ...         b'graph 1 0.75 1.5\n'
+        ...         b'node spam 0.375 1.25 0.75 0.5 spam solid ellipse black lightgrey\n'
+        ...         b'edge spam:s eggs 4 0.375 0.99 0.375 0.88 0.375 0.76 0.375 0.65'
+        ...         b' solid black\n'
+        ...         b'stop\n'):
+        ...     print(record)  # doctest: +NORMALIZE_WHITESPACE
+        PlainGraph(scale=1.0, width=0.75, height=1.5)
+        PlainNode(name='spam', x=0.375, y=1.25, width=0.75, height=0.5,
+                  label='spam', style='solid', shape='ellipse',
+                  color='black', fillcolor='lightgrey')
+        PlainEdge(tail='spam', head='eggs',
+                  points=((0.375, 0.99), (0.375, 0.88), (0.375, 0.76), (0.375, 0.65)),
+                  label=None, label_x=None, label_y=None,
+                  style='solid', color='black', tailport='s', headport=None)
+        PlainStop()
+
+    Note:
+        The chunks are only read as far as the records are consumed
+        (closing the iterator closes ``data`` if it is a generator).
+    """
+    chunks: Iterator[bytes | str] = iter([data]) if isinstance(data, (bytes, str)) else iter(data)
+    try:
+        for lineno, line in enumerate(iterlines(chunks, encoding=encoding), start=1):
+            if (tokens := split_line(line)):
+                try:
+                    yield parse_tokens(tokens)
+                except (IndexError, ValueError) as e:
+                    raise ValueError(f'invalid plain layout output line {lineno}'
+                                     f' ({e}): {line!r}') from e
+    finally:
+        if (close := getattr(chunks, 'close', None)) is not None:
+            close()
+
+
+def split_line(line: str) -> list[str]:
+    r"""Return the tokens of a ``plain`` output line
+        (keeping ``<...>`` HTML labels with spaces together).
+
+    >>> split_line('node a 1 2 3 4 <<b>x y</b>> solid ellipse black lightgrey\n')
+    ... # doctest: +NO_EXE
+    ['node', 'a', '1', '2', '3', '4', '<<b>x y</b>>', 'solid', 'ellipse', 'black', 'lightgrey']
+    """
+    spans = []
+    pos = 0
+    while (match := TOKEN.search(line, pos)) is not None:
+        (start, end) = match.span()
+        if line.startswith('<', start):
+            if (html_end := topology.html_end(line, start + 1)) is not None:
+                end = max(end, html_end)
+        spans.append((start, end))
+        pos = end
+
+    # the label is followed by a fixed number of fields, merge what is between
+    if spans and line[slice(*spans[0])] == 'node':
+        label = 6
+    elif spans and line[slice(*spans[0])] == 'edge' and len(spans) > 3:
+        try:
+            label = 4 + 2 * int(line[slice(*spans[3])])
+        except ValueError:
+            label = len(spans)
+    else:
+        label = len(spans)
+    if len(spans) > label + 5 and line.startswith('<', spans[label][0]):
+        spans[label:-4] = [(spans[label][0], spans[-5][1])]
+
+    return [line[start:end] for start, end in spans]
+
+
+def parse_tokens(tokens: list[str]) -> PlainGraph | PlainNode | PlainEdge | PlainStop:
+    """Return the record of the ``tokens`` of a ``plain`` output line."""
+    (kind, *fields) = tokens
+    if kind == 'node':
+        if len(fields) != 10:
+            raise ValueError(f'node with {len(fields)} fields (expected 10)')
+        (name, x, y, width, height, label, *rest) = fields
+        (style, shape, color, fillcolor) = rest
+        return PlainNode(quoting.unquote(name), float(x), float(y),
+                         float(width), float(height), quoting.unquote(label),
+                         style, shape, color, fillcolor)
+    elif kind == 'edge':
+        ((tail, tailport), (head, headport)) = map(split_port, fields[:2])
+        n = int(fields[2])
+        coords = list(map(float, fields[3:3 + 2 * n]))
+        rest = fields[3 + 2 * n:]
+        if len(coords) != 2 * n or len(rest) not in (2, 5):
+            raise ValueError(f'edge with {n} points and {len(fields)} fields'
+                             f' (expected {5 + 2 * n} or {8 + 2 * n})')
+        (style, color) = rest[-2:]
+        if len(rest) == 2:
+            (label, label_x, label_y) = (None, None, None)
+        else:
+            (label, label_x, label_y) = (quoting.unquote(rest[0]),
+                                         float(rest[1]), float(rest[2]))
+        return PlainEdge(tail, head, tuple(zip(coords[::2], coords[1::2])),
+                         style, color, label=label, label_x=label_x, label_y=label_y,
+                         tailport=tailport, headport=headport)
+    elif kind == 'graph':
+        if len(fields) != 3:
+            raise ValueError(f'graph with {len(fields)} fields (expected 3)')
+        return PlainGraph(*map(float, fields))
+    elif kind == 'stop':
+        if fields:
+            raise ValueError(f'stop with {len(fields)} fields (expected 0)')
+        return PlainStop()
+    raise ValueError(f'unknown statement: {kind!r}')
+
+
+def split_port(field: str) -> tuple[str, str | None]:
+    """Return the node name and port of a ``plain-ext`` edge endpoint.
+
+    >>> split_port('"spam:eggs":ham')  # doctest: +NO_EXE
+    ('spam:eggs', 'ham')
+    """
+    if (match := QUOTED.match(field)) is not None:
+        (name, rest) = (quoting.unquote(match.group()), field[match.end():])
+    else:
+        (name, sep, rest) = field.partition(':')
+        rest = sep + rest
+    return name, (quoting.unquote(rest[1:]) if rest.startswith(':') else None)
+
+
+def iterlines(chunks: Iterator[bytes | str], *, encoding: str) -> Iterator[str]:
+    r"""Yield the decoded lines of ``chunks`` (with final newline).
+
+    >>> list(iterlines(iter([b'spam\neg', b'gs\n', b'ham']), encoding='ascii'))
+    ... # doctest: +NO_EXE
+    ['spam\n', 'eggs\n', 'ham']
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    rest = ''
+    for chunk in chunks:
+        text = rest + (chunk if isinstance(chunk, str) else decoder.decode(chunk))
+        (*lines, rest) = text.split('\n')
+        for line in lines:
+            yield line + '\n'
+    rest += decoder.decode(b'', final=True)
+    if rest:
+        yield rest
@@ -9,7 +9,8 @@ import warnings
 from . import _tools
 from . import exceptions
 
-__all__ = ['quote', 'quote_edge',
+__all__ = ['quote', 'quote_edge', 'unquote',
+           'quote_cache_info', 'set_quote_cache_size',
            'a_list', 'attr_list',
            'escape', 'nohtml']
 
@@ -38,13 +39,102 @@ ESCAPE_UNESCAPED_QUOTES: Final = functools.partial(QUOTE_WITH_OPTIONAL_BACKSLASH
                                                    r'\g<literal_quote>')
 
 
+DEFAULT_QUOTE_CACHE_SIZE: Final = 2 ** 16
+
+
+def _quote(identifier: str,
+           is_html_string=HTML_STRING.match,
+           is_valid_id=ID.match,
+           dot_keywords=KEYWORDS,
+           endswith_odd_number_of_backslashes=FINAL_ODD_BACKSLASHES.search,
+           escape_unescaped_quotes=ESCAPE_UNESCAPED_QUOTES) -> tuple[str, bool]:
+    """Return ``(quoted, warn)`` with ``warn`` set for expected syntax errors."""
+    if is_html_string(identifier) and not isinstance(identifier, NoHtml):
+        pass
+    elif not is_valid_id(identifier) or identifier.lower() in dot_keywords:
+        warn = endswith_odd_number_of_backslashes(identifier) is not None
+        return f'"{escape_unescaped_quotes(identifier)}"', warn
+    return identifier, False
+
+
+def _quote_edge(identifier: str) -> tuple[str, tuple[str, ...]]:
+    """Return ``(quoted, warn_identifiers)`` for ``node[:port[:compass]]``."""
+    (node, _, rest) = identifier.partition(':')
+    (quoted, warn) = _quote(node)
+    parts = [quoted]
+    warn_identifiers: tuple[str, ...] = (node,) if warn else ()
+    if rest:
+        (port, _, compass) = rest.partition(':')
+        (quoted, warn) = _quote(port)
+        parts.append(quoted)
+        if warn:
+            warn_identifiers += (port,)
+        if compass:
+            parts.append(compass)
+    return ':'.join(parts), warn_identifiers
+
+
+def _make_caches(maxsize: int | None):
+    """Return memo caches in front of ``_quote()`` and ``_quote_edge()``."""
+    # typed=True: keep nohtml('<...>') apart from the equal plain str
+    return (functools.lru_cache(maxsize=maxsize, typed=True)(_quote),
+            functools.lru_cache(maxsize=maxsize, typed=True)(_quote_edge))
+
+
+(_cached_quote, _cached_quote_edge) = _make_caches(DEFAULT_QUOTE_CACHE_SIZE)
+
+
+def set_quote_cache_size(maxsize: int | None) -> int | None:
+    """Change the size of the :func:`quote` and :func:`quote_edge` memo caches.
+
+    Args:
+        maxsize: Maximal number of cached identifiers per function
+            (``0`` disables caching, ``None`` means unbounded).
+
+    Returns:
+        The old cache size.
+
+    Note:
+        Discards the current cache contents and resets the counters.
+    """
+    if maxsize is not None and maxsize < 0:
+        raise ValueError(f'maxsize must be None or >= 0: {maxsize!r}')
+
+    global _cached_quote, _cached_quote_edge
+
+    old_maxsize = _cached_quote.cache_info().maxsize
+    (_cached_quote, _cached_quote_edge) = _make_caches(maxsize)
+    return old_maxsize
+
+
+def quote_cache_info() -> dict[str, functools._CacheInfo]:
+    """Return the hit/miss counters of the :func:`quote` and :func:`quote_edge` memo caches.
+
+    >>> set_quote_cache_size(DEFAULT_QUOTE_CACHE_SIZE)  # doctest: +NO_EXE
+    65536
+
+    >>> quote('spam eggs'), quote('spam eggs')
+    ('"spam eggs"', '"spam eggs"')
+
+    >>> quote_cache_info()['quote']
+    CacheInfo(hits=1, misses=1, maxsize=65536, currsize=1)
+
+    Note:
+        Plain ASCII identifiers (e.g. ``'spam'``) bypass the cache.
+    """
+    return {'quote': _cached_quote.cache_info(),
+            'quote_edge': _cached_quote_edge.cache_info()}
+
+
+def _warn_syntax(identifier: str) -> None:
+    warnings.warn('expect syntax error scanning invalid quoted string:'
+                  f' {identifier!r}',
+                  category=exceptions.DotSyntaxWarning)
+
+
 @_tools.deprecate_positional_args(supported_number=1)
 def quote(identifier: str,
-          is_html_string=HTML_STRING.match,
-          is_valid_id=ID.match,
-          dot_keywords=KEYWORDS,
-          endswith_odd_number_of_backslashes=FINAL_ODD_BACKSLASHES.search,
-          escape_unescaped_quotes=ESCAPE_UNESCAPED_QUOTES) -> str:
+          dot_keywords=KEYWORDS) -> str:
     r"""Return DOT identifier from string, quote if needed.
 
     >>> quote('')  # doctest: +NO_EXE
@@ -80,15 +170,15 @@ def quote(identifier: str,
     >>> print(quote('\\\\\\"'))
     "\\\""
     """
-    if is_html_string(identifier) and not isinstance(identifier, NoHtml):
-        pass
-    elif not is_valid_id(identifier) or identifier.lower() in dot_keywords:
-        if endswith_odd_number_of_backslashes(identifier):
-            warnings.warn('expect syntax error scanning invalid quoted string:'
-                          f' {identifier!r}',
-                          category=exceptions.DotSyntaxWarning)
-        return f'"{escape_unescaped_quotes(identifier)}"'
-    return identifier
+    # fast path: plain ASCII identifier (without regex matching or caching)
+    if (identifier.isascii() and identifier.isidentifier()
+        and identifier.lower() not in dot_keywords):  # noqa: E129
+        return identifier
+
+    (quoted, warn) = _cached_quote(identifier)
+    if warn:
+        _warn_syntax(identifier)
+    return quoted
 
 
 def quote_edge(identifier: str) -> str:
@@ -103,14 +193,27 @@ def quote_edge(identifier: str) -> str:
     >>> quote_edge('spam:eggs:s')
     'spam:eggs:s'
     """
-    (node, _, rest) = identifier.partition(':')
-    parts = [quote(node)]
-    if rest:
-        (port, _, compass) = rest.partition(':')
-        parts.append(quote(port))
-        if compass:
-            parts.append(compass)
-    return ':'.join(parts)
+    if ':' not in identifier:
+        return quote(identifier)
+
+    (quoted, warn_identifiers) = _cached_quote_edge(identifier)
+    for warn_identifier in warn_identifiers:
+        _warn_syntax(warn_identifier)
+    return quoted
+
+
+def unquote(identifier: str) -> str:
+    r"""Return ``identifier`` without DOT double quotes.
+
+    >>> unquote('"spam \\"eggs\\""')  # doctest: +NO_EXE
+    'spam "eggs"'
+
+    >>> unquote('spam')
+    'spam'
+    """
+    if len(identifier) > 1 and identifier.startswith('"') and identifier.endswith('"'):
+        return identifier[1:-1].replace('\\"', '"')
+    return identifier
 
 
 @_tools.deprecate_positional_args(supported_number=1)
@@ -0,0 +1,599 @@
+"""Store DOT statements as records, format them into lines on iteration."""
+
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence, Set
+import itertools
+import operator
+from typing import Any, Final
+import weakref
+
+__all__ = ['STORAGES', 'verify_storage', 'get_storage',
+           'Record', 'NodeRecord', 'EdgeRecord', 'AttrRecord',
+           'TrackedList', 'CopyOnWriteList', 'LineList', 'RecordList']
+
+STORAGES: Final[Set[str]] = {'lines', 'records', 'compact'}
+
+DEFAULT_STORAGE: Final = 'lines'
+
+
+def verify_storage(storage: str) -> None:
+    if storage not in STORAGES:
+        raise ValueError(f'unknown storage: {storage!r}'
+                         f' (must be one of {sorted(STORAGES)})')
+
+
+def get_storage(body: list) -> str:
+    """Return the storage name for the given ``body``."""
+    return body._storage if isinstance(body, LineList) else DEFAULT_STORAGE
+
+
+def copy_lines(lines: Iterable) -> 'TrackedList':
+    """Return a :class:`.TrackedList` of ``lines`` (sharing the items of a tracked one)."""
+    if type(lines) in (TrackedList, CopyOnWriteList):
+        return lines.copy()  # type: ignore[attr-defined]
+    return TrackedList(lines)
+
+
+class Record:
+    """DOT statement with attributes (formatted into a line on iteration)."""
+
+    __slots__ = ('label', 'attrs', 'attributes', '_removed', '_owner')
+
+    def __init__(self, *, label: str | None = None,
+                 attrs: Mapping[str, str] | None = None,
+                 attributes: (Mapping[str, str]
+                              | Sequence[tuple[str, str]]
+                              | None) = None) -> None:
+        self.label = label
+        """Caption to be displayed (``None`` for no ``label`` attribute)."""
+
+        self.attrs: dict[str, str] = dict(attrs) if attrs is not None else {}
+        """Attribute-value pairs of the statement (``None`` values are omitted)."""
+
+        self.attributes = attributes
+        """Additional attribute-value pairs (``_attributes`` argument)."""
+
+        self._removed = False
+        self._owner: tuple[weakref.ref, int] | None = None
+
+    @property
+    def removed(self) -> bool:
+        """The statement is omitted from the source
+            (set by :meth:`.RecordList.remove_node` and :meth:`.RecordList.remove_edges`)."""
+        return self._removed
+
+    @removed.setter
+    def removed(self, removed: bool) -> None:
+        removed = bool(removed)
+        if removed != self._removed and self._owner is not None:
+            (ref, generation) = self._owner
+            if (owner := ref()) is not None and owner._generation == generation:
+                owner._removed += 1 if removed else -1
+        self._removed = removed
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in self._fields() + ['removed']}
+
+    def __setstate__(self, state: Mapping[str, Any]) -> None:
+        self._removed = False
+        self._owner = None
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def __repr__(self) -> str:
+        args = [f'{name}={getattr(self, name)!r}' for name in self._fields()]
+        return f'{self.__class__.__name__}({", ".join(args)})'
+
+    def _fields(self) -> list[str]:
+        return [*self.__slots__, 'label', 'attrs', 'attributes']
+
+    def copy(self):
+        """Return an independent copy of the record."""
+        result = self.__class__.__new__(self.__class__)
+        result.__setstate__(self.__getstate__())
+        result.attrs = dict(self.attrs)
+        return result
+
+    def format(self, syntax) -> str:  # pragma: no cover
+        """Return the DOT source line using ``syntax`` for quoting and formatting."""
+        raise NotImplementedError('must be implemented by concrete subclasses')
+
+
+class NodeRecord(Record):
+    """DOT node statement record."""
+
+    __slots__ = ('name',)
+
+    def __init__(self, name: str, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.name = name
+
+    def format(self, syntax) -> str:
+        attr_list = syntax._attr_list(self.label, kwargs=self.attrs,
+                                      attributes=self.attributes)
+        return syntax._node(syntax._quote(self.name), attr_list)
+
+
+class EdgeRecord(Record):
+    """DOT edge statement record."""
+
+    __slots__ = ('tail_name', 'head_name')
+
+    def __init__(self, tail_name: str, head_name: str, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.tail_name = tail_name
+        self.head_name = head_name
+
+    def format(self, syntax) -> str:
+        attr_list = syntax._attr_list(self.label, kwargs=self.attrs,
+                                      attributes=self.attributes)
+        return syntax._edge(tail=syntax._quote_edge(self.tail_name),
+                            head=syntax._quote_edge(self.head_name),
+                            attr=attr_list)
+
+
+class AttrRecord(Record):
+    """DOT general or graph/node/edge attribute statement record."""
+
+    __slots__ = ('kw',)
+
+    def __init__(self, kw: str | None, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.kw = kw
+
+    def format(self, syntax) -> str:
+        if self.kw is None:
+            a_list = syntax._a_list(None, kwargs=self.attrs,
+                                    attributes=self.attributes)
+            return syntax._attr_plain(a_list)
+        attr_list = syntax._attr_list(None, kwargs=self.attrs,
+                                      attributes=self.attributes)
+        return syntax._attr(self.kw, attr_list)
+
+
+def iter_records(cls: type[NodeRecord] | type[EdgeRecord],
+                 columns: Sequence[Iterable], *,
+                 attr_columns: Mapping[str, Any]) -> Iterator[Record]:
+    """Yield records from parallel ``columns`` and ``attr_columns``."""
+    constant = {k: v if isinstance(v, str) else str(v) for k, v in attr_columns.items()
+                if isinstance(v, str) or (v is not None and not isinstance(v, Iterable))}
+    keys = [k for k, v in attr_columns.items() if v is not None and k not in constant]
+    label = constant.pop('label', None)
+    varying = [attr_columns[k] for k in keys]
+
+    n_columns = len(columns)
+    for row in zip(*columns, *varying, strict=True):
+        args = [v if isinstance(v, str) else str(v) for v in row[:n_columns]]
+        attrs = dict(constant)
+        attrs.update((k, v if isinstance(v, str) else str(v))
+                     for k, v in zip(keys, row[n_columns:]) if v is not None)
+        yield cls(*args, label=attrs.pop('label', label), attrs=attrs)
+
+
+class TrackedList(list):
+    """List of verbatim DOT source lines counting its changes other than appending."""
+
+    _changes = 0
+
+    _cacheable = True
+
+    _dependents: weakref.WeakValueDictionary | None = None
+
+    # appending (including ``+=`` and ``*=`` with positive number) keeps the preceding items
+
+    def _iterfrom(self, start: int) -> Iterator:
+        """Yield the lines and other items from line index ``start`` on."""
+        return iter(list.__getitem__(self, slice(start, None)))
+
+    def _changing(self) -> None:
+        """Unshare the items of copies and count a change other than appending."""
+        if self._dependents:
+            for dependent in list(self._dependents.values()):
+                dependent._unshare()
+        self._changes += 1
+
+    def copy(self) -> 'TrackedList':
+        """Return a copy sharing the items until either list is changed (``O(1)``)."""
+        return CopyOnWriteList(self)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state.pop('_dependents', None)
+        return state
+
+    def __setitem__(self, index, value) -> None:
+        self._changing()
+        super().__setitem__(index, value)
+
+    def __delitem__(self, index) -> None:
+        self._changing()
+        super().__delitem__(index)
+
+    def __imul__(self, value):  # type: ignore[misc]
+        if operator.index(value) < 1:
+            self._changing()
+        return super().__imul__(value)
+
+    def insert(self, index, value) -> None:
+        self._changing()
+        super().insert(index, value)
+
+    def pop(self, index=-1):
+        self._changing()
+        return super().pop(index)
+
+    def remove(self, value) -> None:
+        self._changing()
+        super().remove(value)
+
+    def clear(self) -> None:
+        self._changing()
+        super().clear()
+
+    def sort(self, *args, **kwargs) -> None:
+        self._changing()
+        super().sort(*args, **kwargs)
+
+    def reverse(self) -> None:
+        self._changing()
+        super().reverse()
+
+
+def _compare(op: Callable[[list, list], bool]):
+    def compare(self, other) -> bool:
+        if not isinstance(other, list):
+            return NotImplemented
+        return op(list(self), list(other))
+
+    return compare
+
+
+class CopyOnWriteList(TrackedList):
+    """Copy of a :class:`.TrackedList` sharing its items until either one is changed.
+
+    Appended items are stored after the shared ones (``O(1)``).
+    Other changes of either list first copy the shared items (``O(n)``),
+    turning the copy into a plain :class:`.TrackedList`.
+    """
+
+    def __init__(self, base: TrackedList, length: int | None = None) -> None:
+        super().__init__()
+        self._base = base
+        self._base_length = len(base) if length is None else length
+        if base._dependents is None:
+            base._dependents = weakref.WeakValueDictionary()
+        base._dependents[id(self)] = self
+
+    def _unshare(self) -> None:
+        """Copy the shared items, turn into a plain :class:`.TrackedList`."""
+        base = self._base
+        list.__setitem__(self, slice(0, 0),
+                         list(itertools.islice(base, self._base_length)))
+        if base._dependents is not None:
+            base._dependents.pop(id(self), None)
+        del self._base, self._base_length
+        self.__class__ = TrackedList  # type: ignore[assignment]
+
+    def _changing(self) -> None:
+        self._unshare()
+        TrackedList._changing(self)
+
+    def _iterfrom(self, start: int) -> Iterator:
+        if start < self._base_length:
+            return itertools.islice(iter(self), start, None)
+        return iter(list.__getitem__(self, slice(start - self._base_length, None)))
+
+    def copy(self) -> 'TrackedList':
+        if not list.__len__(self):
+            return self.__class__(self._base, self._base_length)
+        return self.__class__(self)
+
+    def __reduce__(self):
+        return TrackedList, (list(self),)
+
+    def __iter__(self) -> Iterator:
+        return itertools.chain(itertools.islice(self._base, self._base_length),
+                               list.__iter__(self))
+
+    def __reversed__(self) -> Iterator:
+        return reversed(list(self))
+
+    def __len__(self) -> int:
+        return self._base_length + list.__len__(self)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        index = operator.index(index)
+        if index < 0:
+            index += len(self)
+        if 0 <= index < self._base_length:
+            return self._base[index]
+        if index < 0:
+            raise IndexError('list index out of range')
+        return list.__getitem__(self, index - self._base_length)
+
+    def __contains__(self, value) -> bool:
+        return value in iter(self)
+
+    def index(self, *args):
+        return list(self).index(*args)
+
+    def count(self, value) -> int:
+        return list(self).count(value)
+
+    def __imul__(self, value):
+        self._unshare()
+        return TrackedList.__imul__(self, value)
+
+    def __add__(self, other):
+        return list(self) + other
+
+    def __radd__(self, other):
+        return other + list(self)
+
+    def __mul__(self, value):
+        return list(self) * value
+
+    __rmul__ = __mul__
+
+    __eq__ = _compare(operator.eq)
+
+    __ne__ = _compare(operator.ne)
+
+    __lt__ = _compare(operator.lt)
+
+    __le__ = _compare(operator.le)
+
+    __gt__ = _compare(operator.gt)
+
+    __ge__ = _compare(operator.ge)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class LineList(TrackedList):
+    """List of DOT source lines with items formatted into lines on access."""
+
+    _storage: str
+
+    def __init__(self, iterable: Iterable = (), /, *, syntax) -> None:
+        if type(iterable) is type(self):
+            iterable = iterable._iteritems()
+        super().__init__(iterable)
+        self._syntax = syntax
+
+    def _iteritems(self) -> Iterator:
+        """Yield the verbatim lines and other items without formatting."""
+        return super().__iter__()
+
+    def __iter__(self) -> Iterator[str]:  # pragma: no cover
+        raise NotImplementedError('must be implemented by concrete subclasses')
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, list):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __ne__(self, other) -> bool:
+        if not isinstance(other, list):
+            return NotImplemented
+        return list(self) != list(other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __add__(self, other):
+        return list(self) + other
+
+    def __radd__(self, other):
+        return other + list(self)
+
+    def __mul__(self, value):
+        return list(self) * value
+
+    __rmul__ = __mul__
+
+    def __reduce__(self):
+        return _rebuild_list, (self.__class__, list(self._iteritems()), self._syntax)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+def _rebuild_list(cls: type[LineList], items: list, syntax) -> LineList:
+    """Return the unpickled :class:`.LineList` of ``cls`` with the ``items``."""
+    return cls(items, syntax=syntax)
+
+
+class RecordList(LineList):
+    """List of verbatim DOT source lines and statement records.
+
+    Behaves like a list of DOT source lines: iteration, indexing, lookup,
+    and comparison format the records into lines.
+    Appending records and looking them up by node name or edge
+    are ``O(1)``, as are changes to the attributes of found records.
+    Removed records are left out of the list (dropped on the next change
+    or indexing other than appending).
+
+    Example:
+        >>> import graphviz  # doctest: +NO_EXE
+        >>> dot = graphviz.Digraph(storage='records')
+        >>> dot.node('A', 'King Arthur')
+        >>> dot.edge('A', 'B')
+
+        >>> dot.body.node_records('A')
+        [NodeRecord(name='A', label='King Arthur', attrs={}, attributes=None)]
+
+        >>> dot.body.node_records('A')[0].attrs['color'] = 'red'
+        >>> dot.body.remove_edges('A', 'B')
+
+        >>> dot.body
+        ['\\tA [label="King Arthur" color=red]\\n']
+    """
+
+    _storage = 'records'
+
+    _cacheable = False  # records can be changed in place
+
+    def __init__(self, iterable: Iterable = (), /, *, syntax) -> None:
+        super().__init__(iterable, syntax=syntax)
+        self._reset_index()
+
+    _generation = 0
+
+    def _reset_index(self) -> None:
+        self._nodes: dict[str, list[NodeRecord]] = {}
+        self._edges: dict[tuple[str, str], list[EdgeRecord]] = {}
+        self._indexed = 0
+        self._removed = 0
+        self._generation += 1  # ignore changes of records indexed before
+
+    def _update_index(self) -> None:
+        """Index records appended since the last update (counting removed ones)."""
+        owner = (weakref.ref(self), self._generation)
+        for item in list.__getitem__(self, slice(self._indexed, None)):
+            if isinstance(item, NodeRecord):
+                self._nodes.setdefault(item.name, []).append(item)
+            elif isinstance(item, EdgeRecord):
+                key = (item.tail_name, item.head_name)
+                self._edges.setdefault(key, []).append(item)
+            if isinstance(item, Record):
+                item._owner = owner  # count changes of removed
+                if item.removed:
+                    self._removed += 1
+        self._indexed = list.__len__(self)
+
+    def _drop_removed(self) -> None:
+        """Drop removed records so that item indexes are line indexes."""
+        self._update_index()
+        if self._removed:
+            list.__setitem__(self, slice(None), list(self._iteritems(removed=False)))
+            self._reset_index()
+
+    def _iteritems(self, *, removed: bool = True) -> Iterator:
+        """Yield the verbatim lines and records without formatting
+            (including removed records if ``removed``)."""
+        items = super()._iteritems()
+        if removed:
+            return items
+        return (i for i in items if not isinstance(i, Record) or not i.removed)
+
+    def _format(self, item):
+        return item.format(self._syntax) if isinstance(item, Record) else item
+
+    def __iter__(self) -> Iterator[str]:
+        format_ = self._format
+        for item in self._iteritems(removed=False):
+            yield format_(item)
+
+    def __reversed__(self) -> Iterator[str]:
+        return reversed(list(self))
+
+    def __len__(self) -> int:
+        self._update_index()
+        return list.__len__(self) - self._removed
+
+    def __getitem__(self, index):
+        self._drop_removed()
+        item = super().__getitem__(index)
+        if isinstance(index, slice):
+            return [self._format(i) for i in item]
+        return self._format(item)
+
+    def __contains__(self, value) -> bool:
+        return value in iter(self)
+
+    def index(self, *args) -> int:
+        self._drop_removed()
+        return list(self).index(*args)
+
+    def count(self, value) -> int:
+        return list(self).count(value)
+
+    def copy(self) -> 'RecordList':
+        """Return a copy with independent copies of the records."""
+        items = (i.copy() if isinstance(i, Record) else i
+                 for i in self._iteritems(removed=False))
+        return self.__class__(items, syntax=self._syntax)
+
+    def node_records(self, name: str) -> list[NodeRecord]:
+        """Return the records of the node statements for ``name``."""
+        self._update_index()
+        return [r for r in self._nodes.get(name, []) if not r.removed]
+
+    def edge_records(self, tail_name: str, head_name: str) -> list[EdgeRecord]:
+        """Return the records of the edge statements from ``tail_name`` to ``head_name``."""
+        self._update_index()
+        return [r for r in self._edges.get((tail_name, head_name), []) if not r.removed]
+
+    def remove_node(self, name: str) -> None:
+        """Omit the node statements for ``name`` from the source.
+
+        Note:
+            Does not remove edge statements referring to the node.
+        """
+        for r in self.node_records(name):
+            r.removed = True
+
+    def remove_edges(self, tail_name: str, head_name: str) -> None:
+        """Omit the edge statements from ``tail_name`` to ``head_name`` from the source."""
+        for r in self.edge_records(tail_name, head_name):
+            r.removed = True
+
+    def purge(self) -> None:
+        """Drop removed records from the list (``O(n)``)."""
+        self._drop_removed()
+
+    # drop removed records before and reindex after changes other than appending
+
+    def __setitem__(self, index, value) -> None:
+        self._drop_removed()
+        super().__setitem__(index, value)
+        self._reset_index()
+
+    def __delitem__(self, index) -> None:
+        self._drop_removed()
+        super().__delitem__(index)
+        self._reset_index()
+
+    def __imul__(self, value):
+        self._drop_removed()
+        if operator.index(value) < 1:
+            self.clear()
+        else:
+            items = list(self._iteritems())
+            for _ in range(value - 1):
+                self += (i.copy() if isinstance(i, Record) else i for i in items)
+        return self
+
+    def insert(self, index, value) -> None:
+        self._drop_removed()
+        super().insert(index, value)
+        self._reset_index()
+
+    def pop(self, index=-1):
+        self._drop_removed()
+        result = self._format(super().pop(index))
+        self._reset_index()
+        return result
+
+    def remove(self, value) -> None:
+        del self[self.index(value)]
+
+    def clear(self) -> None:
+        super().clear()
+        self._reset_index()
+
+    def sort(self, *, key=None, reverse: bool = False) -> None:
+        format_ = self._format
+        items = list(self._iteritems(removed=False))
+        items.sort(key=(lambda i: key(format_(i))) if key is not None else format_,
+                   reverse=reverse)
+        self[:] = items
+
+    def reverse(self) -> None:
+        self._drop_removed()
+        super().reverse()
+        self._reset_index()
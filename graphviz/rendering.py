@@ -1,14 +1,16 @@
 """Save DOT code objects, render with Graphviz ``dot``, and open in viewer."""
 
+from collections.abc import Iterable, Iterator
 import logging
 import os
 import pathlib
 
 from . import _tools
 from . import backend
+from . import exceptions
 from . import saving
 
-__all__ = ['Render']
+__all__ = ['Render', 'render_many', 'render_parallel']
 
 
 log = logging.getLogger(__name__)
@@ -94,6 +96,165 @@ class Render(saving.Save, backend.Render, backend.View):
             (e.g. ``[image=images/camelot.png]``)
             can be given as paths relative to the DOT source file.
         """
+        (args, kwargs) = self._save_for_render(filename, directory,
+                                               format=format,
+                                               renderer=renderer,
+                                               formatter=formatter,
+                                               neato_no_op=neato_no_op,
+                                               quiet=quiet,
+                                               outfile=outfile,
+                                               engine=engine,
+                                               raise_if_result_exists=raise_if_result_exists,
+                                               overwrite_source=overwrite_source)
+
+        rendered = self._render(*args, **kwargs)
+
+        if cleanup:
+            log.debug('delete %r', args[-1])
+            os.remove(args[-1])
+
+        if quiet_view or view:
+            self._view(rendered, format=self._format, quiet=quiet_view)
+
+        return rendered
+
+    async def render_async(self,
+                           filename: os.PathLike[str] | str | None = None,
+                           directory: os.PathLike[str] | str | None = None, *,
+                           cleanup: bool = False,
+                           format: str | None = None,
+                           renderer: str | None = None,
+                           formatter: str | None = None,
+                           neato_no_op: bool | int | None = None,
+                           quiet: bool = False,
+                           outfile: os.PathLike[str] | str | None = None,
+                           engine: str | None = None,
+                           raise_if_result_exists: bool = False,
+                           overwrite_source: bool = False) -> str:
+        r"""Coroutine saving the source to file and rendering with the Graphviz engine.
+
+        See :meth:`.render` for the arguments, return value, and exceptions
+        (opening a viewer is not supported).
+
+        Example:
+            >>> doctest_mark_exe()
+            >>> import asyncio
+            >>> import graphviz
+            >>> dot = graphviz.Graph(name='spam', directory='doctest-output')
+            >>> asyncio.run(dot.render_async(format='svg')).replace('\\', '/')
+            'doctest-output/spam.gv.svg'
+
+        Note:
+            The source is saved synchronously before starting the layout subprocess.
+            Cancelling the awaiting task kills the subprocess.
+        """
+        (args, kwargs) = self._save_for_render(filename, directory,
+                                               format=format,
+                                               renderer=renderer,
+                                               formatter=formatter,
+                                               neato_no_op=neato_no_op,
+                                               quiet=quiet,
+                                               outfile=outfile,
+                                               engine=engine,
+                                               raise_if_result_exists=raise_if_result_exists,
+                                               overwrite_source=overwrite_source)
+
+        rendered = await self._render_async(*args, **kwargs)
+
+        if cleanup:
+            log.debug('delete %r', args[-1])
+            os.remove(args[-1])
+
+        return rendered
+
+    def render_multi(self, formats: Iterable[str],
+                     filename: os.PathLike[str] | str | None = None,
+                     directory: os.PathLike[str] | str | None = None, *,
+                     cleanup: bool = False,
+                     renderer: str | None = None,
+                     formatter: str | None = None,
+                     neato_no_op: bool | int | None = None,
+                     quiet: bool = False,
+                     engine: str | None = None,
+                     raise_if_result_exists: bool = False) -> list[str]:
+        r"""Save the source to file and render it laid out once into each of ``formats``.
+
+        Args:
+            formats: The output formats used for rendering
+                (``'svg'``, ``'png'``, etc.).
+            filename: Filename for saving the source
+                (defaults to ``name`` + ``'.gv'``).
+            directory: (Sub)directory for source saving and rendering.
+            cleanup (bool): Delete the source file
+                after successful rendering.
+            renderer: The output renderer used for rendering
+                (``'cairo'``, ``'gd'``, ...).
+            formatter: The output formatter used for rendering
+                (``'cairo'``, ``'gd'``, ...).
+            neato_no_op: Neato layout engine no-op flag.
+            quiet (bool): Suppress ``stderr`` output
+                from the layout subprocess.
+            engine: Layout engine for rendering
+                (``'dot'``, ``'neato'``, ...).
+            raise_if_result_exists: Raise :exc:`graphviz.FileExistsError`
+                if one of the result files exists.
+
+        Returns:
+            List with the (possibly relative) path of the rendered file
+                for each of the ``formats``.
+
+        Raises:
+            ValueError: If ``engine``, ``format``, ``renderer``, or ``formatter``
+                are unknown.
+            graphviz.RequiredArgumentError: If ``formats`` is empty
+                or ``formatter`` is given but ``renderer`` is None.
+            graphviz.ExecutableNotFound: If the Graphviz ``dot`` executable
+                is not found.
+            graphviz.CalledProcessError: If the returncode (exit status)
+                of the rendering ``dot`` subprocess is non-zero.
+            graphviz.FileExistsError: If ``raise_if_result_exists``
+                and one of the result files exists.
+
+        Example:
+            >>> doctest_mark_exe()
+            >>> import graphviz
+            >>> dot = graphviz.Graph(name='spam', directory='doctest-output')
+            >>> [r.replace('\\', '/') for r in dot.render_multi(['svg', 'png'])]
+            ['doctest-output/spam.gv.svg', 'doctest-output/spam.gv.png']
+
+        Note:
+            Runs one layout command writing all ``formats``
+            (see :func:`graphviz.backend.render_multi`).
+        """
+        formats = list(dict.fromkeys(formats))
+        for format_ in formats:
+            self._verify_format(format_)
+
+        kwargs = self._get_parameters(engine=engine,
+                                      renderer=renderer,
+                                      formatter=formatter,
+                                      neato_no_op=neato_no_op,
+                                      quiet=quiet,
+                                      verify=True)
+        del kwargs['format']
+
+        filepath = self.save(filename, directory=directory, skip_existing=None)
+
+        rendered = self._render_multi(kwargs.pop('engine'), formats, filepath,
+                                      raise_if_result_exists=raise_if_result_exists,
+                                      **kwargs)
+
+        if cleanup:
+            log.debug('delete %r', filepath)
+            os.remove(filepath)
+
+        return rendered
+
+    def _save_for_render(self, filename, directory, *,
+                         format, renderer, formatter, neato_no_op, quiet,
+                         outfile, engine, raise_if_result_exists,
+                         overwrite_source) -> tuple[list, dict]:
+        """Save the source, return the render arguments (ending with its path)."""
         outfile = _tools.promote_pathlike(outfile)
         if outfile is not None:
             format = self._get_format(outfile, format=format)
@@ -117,17 +278,7 @@ class Render(saving.Save, backend.Render, backend.View):
         filepath = self.save(filename, directory=directory, skip_existing=None)
 
         args.append(filepath)
-
-        rendered = self._render(*args, **kwargs)
-
-        if cleanup:
-            log.debug('delete %r', filepath)
-            os.remove(filepath)
-
-        if quiet_view or view:
-            self._view(rendered, format=self._format, quiet=quiet_view)
-
-        return rendered
+        return args, kwargs
 
     def _view(self, filepath: os.PathLike[str] | str, *,
               format: str, quiet: bool) -> None:
@@ -183,3 +334,133 @@ class Render(saving.Save, backend.Render, backend.View):
         """
         return self.render(filename=filename, directory=directory, view=True,
                            cleanup=cleanup, quiet=quiet, quiet_view=quiet_view)
+
+
+def render_many(graphs: Iterable[Render], format: str | None = None, *,
+                renderer: str | None = None,
+                formatter: str | None = None,
+                neato_no_op: bool | int | None = None,
+                quiet: bool = False,
+                engine: str | None = None) -> list[str]:
+    r"""Save the sources of ``graphs`` to file and render them
+        with one layout command per parameters and directory.
+
+    Args:
+        graphs: :class:`.Graph`, :class:`.Digraph`, or :class:`.Source` objects
+            with different :attr:`.filepath`.
+        format: The output format used for rendering
+            (default: ``format`` of each graph).
+        renderer: The output renderer used for rendering
+            (default: ``renderer`` of each graph).
+        formatter: The output formatter used for rendering
+            (default: ``formatter`` of each graph).
+        neato_no_op: Neato layout engine no-op flag.
+        quiet (bool): Suppress ``stderr`` output
+            from the layout subprocesses.
+        engine: Layout engine for rendering
+            (default: ``engine`` of each graph).
+
+    Returns:
+        List with the (possibly relative) path of the rendered file
+            for each of the ``graphs`` (in the same order).
+
+    Raises:
+        ValueError: If ``engine``, ``format``, ``renderer``, or ``formatter``
+            are unknown or ``graphs`` have the same :attr:`.filepath`.
+        graphviz.RequiredArgumentError: If ``formatter`` is given
+            but ``renderer`` is None.
+        graphviz.ExecutableNotFound: If the Graphviz ``dot`` executable
+            is not found.
+        graphviz.BatchError: If the returncode (exit status)
+            of a rendering ``dot`` subprocess is non-zero
+            (after rendering all batches, with the position of the first failed graph
+            as ``index`` and ``None`` for failed graphs in ``results``).
+
+    Example:
+        >>> doctest_mark_exe()
+        >>> import graphviz
+        >>> graphs = [graphviz.Graph(name, directory='doctest-output')
+        ...           for name in ('spam', 'eggs')]
+        >>> [r.replace('\\', '/') for r in graphviz.render_many(graphs, format='png')]
+        ['doctest-output/spam.gv.png', 'doctest-output/eggs.gv.png']
+
+    Note:
+        Graphs with the same ``engine``, ``format``, ``renderer``, and ``formatter``
+        are rendered with the same layout command (``-O``)
+        per directory (see :func:`graphviz.backend.render_batch`).
+    """
+    graphs = list(graphs)
+    batches: dict[tuple, tuple[dict, list[int]]] = {}
+    seen: set[str] = set()
+    for index, graph in enumerate(graphs):
+        kwargs = graph._get_parameters(engine=engine,
+                                       format=format,
+                                       renderer=renderer,
+                                       formatter=formatter,
+                                       neato_no_op=neato_no_op,
+                                       quiet=quiet,
+                                       verify=True)
+        filepath = os.path.normcase(os.path.abspath(graph.filepath))
+        if filepath in seen:
+            raise ValueError(f'graphs must have different filepath: {graph.filepath!r}')
+        seen.add(filepath)
+        batches.setdefault(tuple(kwargs.values()), (kwargs, []))[1].append(index)
+
+    results: list = [None] * len(graphs)
+    error: exceptions.BatchError | None = None
+    for kwargs, indexes in batches.values():
+        filepaths = [graphs[i].save(skip_existing=None) for i in indexes]
+        log.debug('render %d graphs in one batch', len(filepaths))
+        try:
+            rendered = backend.render_batch(kwargs.pop('engine'), kwargs.pop('format'),
+                                            filepaths, **kwargs)
+        except exceptions.BatchError as e:
+            rendered = e.results
+            e.index = indexes[e.index] if e.index is not None else None
+            if (error is None or error.index is None
+                or (e.index is not None and e.index < error.index)):  # noqa: E129
+                error = e
+        for i, result in zip(indexes, rendered):
+            results[i] = result
+
+    if error is not None:
+        error.results = results
+        raise error
+    return results
+
+
+def render_parallel(graphs: Iterable[Render], max_workers: int | None = None, *,
+                    ordered: bool = True,
+                    **kwargs) -> Iterator[tuple[int, str | Exception]]:
+    r"""Render ``graphs`` with up to ``max_workers`` concurrent layout subprocesses.
+
+    Args:
+        graphs: :class:`.Graph`, :class:`.Digraph`, or :class:`.Source` objects
+            with different :attr:`.filepath`.
+        max_workers: Maximal number of concurrent layout subprocesses
+            (default: :func:`os.cpu_count`).
+        ordered: Yield the results in the order of ``graphs``
+            (``False``: as they complete).
+        kwargs: Arguments for :meth:`.Graph.render` of each graph
+            (``format``, ``engine``, ``quiet``, ...).
+
+    Yields:
+        ``(index, result)`` pairs with the position in ``graphs``
+        and the (possibly relative) path of the rendered file
+        or the exception raised when rendering the graph
+        (e.g. :exc:`graphviz.CalledProcessError`).
+
+    Example:
+        >>> doctest_mark_exe()
+        >>> import graphviz
+        >>> graphs = [graphviz.Graph(name, directory='doctest-output')
+        ...           for name in ('spam', 'eggs')]
+        >>> [(i, r.replace('\\', '/')) for i, r in graphviz.render_parallel(graphs, 2,
+        ...                                                                  format='png')]
+        [(0, 'doctest-output/spam.gv.png'), (1, 'doctest-output/eggs.gv.png')]
+
+    Note:
+        An exception raised for one graph does not stop rendering the others.
+    """
+    return _tools.map_parallel(lambda graph: graph.render(**kwargs), graphs,
+                               max_workers=max_workers, ordered=ordered)
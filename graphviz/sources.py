@@ -1,14 +1,17 @@
 """Save DOT code objects, render with Graphviz dot, and open in viewer."""
 
 from collections.abc import Iterator
+import hashlib
 import locale
 import logging
 import os
 
 from .encoding import DEFAULT_ENCODING
 from . import _tools
+from . import fingerprinting
 from . import saving
 from . import jupyter_integration
+from . import layouts
 from . import piping
 from . import rendering
 from . import unflattening
@@ -20,8 +23,8 @@ log = logging.getLogger(__name__)
 
 
 class Source(rendering.Render, saving.Save,
-             jupyter_integration.JupyterIntegration, piping.Pipe,
-             unflattening.Unflatten):
+             jupyter_integration.JupyterIntegration, layouts.Layout, piping.Pipe,
+             unflattening.Unflatten, fingerprinting.Fingerprint):
     """Verbatim DOT source code string to be rendered by Graphviz.
 
     Args:
@@ -90,6 +93,8 @@ class Source(rendering.Render, saving.Save,
         self._loaded_from_path = loaded_from_path
         self._source = source
 
+    _hasher: tuple[str, hashlib.blake2b] | None = None
+
     def _copy_kwargs(self, **kwargs):
         """Return the kwargs to create a copy of the instance."""
         return super()._copy_kwargs(source=self._source,
@@ -118,6 +123,12 @@ class Source(rendering.Render, saving.Save,
             source += '\n'
         return source
 
+    def _source_hasher(self):
+        """Return a new hasher updated with the encoded source (computed once)."""
+        if self._hasher is None or self._hasher[0] is not self._source:
+            self._hasher = (self._source, super()._source_hasher())
+        return self._hasher[1].copy()
+
     @_tools.deprecate_positional_args(supported_number=1, ignore_arg='self')
     def save(self, filename: os.PathLike[str] | str | None = None,
              directory: os.PathLike[str] | str | None = None, *,
@@ -0,0 +1,170 @@
+"""Strip cosmetic attributes from DOT statements for layout cache keys."""
+
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+import re
+from typing import Final
+
+__all__ = ['COSMETIC_ATTRIBUTES',
+           'get_cosmetic_attributes', 'set_cosmetic_attributes',
+           'strip_line', 'strip_attrs']
+
+COSMETIC_ATTRIBUTES: Final[frozenset[str]] = frozenset({
+    # colors and drawing
+    'bgcolor', 'color', 'colorscheme', 'fillcolor', 'fontcolor',
+    'gradientangle', 'labelfontcolor', 'pencolor', 'penwidth', 'style',
+    'truecolor',
+    # arrowheads (drawn at the edge ends after routing)
+    'arrowhead', 'arrowsize', 'arrowtail',
+    # links, tooltips, and output metadata
+    'URL', 'href', 'target', 'tooltip', 'id', 'class', 'comment',
+    'edgeURL', 'edgehref', 'edgetarget', 'edgetooltip',
+    'headURL', 'headhref', 'headtarget', 'headtooltip',
+    'tailURL', 'tailhref', 'tailtarget', 'tailtooltip',
+    'labelURL', 'labelhref', 'labeltarget', 'labeltooltip',
+    'fontnames', 'stylesheet'})
+"""Default attributes that do not change the layout
+(see :func:`set_cosmetic_attributes`)."""
+
+ATTR_STATEMENT = re.compile(r'(?P<head>(?:"(?:[^"\\]|\\.)*"|[^"\[\n])*)'
+                            r' \[(?P<a_list>.*)\]\n', flags=re.DOTALL)
+
+A_LIST_ITEM = re.compile(r'[\s,;]*(?P<key>"(?:[^"\\]|\\.)*"|[^\s=,;\[\]"<>]+)'
+                         r'\s*=\s*(?P<value>"(?:[^"\\]|\\.)*"|<|[^\s=,;\[\]"<>]+)',
+                         flags=re.DOTALL)
+
+A_LIST_END = re.compile(r'[\s,;]*$')
+
+_cosmetic_attributes: frozenset[str] = COSMETIC_ATTRIBUTES
+
+
+def get_cosmetic_attributes() -> frozenset[str]:
+    """Return the attribute names ignored by :meth:`.Graph.fingerprint`
+        with ``topology=True``."""
+    return _cosmetic_attributes
+
+
+def set_cosmetic_attributes(attributes: Iterable[str]) -> frozenset[str]:
+    """Change the attributes treated as cosmetic and return the old ones.
+
+    Args:
+        attributes: Names of the attributes that do not change the layout
+            (default: :data:`COSMETIC_ATTRIBUTES`).
+
+    Returns:
+        The old attribute names.
+
+    Example:
+        >>> from graphviz import topology  # doctest: +NO_EXE
+        >>> old = topology.set_cosmetic_attributes(topology.COSMETIC_ATTRIBUTES
+        ...                                        | {'xlabel'})
+        >>> 'xlabel' in topology.get_cosmetic_attributes()
+        True
+        >>> topology.set_cosmetic_attributes(old) == old | {'xlabel'}
+        True
+
+    Note:
+        Changes the keys of the layouts memoized by :meth:`.Graph.layout`.
+    """
+    global _cosmetic_attributes
+
+    if isinstance(attributes, str):
+        raise TypeError(f'attributes must be an iterable of names: {attributes!r}')
+
+    old = _cosmetic_attributes
+    _cosmetic_attributes = frozenset(attributes)
+    return old
+
+
+def strip_attrs(attrs: (Mapping[str, str | None]
+                        | Sequence[tuple[str, str | None]]
+                        | None)) -> list[tuple[str, str | None]]:
+    """Return the items of ``attrs`` without cosmetic attributes."""
+    if not attrs:
+        return []
+    items = attrs.items() if isinstance(attrs, Mapping) else attrs
+    cosmetic = _cosmetic_attributes
+    return [(k, v) for k, v in items if k not in cosmetic]
+
+
+def strip_line(line: str) -> str:
+    r"""Return the DOT source ``line`` without cosmetic attributes.
+
+    >>> strip_line('\tspam [label=Spam color=red]\n')  # doctest: +NO_EXE
+    '\tspam [label=Spam]\n'
+
+    >>> strip_line('\tspam -- eggs [color="red" tooltip=<<b>hi</b>>]\n')
+    '\tspam -- eggs\n'
+
+    >>> strip_line('\tbgcolor=black\n')
+    ''
+
+    >>> strip_line('\tnode [shape=box]\n')
+    '\tnode [shape=box]\n'
+
+    >>> strip_line('// spam\n')
+    ''
+
+    Note:
+        Lines that cannot be split into statement and attributes
+        are returned unchanged.
+    """
+    if line.lstrip().startswith('//'):
+        return ''
+
+    if (match := ATTR_STATEMENT.fullmatch(line)) is not None:
+        if (items := split_a_list(match['a_list'])) is None:
+            return line
+        kept = [f'{k}={v}' for k, v, name in items
+                if name not in _cosmetic_attributes]
+        attr_list = f' [{" ".join(kept)}]' if kept else ''
+        return f'{match["head"]}{attr_list}\n'
+
+    if '=' in line and '[' not in line and line.endswith('\n'):
+        if (items := split_a_list(line)) is None:
+            return line
+        kept = [f'{k}={v}' for k, v, name in items
+                if name not in _cosmetic_attributes]
+        if not kept:
+            return ''
+        indent = line[:len(line) - len(line.lstrip())]
+        return f'{indent}{" ".join(kept)}\n'
+
+    return line
+
+
+def split_a_list(a_list: str) -> list[tuple[str, str, str]] | None:
+    """Return ``(key, value, name)`` triples of ``a_list`` (``None`` if invalid)."""
+    result = []
+    pos = 0
+    while A_LIST_END.fullmatch(a_list, pos) is None:
+        if (match := A_LIST_ITEM.match(a_list, pos)) is None:
+            return None
+        (key, value) = match.group('key', 'value')
+        pos = match.end()
+        if value == '<':
+            if (end := html_end(a_list, pos)) is None:
+                return None
+            value = a_list[pos - 1:end]
+            pos = end
+        name = key[1:-1].replace('\\"', '"') if key.startswith('"') else key
+        result.append((key, value, name))
+    return result
+
+
+def html_end(s: str, pos: int) -> int | None:
+    """Return the index after the ``'>'`` closing the ``'<'`` before ``pos``."""
+    depth = 1
+    for index in range(pos, len(s)):
+        if s[index] == '<':
+            depth += 1
+        elif s[index] == '>':
+            depth -= 1
+            if not depth:
+                return index + 1
+    return None
+
+
+def iter_stripped(lines: Iterable[str]) -> Iterator[str]:
+    """Yield ``lines`` without cosmetic attributes (see :func:`strip_line`)."""
+    for line in lines:
+        yield strip_line(line)
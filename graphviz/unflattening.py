@@ -43,11 +43,30 @@ class Unflatten(encoding.Encoding, base.Base, backend.Unflatten):
             Upstream documentation:
             https://www.graphviz.org/pdf/unflatten.1.pdf
         """
-        from . import sources
-
         out = self._unflatten(self.source,
                               stagger=stagger, fanout=fanout, chain=chain,
                               encoding=self.encoding)
+        return self._unflattened_source(out)
+
+    async def unflatten_async(self, *,
+                              stagger: int | None = None,
+                              fanout: bool = False,
+                              chain: int | None = None) -> 'graphviz.Source':
+        """Coroutine returning a new :class:`.Source` instance with the source
+            piped through the Graphviz *unflatten* preprocessor.
+
+        See :meth:`.unflatten` for the arguments, return value, and exceptions.
+
+        Note:
+            Cancelling the awaiting task kills the subprocess.
+        """
+        out = await self._unflatten_async(self.source,
+                                          stagger=stagger, fanout=fanout, chain=chain,
+                                          encoding=self.encoding)
+        return self._unflattened_source(out)
+
+    def _unflattened_source(self, out: str) -> 'graphviz.Source':
+        from . import sources
 
         kwargs = self._copy_kwargs()
         return sources.Source(out,
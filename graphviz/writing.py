@@ -0,0 +1,329 @@
+r"""Stream DOT source lines to a file, socket, or layout process while building.
+
+Example:
+    >>> import io
+    >>> import graphviz  # doctest: +NO_EXE
+
+    >>> buf = io.StringIO()
+    >>> with graphviz.DigraphWriter(buf, name='parrot') as w:
+    ...     w.node('A', 'King Arthur')
+    ...     with w.subgraph(name='cluster_knights') as c:
+    ...         c.edge('B', 'L')
+    ...     w.edges(['AB', 'AL'])
+
+    >>> print(buf.getvalue())  # doctest: +NORMALIZE_WHITESPACE
+    digraph parrot {
+        A [label="King Arthur"]
+        subgraph cluster_knights {
+            B -> L
+        }
+        A -> B
+        A -> L
+    }
+"""
+
+from collections.abc import Callable, Iterable, Mapping
+import io
+import os
+import socket
+import subprocess
+
+from .encoding import DEFAULT_ENCODING
+from . import dot
+from . import encoding
+from .backend import dot_command
+from .backend import execute
+
+__all__ = ['GraphWriter', 'DigraphWriter']
+
+
+class StreamBody:
+    """Stand-in for the ``body`` list writing each line as it is added."""
+
+    __slots__ = ('_write',)
+
+    def __init__(self, write: Callable[[str], object]) -> None:
+        self._write = write
+
+    def append(self, line: str) -> None:
+        self._write(line)
+
+    def extend(self, lines: Iterable[str]) -> None:
+        write = self._write
+        for line in lines:
+            write(line)
+
+    def __iadd__(self, lines: Iterable[str]) -> 'StreamBody':
+        self.extend(lines)
+        return self
+
+
+class BaseWriter(dot.Dot, encoding.Encoding):
+    """DOT language creation streaming each statement on creation."""
+
+    closed: bool = False
+    """The closing brace is written and no more statements can be added."""
+
+    stdout: bytes | None = None
+    """Output of the layout process after closing (see :meth:`popen`)."""
+
+    _file = None
+
+    _popen: subprocess.Popen | None = None
+
+    _communicate: Callable[[], tuple] | None = None
+
+    _quiet = False
+
+    def __init__(self, file=None, *,
+                 name: str | None = None,
+                 comment: str | None = None,
+                 graph_attr: Mapping[str, str] | None = None,
+                 node_attr: Mapping[str, str] | None = None,
+                 edge_attr: Mapping[str, str] | None = None,
+                 body: Iterable[str] | None = None,
+                 strict: bool = False,
+                 encoding: str | None = DEFAULT_ENCODING,
+                 _parent: 'BaseWriter | None' = None) -> None:
+        super().__init__(name=name, comment=comment,
+                         graph_attr=graph_attr,
+                         node_attr=node_attr, edge_attr=edge_attr,
+                         strict=strict, encoding=encoding)
+
+        self._parent = _parent
+        self._open_subgraph: BaseWriter | None = None
+        self._write: Callable[[str], object]
+
+        if _parent is not None:
+            parent_write = _parent._write
+            self._write = lambda line: parent_write(f'\t{line}')
+        elif file is None:
+            raise TypeError(f'{self.__class__.__name__}() missing file argument')
+        else:
+            self._write = self._make_write(file)
+
+        self.body = StreamBody(self._write_line)  # type: ignore[assignment]
+        self.body += self._iterhead(subgraph=_parent is not None)
+        if body is not None:
+            self.body += body
+
+    def _make_write(self, file) -> Callable[[str], object]:
+        if isinstance(file, (str, os.PathLike)):
+            file = self._file = open(file, 'w', encoding=self.encoding)
+        if isinstance(file, io.TextIOBase):
+            return file.write
+        write = file.sendall if isinstance(file, socket.socket) else file.write
+        encoding = self.encoding
+        return lambda line: write(line.encode(encoding))
+
+    @classmethod
+    def popen(cls, engine: str, format: str,
+              outfile: os.PathLike[str] | str | None = None, *,
+              renderer: str | None = None,
+              formatter: str | None = None,
+              neato_no_op: bool | int | None = None,
+              quiet: bool = False,
+              **kwargs) -> 'BaseWriter':
+        """Return a new writer streaming into the ``stdin`` of a started layout process.
+
+        Args:
+            engine: Layout engine for rendering (``'dot'``, ``'neato'``, ...).
+            format: Output format for rendering (``'pdf'``, ``'png'``, ...).
+            outfile: Path for the rendered output file
+                (default: capture the output into :attr:`stdout`).
+            renderer: Output renderer (``'cairo'``, ``'gd'``, ...).
+            formatter: Output formatter (``'cairo'``, ``'gd'``, ...).
+            neato_no_op: Neato layout engine no-op flag.
+            quiet: Suppress ``stderr`` output from the layout subprocess.
+            kwargs: Arguments for the new writer (``name``, ``comment``, ...).
+
+        Raises:
+            ValueError: If ``engine``, ``format``, ``renderer``, or ``formatter``
+                are unknown.
+            graphviz.RequiredArgumentError: If ``formatter`` is given
+                but ``renderer`` is None.
+            graphviz.ExecutableNotFound: If the Graphviz ``dot`` executable
+                is not found.
+
+        Note:
+            The layout process reads the statements while they are created
+            (its output is read from threads meanwhile).
+            :meth:`close` waits for it to finish and raises
+            :exc:`graphviz.CalledProcessError` if its returncode is non-zero.
+            So does writing a statement after the process has exited
+            (with the ``stderr`` of the process).
+        """
+        cmd = dot_command.command(engine, format,
+                                  renderer=renderer,
+                                  formatter=formatter,
+                                  neato_no_op=neato_no_op)
+        if outfile is not None:
+            # https://www.graphviz.org/doc/info/command.html#-o
+            cmd += ['-o', outfile]
+
+        popen = execute.popen_input(cmd, capture_output=True)
+        communicate = execute.start_reading(popen)
+        try:
+            self = cls(popen.stdin, **kwargs)
+        except BrokenPipeError:
+            execute.communicate_check(popen, quiet=quiet, communicate=communicate)
+            raise
+        except BaseException:
+            popen.kill()
+            communicate()
+            raise
+        self._popen = popen
+        self._communicate = communicate
+        self._quiet = quiet
+        return self
+
+    def _write_line(self, line: str) -> None:
+        if self.closed:
+            raise ValueError(f'write to closed {self.__class__.__name__}')
+        if self._open_subgraph is not None:
+            raise ValueError('cannot write to the parent graph'
+                             ' while its subgraph is open')
+        try:
+            self._write(line)
+        except BrokenPipeError:
+            root = self
+            while root._parent is not None:
+                root = root._parent
+            if root._popen is not None and not root.closed:
+                root._release()
+                execute.communicate_check(root._popen, quiet=root._quiet,
+                                          communicate=root._communicate)
+            raise
+
+    def close(self) -> None:
+        """Write the closing brace, close the opened file or wait for the layout process.
+
+        Raises:
+            graphviz.CalledProcessError: If the returncode (exit status)
+                of the layout subprocess is non-zero.
+        """
+        if self.closed:
+            return
+        if self._open_subgraph is not None:
+            raise ValueError('cannot write to the parent graph'
+                             ' while its subgraph is open')
+        try:
+            self.body.append(self._tail)
+        except BaseException:
+            self.abort()
+            raise
+        self._release()
+        if self._popen is not None:
+            proc = execute.communicate_check(self._popen, quiet=self._quiet,
+                                             communicate=self._communicate)
+            self.stdout = proc.stdout
+
+    def abort(self) -> None:
+        """Stop writing without closing brace, kill a started layout process."""
+        if self.closed:
+            return
+        self._release()
+        if self._popen is not None:
+            assert self._communicate is not None
+            self._popen.kill()
+            self._communicate()
+
+    def _release(self) -> None:
+        self.closed = True
+        if self._parent is not None:
+            self._parent._open_subgraph = None
+        if self._file is not None:
+            self._file.close()
+
+    def __enter__(self) -> 'BaseWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def subgraph(self, graph=None,
+                 name: str | None = None,
+                 comment: str | None = None,
+                 graph_attr: Mapping[str, str] | None = None,
+                 node_attr: Mapping[str, str] | None = None,
+                 edge_attr: Mapping[str, str] | None = None,
+                 body=None):
+        """Write the current content of the given sole ``graph`` argument
+            as subgraph or return a new writer
+            for a subgraph with the given (``name``, ``comment``, etc.) arguments
+            that is closed when leaving its ``with``-block.
+
+        The parent writer cannot be written to while the subgraph is open.
+
+        See :meth:`.Graph.subgraph` for the arguments.
+        """
+        if graph is not None:
+            return super().subgraph(graph, name=name, comment=comment,
+                                    graph_attr=graph_attr,
+                                    node_attr=node_attr, edge_attr=edge_attr,
+                                    body=body)
+
+        if self.closed:
+            raise ValueError(f'write to closed {self.__class__.__name__}')
+        if self._open_subgraph is not None:
+            raise ValueError('cannot write to the parent graph'
+                             ' while its subgraph is open')
+
+        subgraph = self.__class__(name=name, comment=comment,
+                                  graph_attr=graph_attr,
+                                  node_attr=node_attr, edge_attr=edge_attr,
+                                  body=body, strict=False,
+                                  encoding=self.encoding, _parent=self)
+        self._open_subgraph = subgraph
+        return subgraph
+
+    def _unsupported(self, *args, **kwargs):
+        raise TypeError(f'{self.__class__.__name__} writes its lines'
+                        ' when they are created')
+
+    __iter__ = copy = clear = _unsupported
+
+
+class GraphWriter(dot.GraphSyntax, BaseWriter):
+    """Graph source code in the DOT language streamed to ``file`` on creation.
+
+    Args:
+        file: Text or binary file object, :class:`socket.socket`,
+            or path of the file to write to (opened and closed by the writer).
+        name: Graph name used in the source code.
+        comment: Comment added to the first line of the source.
+        graph_attr: Mapping of ``(attribute, value)`` pairs for the graph.
+        node_attr: Mapping of ``(attribute, value)`` pairs set for all nodes.
+        edge_attr: Mapping of ``(attribute, value)`` pairs set for all edges.
+        body: Iterable of verbatim lines (including their final newline)
+            to add to the graph ``body``.
+        strict (bool): Rendering should merge multi-edges.
+        encoding: Encoding for binary file objects, sockets, and paths.
+
+    The head of the source (including ``graph_attr``, ``node_attr``,
+    and ``edge_attr``) is written on instance creation,
+    each statement when it is created (``node()``, ``edge()``, ``attr()``, ...),
+    and the closing brace by :meth:`close`
+    (or when leaving its ``with``-block).
+    Use :meth:`popen` to stream into a layout process.
+    """
+
+    @property
+    def directed(self) -> bool:
+        """``False``"""
+        return False
+
+
+class DigraphWriter(dot.DigraphSyntax, BaseWriter):
+    """Directed graph source code in the DOT language streamed to ``file`` on creation."""
+
+    if GraphWriter.__doc__ is not None:
+        __doc__ += GraphWriter.__doc__.partition('.')[2]
+
+    @property
+    def directed(self) -> bool:
+        """``True``"""
+        return True
@@ -11,7 +11,7 @@ __all__ = ['EXPECTED_DOT_BINARY',
            'EXPECTED_DEFAULT_ENGINE',
            'EXPECTED_DEFAULT_ENCODING',
            'INVALID_CMD',
-           'as_cwd',
+           'as_cwd', 'chunked',
            'check_startupinfo', 'StartupinfoMatcher']
 
 EXPECTED_DOT_BINARY = pathlib.Path('dot')
@@ -37,6 +37,12 @@ def as_cwd(path):
     os.chdir(cwd)
 
 
+def chunked(data: str, size: int, *, encoding: str = EXPECTED_DEFAULT_ENCODING):
+    """Return an iterator over the encoded ``data`` in chunks of ``size`` bytes."""
+    data = data.encode(encoding)
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
 def check_startupinfo(startupinfo) -> bool:  # noqa: N803
     return startupinfo is None
 
@@ -0,0 +1,328 @@
+import os
+import pathlib
+import subprocess
+import types
+
+import pytest
+
+import graphviz
+from graphviz.backend import caching
+
+import _common
+
+VERSION = (2, 44, 1)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = caching.DiskCache(tmp_path / 'cache', max_bytes=10, version=VERSION)
+    old = caching.set_disk_cache(cache)
+    yield cache
+    caching.set_disk_cache(old)
+
+
+def test_key(cache, tmp_path, data=b'graph { spam }'):
+    key = cache.key(data, ['dot', '-Kdot', '-Tsvg'])
+
+    assert len(key) == 64
+    assert cache.key([data[:5], data[5:]], ['dot', '-Kdot', '-Tsvg']) == key
+    assert cache.key(data, [tmp_path / 'dot', '-Kdot', '-Tsvg']) != key
+    assert cache.key(data, ['dot', '-Kneato', '-Tsvg']) != key
+    assert cache.key(data, ['dot', '-Kdot', '-Tsvg:cairo']) != key
+    assert cache.key(data + b' ', ['dot', '-Kdot', '-Tsvg']) != key
+    assert caching.DiskCache(cache.directory, version=(3,)).key(data, ['dot']) != key
+
+
+def test_key_version_mocked(mocker, tmp_path):
+    mock_version = mocker.patch('graphviz.backend.upstream_version.version',
+                                autospec=True, return_value=VERSION)
+    cache = caching.DiskCache(tmp_path)
+
+    cache.key(b'', ['dot'])
+    cache.key(b'', ['dot'])
+
+    mock_version.assert_called_once_with()
+
+
+def test_key_executable_changed_mocked(mocker, tmp_path):
+    mock_version = mocker.patch('graphviz.backend.upstream_version.version',
+                                autospec=True, return_value=VERSION)
+    executable = tmp_path / 'dot'
+    executable.write_bytes(b'')
+    cache = caching.DiskCache(tmp_path / 'cache')
+    key = cache.key(b'', [executable])
+
+    assert cache.key(b'', [executable]) == key
+    os.utime(executable, ns=(0, 0))
+    assert cache.key(b'', [executable]) != key
+    assert mock_version.call_count == 2
+
+
+def test_get_put(cache):
+    assert cache.get('spam') is None
+
+    cache.put('spam', b'eggs')
+
+    assert cache.get('spam') == b'eggs'
+    assert cache.cache_info() == caching.CacheInfo(hits=1, misses=1, evictions=0,
+                                                   currsize=4, maxsize=10)
+    assert not [p for p in cache.directory.rglob('*')
+                if p.name.startswith(caching.TEMP_PREFIX)]
+
+
+def test_evict_least_recently_used(cache):
+    cache.max_bytes = 12
+    for i, key in enumerate(['spam', 'eggs', 'ham']):
+        cache.put(key, b'1234')
+        os.utime(cache._path(key), ns=(i * 10**9, i * 10**9))
+    cache.get('spam')  # mark as recently used
+
+    cache.put('bacon', b'1234')
+
+    assert cache.get('eggs') is None
+    assert [cache.get(k) for k in ['spam', 'ham', 'bacon']] == [b'1234'] * 3
+    info = cache.cache_info()
+    assert info.evictions == 1
+    assert info.currsize == 12
+
+
+def test_evict_shared_directory(tmp_path):
+    (spam, eggs) = (caching.DiskCache(tmp_path, max_bytes=64, version=VERSION)
+                    for _ in range(2))
+    spam.put('spam', b'1234')
+    eggs.put('eggs', b'x' * 60)
+    os.utime(eggs._path('eggs'), ns=(0, 0))
+
+    spam.put('ham', b'1234')
+
+    assert eggs.get('eggs') is None
+    assert spam.cache_info().currsize == 8
+
+
+def test_clear(cache):
+    cache.put('spam', b'eggs')
+    cache.get('spam')
+
+    cache.clear()
+
+    assert cache.get('spam') is None
+    assert cache.cache_info() == (0, 1, 0, 0, 10)
+
+
+def test_pipe_cached_mocked(cache, mock_run, data=b'nongraph'):
+    mock_run.return_value = subprocess.CompletedProcess(_common.INVALID_CMD,
+                                                        returncode=0,
+                                                        stdout=b'stdout',
+                                                        stderr=b'')
+
+    assert graphviz.pipe('dot', 'png', data) == b'stdout'
+    assert graphviz.pipe('dot', 'png', data) == b'stdout'
+    assert graphviz.pipe_lines('dot', 'png', iter([data.decode('ascii')]),
+                               input_encoding='ascii') == b'stdout'
+
+    mock_run.assert_called_once_with([_common.EXPECTED_DOT_BINARY, '-Kdot', '-Tpng'],
+                                     input=data, capture_output=True,
+                                     startupinfo=_common.StartupinfoMatcher())
+    assert cache.cache_info()[:2] == (2, 1)
+
+
+def test_pipe_lines_cached_spooled_mocked(monkeypatch, mocker, cache,
+                                          lines=['graph {\n', '\tspam\n', '}\n']):
+    monkeypatch.setattr('graphviz.backend.piping.SPOOL_MAX_SIZE', 4)
+    spooled = []
+
+    def run_check(cmd, *, input_lines, **kwargs):
+        spooled.append(b''.join(input_lines))
+        return subprocess.CompletedProcess(cmd, returncode=0, stdout=b'stdout', stderr=b'')
+
+    mocker.patch('graphviz.backend.execute.run_check', autospec=True, side_effect=run_check)
+
+    for _ in range(2):
+        assert graphviz.pipe_lines('dot', 'svg', iter(lines),
+                                   input_encoding='ascii') == b'stdout'
+
+    assert spooled == [''.join(lines).encode('ascii')]
+    assert cache.cache_info()[:2] == (1, 1)
+
+
+def test_pipe_string_cached_mocked(cache, mock_run, encoding='utf-8'):
+    mock_run.return_value = subprocess.CompletedProcess(_common.INVALID_CMD,
+                                                        returncode=0,
+                                                        stdout='sp\xe4m\r\n'.encode(encoding),
+                                                        stderr=b'')
+
+    assert graphviz.pipe_string('dot', 'svg', 'nongraph', encoding=encoding) == 'sp\xe4m\n'
+    assert graphviz.pipe_lines_string('dot', 'svg', iter(['non', 'graph']),
+                                      encoding=encoding) == 'sp\xe4m\n'
+
+    mock_run.assert_called_once()
+
+
+def test_pipe_multi_cached_mocked(cache, mock_run, data=b'nongraph'):
+    def run(cmd, **kwargs):
+        for arg in cmd[1:]:
+            if arg.startswith('-o'):
+                pathlib.Path(arg[2:]).write_bytes(b'out')
+        return subprocess.CompletedProcess(cmd, returncode=0, stdout=b'', stderr=b'')
+
+    mock_run.side_effect = run
+
+    assert graphviz.backend.pipe_multi('dot', ['svg', 'png'], data) == {'svg': b'out',
+                                                                        'png': b'out'}
+    assert graphviz.backend.pipe_multi('dot', ['png', 'svg'], data) == {'png': b'out',
+                                                                        'svg': b'out'}
+    assert graphviz.pipe('dot', 'png', data) == b'out'
+
+    mock_run.assert_called_once()
+
+
+def test_pipe_error_not_cached(cache, mock_run):
+    mock_run.return_value = subprocess.CompletedProcess(_common.INVALID_CMD,
+                                                        returncode=1,
+                                                        stdout=b'',
+                                                        stderr=b'')
+
+    for _ in range(2):
+        with pytest.raises(graphviz.CalledProcessError):
+            graphviz.pipe('dot', 'png', b'nongraph', quiet=True)
+
+    assert mock_run.call_count == 2
+    assert not list(cache.directory.glob('*/*'))
+
+
+def test_render_cached_mocked(cache, mock_run, tmp_path):
+    filepath = tmp_path / 'spam.gv'
+    filepath.write_text('graph { spam }', encoding='ascii')
+
+    def run(cmd, *, cwd, **kwargs):
+        (pathlib.Path(cwd) / 'spam.gv.svg').write_bytes(b'<svg/>')
+        return subprocess.CompletedProcess(cmd, returncode=0, stdout=b'', stderr=b'')
+
+    mock_run.side_effect = run
+
+    result = graphviz.render('dot', 'svg', filepath)
+    os.remove(result)
+
+    assert graphviz.render('dot', 'svg', filepath) == result
+    assert pathlib.Path(result).read_bytes() == b'<svg/>'
+    mock_run.assert_called_once_with([_common.EXPECTED_DOT_BINARY, '-Kdot', '-Tsvg',
+                                      '-O', 'spam.gv'],
+                                     cwd=tmp_path, capture_output=True,
+                                     startupinfo=_common.StartupinfoMatcher())
+
+
+@pytest.fixture
+def clock():
+    def clock():
+        return clock.now
+
+    clock.now = 0.0
+    return clock
+
+
+@pytest.fixture
+def error_cache(clock):
+    cache = caching.ErrorCache(ttl=10, max_entries=2, version=VERSION, _clock=clock)
+    old = caching.set_error_cache(cache)
+    yield cache
+    caching.set_error_cache(old)
+
+
+def test_error_cache_expires(error_cache, clock):
+    error = graphviz.CalledProcessError(1, ['dot'], b'', b'syntax error')
+    error_cache.put('spam', error)
+
+    clock.now = 9.9
+    result = error_cache.get('spam')
+
+    assert result is not error
+    assert (result.returncode, result.stderr) == (1, b'syntax error')
+
+    clock.now = 10
+    assert error_cache.get('spam') is None
+    assert error_cache.cache_info() == (1, 1, 1, 0, 2)
+
+
+def test_error_cache_max_entries(error_cache):
+    for key in ['spam', 'eggs', 'ham']:
+        error_cache.put(key, graphviz.CalledProcessError(1, ['dot']))
+
+    assert error_cache.get('spam') is None
+    assert error_cache.get('eggs') is not None
+    assert error_cache.get('ham') is not None
+    assert error_cache.cache_info().evictions == 1
+
+
+def test_error_cache_version_changed(mocker, clock, data=b'graph {'):
+    mock_version = mocker.patch('graphviz.backend.upstream_version.version',
+                                autospec=True, return_value=VERSION)
+    error_cache = caching.ErrorCache(ttl=10, _clock=clock)
+    key = error_cache.key(data, ['dot'])
+    error_cache.put(key, graphviz.CalledProcessError(1, ['dot']))
+    mock_version.assert_not_called()
+
+    assert error_cache.get(key) is not None
+    clock.now = 5
+    assert error_cache.key(data, ['dot']) == key
+    assert error_cache.get(key) is not None
+    mock_version.assert_called_once_with()
+
+    error_cache.put(key, graphviz.CalledProcessError(1, ['dot']))
+    clock.now = 10
+    mock_version.return_value = (3,)
+    assert error_cache.get(key) is None
+    assert error_cache.cache_info().currsize == 0
+    assert mock_version.call_count == 2
+
+
+def test_pipe_lines_error_cached_streamed_mocked(mocker, error_cache,
+                                                 lines=['graph {\n', '\tspam\n']):
+    calls = []
+
+    def run_check(cmd, *, input_lines, **kwargs):
+        calls.append(input_lines)
+        next(input_lines)  # subprocess fails before reading all input
+        raise graphviz.CalledProcessError(1, cmd, b'', b'syntax error')
+
+    mocker.patch('graphviz.backend.execute.run_check', autospec=True, side_effect=run_check)
+
+    for _ in range(2):
+        with pytest.raises(graphviz.CalledProcessError, match=r'syntax error'):
+            graphviz.pipe_lines('dot', 'svg', iter(lines), input_encoding='ascii')
+
+    (input_lines,) = calls
+    assert isinstance(input_lines, types.GeneratorType)
+    assert error_cache.cache_info()[:2] == (1, 0)
+    with pytest.raises(graphviz.CalledProcessError, match=r'syntax error'):
+        graphviz.pipe('dot', 'svg', ''.join(lines).encode('ascii'))
+
+
+def test_pipe_error_cached_mocked(error_cache, mock_run, capsys):
+    mock_run.return_value = subprocess.CompletedProcess(_common.INVALID_CMD,
+                                                        returncode=1,
+                                                        stdout=b'',
+                                                        stderr=b'syntax error')
+
+    for _ in range(2):
+        with pytest.raises(graphviz.CalledProcessError, match=r'syntax error') as e:
+            graphviz.pipe('dot', 'png', b'nongraph')
+        assert e.value.stderr == b'syntax error'
+
+    mock_run.assert_called_once()
+    assert capsys.readouterr() == ('', 'syntax error')
+    assert error_cache.cache_info()[:2] == (1, 1)
+
+
+def test_render_error_cached_mocked(error_cache, mock_run, tmp_path):
+    filepath = tmp_path / 'spam.gv'
+    filepath.write_text('graph {', encoding='ascii')
+    mock_run.return_value = subprocess.CompletedProcess(_common.INVALID_CMD,
+                                                        returncode=1,
+                                                        stdout=b'',
+                                                        stderr=b'')
+
+    for _ in range(2):
+        with pytest.raises(graphviz.CalledProcessError):
+            graphviz.render('dot', 'svg', filepath, quiet=True)
+
+    mock_run.assert_called_once()
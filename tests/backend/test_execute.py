@@ -1,6 +1,9 @@
+import asyncio
 import errno
 import io
 import subprocess
+import sys
+import time
 
 import pytest
 
@@ -27,6 +30,41 @@ def test_missing_executable(func, args):
         func(*args)
 
 
+@pytest.mark.usefixtures('empty_path')
+@pytest.mark.parametrize(
+    'func, args',
+    [(graphviz.render_async, ['dot', 'pdf', 'nonfilepath']),
+     (graphviz.pipe_async, ['dot', 'pdf', b'nongraph']),
+     (graphviz.unflatten_async, ['graph {}'])])
+def test_missing_executable_async(func, args):
+    with pytest.raises(graphviz.ExecutableNotFound, match=r'execute'):
+        asyncio.run(func(*args))
+
+
+@pytest.mark.usefixtures('empty_path')
+def test_popen_input_missing_executable():
+    with pytest.raises(graphviz.ExecutableNotFound, match=r'execute'):
+        execute.popen_input(['dot', '-V'])
+
+
+def test_communicate_check_called_process_error_mocked(capsys, mock_popen, quiet,
+                                                       stderr=b'I am not the messiah!'):
+    proc = mock_popen.return_value
+    proc.configure_mock(args=_common.INVALID_CMD, returncode=500)
+    proc.communicate.return_value = (b'', stderr)
+
+    popen = execute.popen_input(_common.INVALID_CMD, capture_output=True)
+    with pytest.raises(execute.CalledProcessError, match=r'messiah'):
+        execute.communicate_check(popen, quiet=quiet)
+
+    mock_popen.assert_called_once_with(_common.INVALID_CMD,
+                                       stdin=subprocess.PIPE,
+                                       stdout=subprocess.PIPE,
+                                       stderr=subprocess.PIPE,
+                                       startupinfo=_common.StartupinfoMatcher())
+    assert capsys.readouterr() == ('', '' if quiet else stderr.decode())
+
+
 def test_run_check_oserror():
     with pytest.raises(OSError) as e:
         execute.run_check(_common.INVALID_CMD)
@@ -52,17 +90,14 @@ def test_run_check_input_lines_mocked(mocker, sentinel, mock_popen,
                                       line=b'sp\xc3\xa4m'):  # noqa: N803
     mock_sys_stderr = mocker.patch('sys.stderr', autospec=True,
                                    flush=mocker.Mock(),
-                                   encoding=sentinel.encoding)
-
-    mock_out = mocker.create_autospec(bytes, instance=True, name='mock_out')
-    mock_err = mocker.create_autospec(bytes, instance=True, name='mock_err',
-                                      **{'__len__.return_value': 1})
+                                   encoding='utf-8')
 
     proc = mock_popen.return_value
     proc.configure_mock(args=_common.INVALID_CMD,
                         returncode=0,
-                        stdin=mocker.create_autospec(io.BytesIO, instance=True))
-    proc.communicate.return_value = (mock_out, mock_err)
+                        stdin=mocker.create_autospec(io.BytesIO, instance=True),
+                        stdout=io.BytesIO(b'out'),
+                        stderr=io.BytesIO(line))
 
     result = execute.run_check(proc.args, input_lines=iter([line]),
                                capture_output=True)
@@ -71,16 +106,176 @@ def test_run_check_input_lines_mocked(mocker, sentinel, mock_popen,
     assert isinstance(result, subprocess.CompletedProcess)
     assert result.args is proc.args
     assert result.returncode == proc.returncode
-    assert result.stdout is mock_out
-    assert result.stderr is mock_err
+    assert result.stdout == b'out'
+    assert result.stderr == line
 
     mock_popen.assert_called_once_with(_common.INVALID_CMD,
                                        stdin=subprocess.PIPE,
                                        stdout=subprocess.PIPE,
                                        stderr=subprocess.PIPE,
                                        startupinfo=_common.StartupinfoMatcher())
-    proc.communicate.assert_called_once_with()
-    mock_out.decode.assert_not_called()
-    mock_err.decode.assert_called_once_with(sentinel.encoding)
-    mock_sys_stderr.write.assert_called_once_with(mock_err.decode.return_value)
+    proc.stdin.write.assert_called_once_with(line)
+    proc.stdin.close.assert_called_once_with()
+    proc.wait.assert_called_once_with()
+    mock_sys_stderr.write.assert_called_once_with(line.decode('utf-8'))
     mock_sys_stderr.flush.assert_called_once_with()
+
+
+ECHO_CMD = [sys.executable, '-c',
+            'import sys; sys.stdout.buffer.write(sys.stdin.buffer.read())']
+
+# writes more than the pipe buffer to stdout and stderr before reading stdin
+FLOOD_CMD = [sys.executable, '-c',
+             'import sys; sys.stdout.write("x" * 2**20); sys.stdout.flush();'
+             ' sys.stderr.write("y" * 2**20); sys.stderr.flush();'
+             ' sys.stdout.buffer.write(sys.stdin.buffer.read())']
+
+
+def test_run_check_input_lines_full_duplex(lines=[b'spam\n'] * 100_000):
+    proc = execute.run_check(FLOOD_CMD, input_lines=iter(lines),
+                             capture_output=True, quiet=True)
+
+    assert proc.stdout == b'x' * 2**20 + b''.join(lines)
+    assert proc.stderr == b'y' * 2**20
+
+
+@pytest.mark.parametrize('sink_type', ['callable', 'write', 'bytearray'])
+def test_run_check_sink(mocker, sink_type, lines=[b'spam\n', b'eggs' * 100_000]):
+    if sink_type == 'callable':
+        sink = mocker.Mock(return_value=None)
+    elif sink_type == 'write':
+        sink = io.BytesIO()
+    else:
+        sink = bytearray()
+
+    proc = execute.run_check(ECHO_CMD, input_lines=iter(lines),
+                             capture_output=True, sink=sink)
+
+    assert proc.stdout is None
+    assert proc.stderr == b''
+    if sink_type == 'callable':
+        assert sink.call_count > 1
+        assert b''.join(c.args[0] for c in sink.call_args_list) == b''.join(lines)
+    else:
+        assert bytes(sink.getvalue() if sink_type == 'write' else sink) == b''.join(lines)
+
+
+def test_run_check_sink_input(input=b'spam'):
+    sink = bytearray()
+
+    execute.run_check(ECHO_CMD, input=input, capture_output=True, sink=sink)
+
+    assert sink == input
+
+
+def test_run_check_sink_raises_kills_subprocess(mocker):
+    spy = mocker.spy(subprocess.Popen, 'kill')
+    sink = mocker.Mock(side_effect=RuntimeError('spam'))
+
+    with pytest.raises(RuntimeError, match=r'spam'):
+        execute.run_check(FLOOD_CMD, input_lines=iter([b'eggs']),
+                          capture_output=True, sink=sink)
+
+    spy.assert_called_once()
+    (popen,) = spy.call_args.args
+    assert popen.returncode is not None
+
+
+def test_run_check_invalid_sink(mock_popen):
+    with pytest.raises(TypeError, match=r'sink'):
+        execute.run_check(ECHO_CMD, input=b'spam', capture_output=True, sink=object())
+
+    mock_popen.assert_not_called()
+
+
+def test_run_check_async_input_lines(lines=[b'spam\n', b'eggs' * 100_000, b'\n']):
+    proc = asyncio.run(execute.run_check_async(ECHO_CMD, input_lines=iter(lines),
+                                               capture_output=True))
+
+    assert proc.returncode == 0
+    assert proc.stdout == b''.join(lines)
+    assert proc.stderr == b''
+
+
+def test_run_check_async_encoding(input='sp\xe4m'):
+    proc = asyncio.run(execute.run_check_async(ECHO_CMD, input=input,
+                                               encoding='utf-8',
+                                               capture_output=True))
+
+    assert proc.stdout == input
+
+
+def test_run_check_async_called_process_error(capsys, quiet,
+                                              stderr='I am not the messiah!'):
+    cmd = [sys.executable, '-c', f'import sys; sys.exit({stderr!r})']
+
+    with pytest.raises(execute.CalledProcessError, match=r'messiah') as e:
+        asyncio.run(execute.run_check_async(cmd, capture_output=True,
+                                            encoding='ascii', quiet=quiet))
+
+    assert e.value.returncode == 1
+    assert capsys.readouterr() == ('', '' if quiet else f'{stderr}\n')
+
+
+def test_run_check_async_cancel_kills_subprocess(mocker):
+    spy = mocker.spy(asyncio.subprocess.Process, 'kill')
+    cmd = [sys.executable, '-c', 'import time; time.sleep(60)']
+
+    async def main():
+        task = asyncio.create_task(execute.run_check_async(cmd, capture_output=True))
+        await asyncio.sleep(0.5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+
+    asyncio.run(main())
+
+    (process,) = (call.args[0] for call in spy.call_args_list)
+    assert process.returncode is not None
+
+
+def test_run_check_iter(lines=[b'spam\n', b'eggs' * 100_000]):
+    chunks = list(execute.run_check_iter(ECHO_CMD, input_lines=iter(lines),
+                                         chunk_size=1_000))
+
+    assert len(chunks) > 1
+    assert all(len(c) <= 1_000 for c in chunks)
+    assert b''.join(chunks) == b''.join(lines)
+
+
+def test_run_check_iter_close_kills_subprocess(mocker):
+    spy = mocker.spy(subprocess.Popen, 'kill')
+    cmd = [sys.executable, '-c',
+           'import sys\nwhile True: sys.stdout.write("x" * 1000)']
+
+    chunks = execute.run_check_iter(cmd, input_lines=iter([]))
+    assert next(chunks).startswith(b'x')
+    chunks.close()
+
+    spy.assert_called_once()
+    (popen,) = spy.call_args.args
+    assert popen.returncode is not None
+
+
+def test_run_check_iter_close_kills_idle_subprocess():
+    cmd = [sys.executable, '-c',
+           'import sys, time\nsys.stdout.write("spam"); sys.stdout.flush(); time.sleep(60)']
+
+    chunks = execute.run_check_iter(cmd, input_lines=iter([]))
+    assert next(chunks) == b'spam'
+    start = time.monotonic()
+    chunks.close()
+
+    assert time.monotonic() - start < 30
+
+
+def test_run_check_iter_called_process_error(stderr='I am not the messiah!'):
+    cmd = [sys.executable, '-c',
+           f'import sys; sys.stdout.write("spam"); sys.exit({stderr!r})']
+
+    chunks = execute.run_check_iter(cmd, input_lines=iter([]), quiet=True)
+
+    assert next(chunks) == b'spam'
+    with pytest.raises(execute.CalledProcessError, match=r'messiah'):
+        next(chunks)
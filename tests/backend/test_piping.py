@@ -1,4 +1,5 @@
 import io
+import pathlib
 import re
 import subprocess
 
@@ -121,21 +122,22 @@ def test_pipe_string_mocked(capsys, mock_run, quiet,
     assert capsys.readouterr() == ('', '' if quiet else 'stderr')
 
 
-def test_pipe_lines_mocked(capsys, mock_popen, quiet,
+def test_pipe_lines_mocked(capsys, mocker, mock_popen, quiet,
                            input_encoding='ascii'):
     proc = mock_popen.return_value
     proc.configure_mock(args=_common.EXPECTED_DOT_BINARY,
                         returncode=0,
-                        stdin=io.BytesIO(),
+                        stdin=mocker.create_autospec(io.BytesIO, instance=True),
                         stdout=io.BytesIO(b'stdout'),
                         stderr=io.BytesIO(b'stderr'))
-    proc.communicate.side_effect = lambda: (proc.stdout.read(), proc.stderr.read())
 
     assert graphviz.pipe_lines('dot', 'png', iter(['nongraph\n']),
                                input_encoding=input_encoding,
                                quiet=quiet) == b'stdout'
 
-    assert proc.stdin.getvalue() == b'nongraph\n'
+    proc.stdin.write.assert_called_once_with(b'nongraph\n')
+    proc.stdin.close.assert_called_once_with()
+    proc.wait.assert_called_once_with()
 
     mock_popen.assert_called_once_with([_common.EXPECTED_DOT_BINARY,
                                         '-Kdot', '-Tpng'],
@@ -146,21 +148,20 @@ def test_pipe_lines_mocked(capsys, mock_popen, quiet,
     assert capsys.readouterr() == ('', '' if quiet else 'stderr')
 
 
-def test_pipe_lines_string_mocked(capsys, mock_popen, quiet,
+def test_pipe_lines_string_mocked(capsys, mocker, mock_popen, quiet,
                                   encoding='ascii'):
     proc = mock_popen.return_value
     proc.configure_mock(args=_common.INVALID_CMD,
                         returncode=0,
-                        stdin=io.StringIO(),
+                        stdin=mocker.create_autospec(io.StringIO, instance=True),
                         stdout=io.StringIO('stdout'),
                         stderr=io.StringIO('stderr'))
-    proc.communicate.side_effect = lambda: (proc.stdout.read(), proc.stderr.read())
 
     assert graphviz.pipe_lines_string('dot', 'png', iter(['nongraph\n']),
                                       encoding=encoding,
                                       quiet=quiet) == 'stdout'
 
-    assert proc.stdin.getvalue() == 'nongraph\n'
+    proc.stdin.write.assert_called_once_with('nongraph\n')
 
     mock_popen.assert_called_once_with([_common.EXPECTED_DOT_BINARY,
                                         '-Kdot', '-Tpng'],
@@ -170,3 +171,176 @@ def test_pipe_lines_string_mocked(capsys, mock_popen, quiet,
                                        stderr=subprocess.PIPE,
                                        startupinfo=_common.StartupinfoMatcher())
     assert capsys.readouterr() == ('', '' if quiet else 'stderr')
+
+
+@pytest.mark.parametrize('sink_type', ['bytearray', 'write'])
+def test_pipe_lines_to_mocked(mocker, mock_popen, sink_type, input_encoding='ascii'):
+    proc = mock_popen.return_value
+    proc.configure_mock(args=_common.EXPECTED_DOT_BINARY,
+                        returncode=0,
+                        stdin=mocker.create_autospec(io.BytesIO, instance=True),
+                        stdout=io.BytesIO(b'stdout'),
+                        stderr=io.BytesIO(b''))
+    sink = bytearray() if sink_type == 'bytearray' else io.BytesIO()
+
+    assert graphviz.backend.pipe_lines_to('dot', 'png', iter(['nongraph\n']), sink,
+                                          input_encoding=input_encoding,
+                                          chunk_size=4) is None
+
+    assert bytes(sink if sink_type == 'bytearray' else sink.getvalue()) == b'stdout'
+    proc.stdin.write.assert_called_once_with(b'nongraph\n')
+
+
+def test_pipe_lines_iter_mocked(mocker, mock_popen, input_encoding='ascii'):
+    proc = mock_popen.return_value
+    proc.configure_mock(args=_common.EXPECTED_DOT_BINARY,
+                        returncode=0,
+                        stdin=mocker.create_autospec(io.BytesIO, instance=True),
+                        stdout=io.BytesIO(b'stdout'),
+                        stderr=io.BytesIO(b''))
+
+    chunks = graphviz.backend.pipe_lines_iter('dot', 'png', iter(['nongraph\n']),
+                                              input_encoding=input_encoding,
+                                              chunk_size=4)
+    mock_popen.assert_not_called()
+
+    assert list(chunks) == [b'stdo', b'ut']
+
+    mock_popen.assert_called_once_with([_common.EXPECTED_DOT_BINARY,
+                                        '-Kdot', '-Tpng'],
+                                       stdin=subprocess.PIPE,
+                                       stdout=subprocess.PIPE,
+                                       stderr=subprocess.PIPE,
+                                       startupinfo=_common.StartupinfoMatcher())
+
+
+def _write_multi_outputs(cmd, **kwargs):
+    for arg in cmd[1:]:
+        if arg.startswith('-o'):
+            path = pathlib.Path(arg[2:])
+            path.write_bytes(b'out' + path.suffix.encode('ascii'))
+    return subprocess.CompletedProcess(cmd, returncode=0, stdout=b'', stderr=b'')
+
+
+def test_pipe_multi_mocked(mocker, mock_run, quiet):
+    mock_run.side_effect = _write_multi_outputs
+
+    result = graphviz.backend.pipe_multi('dot', ['svg', 'png', 'svg'], b'graph { spam }',
+                                         quiet=quiet)
+
+    assert result == {'svg': b'out.0', 'png': b'out.1'}
+    mock_run.assert_called_once_with([_common.EXPECTED_DOT_BINARY, '-Kdot',
+                                      '-Tsvg', mocker.ANY, '-Tpng', mocker.ANY],
+                                     input=b'graph { spam }',
+                                     capture_output=True,
+                                     startupinfo=_common.StartupinfoMatcher())
+
+
+@pytest.mark.parametrize(
+    'formats, kwargs, exception, match',
+    [([], {}, graphviz.RequiredArgumentError, r'at least one format'),
+     (['svg', 'spam'], {}, ValueError, r'unknown format'),
+     (['svg', 'png'], {'outfiles': ['spam.svg']}, ValueError, r'must match')])
+def test_dot_command_multi_invalid(formats, kwargs, exception, match):
+    with pytest.raises(exception, match=match):
+        graphviz.backend.dot_command.command('dot', formats, **kwargs)
+
+
+@pytest.mark.exe
+def test_pipe_multi():
+    result = graphviz.backend.pipe_multi('dot', ['svg', 'plain'], b'graph { spam }')
+
+    assert list(result) == ['svg', 'plain']
+    assert re.match(SVG_PATTERN, result['svg'].decode('ascii'))
+    assert result['plain'].startswith(b'graph ')
+
+
+def _write_batch_outputs(*names, returncode=0, stderr=b''):
+    def run(cmd, *, cwd, **kwargs):
+        for i, name in enumerate(names):
+            (pathlib.Path(cwd) / name).write_bytes(f'out{i}'.encode('ascii'))
+        return subprocess.CompletedProcess(cmd, returncode=returncode,
+                                           stdout=b'', stderr=stderr)
+
+    return run
+
+
+def test_pipe_batch_mocked(mocker, mock_run, quiet):
+    mock_run.side_effect = _write_batch_outputs('noname.gv.2.png', 'noname.gv.png')
+
+    assert graphviz.backend.pipe_batch('dot', 'png', [b'graph { spam }',
+                                                      b'graph { eggs }\n'],
+                                       quiet=quiet) == [b'out1', b'out0']
+
+    mock_run.assert_called_once_with([_common.EXPECTED_DOT_BINARY,
+                                      '-Kdot', '-Tpng', '-O'],
+                                     input=b'graph { spam }\ngraph { eggs }\n',
+                                     capture_output=True,
+                                     cwd=mocker.ANY,
+                                     startupinfo=_common.StartupinfoMatcher())
+
+
+@pytest.mark.parametrize(
+    'stderr, expected_index',
+    [(b'Error: <stdin>: syntax error in line 3 near \'}\'\n', 1),
+     (b'Warning: <stdin>: spam in line 1\n'
+      b'Error: <stdin>: syntax error in line 3 near \'}\'\n', 1),
+     (b'Error: spam\n', 1),
+     (b'', 1)])
+def test_pipe_batch_error_mocked(mock_run, stderr, expected_index):
+    mock_run.side_effect = _write_batch_outputs('noname.gv.svg',
+                                                returncode=1, stderr=stderr)
+
+    with pytest.raises(graphviz.BatchError, match=r'input index: 1') as e:
+        graphviz.backend.pipe_batch('dot', 'svg', [b'graph { spam }',
+                                                   b'graph {\n-- }',
+                                                   b'graph { eggs }'],
+                                    quiet=True)
+
+    assert isinstance(e.value, graphviz.CalledProcessError)
+    assert e.value.returncode == 1
+    assert e.value.index == expected_index
+    assert e.value.results == [b'out0', None, b'out0']
+
+
+def test_pipe_batch_error_retry_mocked(mocker, mock_run):
+    error = b'Error: <stdin>: syntax error in line 3 near \'}\'\n'
+    runs = iter([_write_batch_outputs('noname.gv.svg', returncode=1, stderr=error),
+                 _write_batch_outputs('noname.gv.svg', 'noname.gv.2.svg')])
+    mock_run.side_effect = lambda *args, **kwargs: next(runs)(*args, **kwargs)
+
+    with pytest.raises(graphviz.BatchError, match=r'input index: 1') as e:
+        graphviz.backend.pipe_batch('dot', 'svg', [b'graph { spam }',
+                                                   b'graph {\n-- }',
+                                                   b'graph { eggs }',
+                                                   b'graph { ham }'],
+                                    quiet=True)
+
+    assert e.value.results == [b'out0', None, b'out0', b'out1']
+    assert mock_run.call_count == 2
+    assert mock_run.call_args.kwargs['input'] == b'graph { eggs }\ngraph { ham }\n'
+
+
+def test_pipe_batch_missing_output_mocked(mock_run):
+    mock_run.side_effect = _write_batch_outputs('noname.gv.svg')
+
+    with pytest.raises(ValueError, match=r'index 1'):
+        graphviz.backend.pipe_batch('dot', 'svg', [b'graph { spam }', b''])
+
+
+@pytest.mark.exe
+def test_pipe_batch(quiet, format_='plain'):
+    results = graphviz.backend.pipe_batch('dot', format_, [b'graph { spam }',
+                                                           b'digraph { eggs }'])
+
+    assert [r.splitlines()[1].split()[:2] for r in results] == [[b'node', b'spam'],
+                                                                [b'node', b'eggs']]
+
+    with pytest.raises(graphviz.BatchError) as e:
+        graphviz.backend.pipe_batch('dot', format_, [b'graph { spam }',
+                                                     b'graph {\n -- \n}',
+                                                     b'graph { eggs }'],
+                                    quiet=quiet)
+
+    assert e.value.index == 1
+    assert e.value.results[0].startswith(b'graph ')
@@ -242,3 +242,117 @@ def test_get_format_raises(outfile_name, expected_exception, match):
 
     with pytest.raises(expected_exception, match=match):
         rendering.get_format(outfile, format=None)
+
+
+def _write_rendered(*, failing=(), returncode=0, stderr=None):
+    def run(cmd, *, cwd, **kwargs):
+        names = cmd[cmd.index('-O') + 1:]
+        for name in names:
+            if name not in failing:
+                (cwd / f'{name}.svg').write_text(f'rendered {name}')
+        errors = b''.join(b'Error: %s: syntax error in line 1\n' % n.encode()
+                          for n in names if n in failing)
+        return subprocess.CompletedProcess(cmd, returncode=returncode, stdout=b'',
+                                           stderr=stderr if stderr is not None else errors)
+
+    return run
+
+
+def test_render_batch_mocked(mocker, tmp_path, mock_run):
+    (tmp_path / 'sub').mkdir()
+    filepaths = [tmp_path / 'spam.gv', tmp_path / 'sub' / 'spam.gv', tmp_path / 'eggs.gv']
+    mock_run.side_effect = _write_rendered()
+
+    result = rendering.render_batch('dot', 'svg', filepaths, quiet=True)
+
+    assert result == [f'{f}.svg' for f in filepaths]
+    assert mock_run.call_args_list == [
+        mocker.call([_common.EXPECTED_DOT_BINARY, '-Kdot', '-Tsvg', '-O',
+                     'spam.gv', 'eggs.gv'],
+                    cwd=tmp_path, capture_output=True,
+                    startupinfo=_common.StartupinfoMatcher()),
+        mocker.call([_common.EXPECTED_DOT_BINARY, '-Kdot', '-Tsvg', '-O',
+                     'spam.gv'],
+                    cwd=tmp_path / 'sub', capture_output=True,
+                    startupinfo=_common.StartupinfoMatcher())]
+
+
+def test_render_batch_chunks_mocked(mocker, tmp_path, mock_run):
+    mocker.patch.object(rendering, 'get_max_args_length', autospec=True,
+                        return_value=100)
+    filepaths = [tmp_path / f'{i:03d}.gv' for i in range(12)]
+    mock_run.side_effect = _write_rendered()
+
+    result = rendering.render_batch('dot', 'svg', filepaths)
+
+    assert result == [f'{f}.svg' for f in filepaths]
+    chunks = [c.args[0][4:] for c in mock_run.call_args_list]
+    assert len(chunks) > 1
+    assert [name for chunk in chunks for name in chunk] == [f.name for f in filepaths]
+
+
+def test_render_batch_failed_mocked(tmp_path, mock_run):
+    filepaths = [tmp_path / 'spam.gv', tmp_path / 'eggs.gv', tmp_path / 'ham.gv']
+    mock_run.side_effect = _write_rendered(failing=['eggs.gv'], returncode=1)
+
+    with pytest.raises(graphviz.BatchError, match=r'input index: 1') as e:
+        rendering.render_batch('dot', 'svg', filepaths, quiet=True)
+
+    assert e.value.returncode == 1
+    assert b'eggs.gv' in e.value.stderr
+    assert e.value.results == [f'{filepaths[0]}.svg', None, f'{filepaths[2]}.svg']
+
+
+def test_render_batch_failed_stale_outfile_mocked(tmp_path, mock_run):
+    filepaths = [tmp_path / 'spam.gv', tmp_path / 'eggs.gv']
+    stale = tmp_path / 'eggs.gv.svg'
+    stale.write_text('stale')
+    mock_run.side_effect = _write_rendered(failing=['eggs.gv'], returncode=-11, stderr=b'')
+
+    with pytest.raises(graphviz.BatchError, match=r'input index: 1') as e:
+        rendering.render_batch('dot', 'svg', filepaths, quiet=True)
+
+    assert e.value.results == [f'{filepaths[0]}.svg', None]
+    assert not stale.exists()
+
+
+def test_render_multi_mocked(mocker, tmp_path, mock_run):
+    filepath = tmp_path / 'spam.gv'
+
+    def run(cmd, *, cwd, **kwargs):
+        for flag in cmd[2:-2]:
+            (cwd / f'spam.gv.{flag[2:]}').write_text('rendered')
+        return subprocess.CompletedProcess(cmd, returncode=0, stdout=b'', stderr=b'')
+
+    mock_run.side_effect = run
+
+    result = rendering.render_multi('dot', ['svg', 'png'], filepath)
+
+    assert result == [f'{filepath}.svg', f'{filepath}.png']
+    assert all(os.path.exists(r) for r in result)
+    mock_run.assert_called_once_with([_common.EXPECTED_DOT_BINARY, '-Kdot',
+                                      '-Tsvg', '-Tpng', '-O', 'spam.gv'],
+                                     cwd=tmp_path, capture_output=True,
+                                     startupinfo=_common.StartupinfoMatcher())
+
+    with pytest.raises(graphviz.FileExistsError, match=r'output file exists'):
+        rendering.render_multi('dot', ['svg'], filepath, raise_if_result_exists=True)
+
+
+def test_iter_arg_chunks():
+    assert list(rendering.iter_arg_chunks(['spam', 'eggs', 'ham'],
+                                          max_length=26)) == [['spam', 'eggs'], ['ham']]
+
+
+@pytest.mark.exe
+def test_render_batch(tmp_path, quiet):
+    filepaths = [tmp_path / 'spam.gv', tmp_path / 'eggs.gv', tmp_path / 'ham.gv']
+    for path, source in zip(filepaths, ['graph { spam }', 'graph { -- }', 'graph { ham }']):
+        path.write_text(source)
+
+    with pytest.raises(graphviz.BatchError) as e:
+        rendering.render_batch('dot', 'svg', filepaths, quiet=quiet)
+
+    assert e.value.index == 1
+    assert e.value.results == [f'{filepaths[0]}.svg', None, f'{filepaths[2]}.svg']
+    assert pathlib.Path(e.value.results[2]).read_text().startswith('<?xml')
@@ -1,3 +1,5 @@
+import asyncio
+import hashlib
 import locale
 import pathlib
 import re
@@ -47,6 +49,19 @@ def test_str(dot):
     assert str(dot) == dot.source
 
 
+def test_fingerprint(dot):
+    expected = hashlib.blake2b(dot.source.encode('utf-8'), digest_size=32).hexdigest()
+    assert dot.fingerprint() == expected == dot.fingerprint()
+    assert dot.copy().fingerprint() == expected
+
+    with_parameters = dot.fingerprint(parameters=True)
+    assert with_parameters != expected
+
+    dot.format = 'svg'
+    assert dot.fingerprint(parameters=True) != with_parameters
+    assert dot.fingerprint() == expected
+
+
 @pytest.mark.parametrize(
     'parameter, expected_exception, match',
     [('engine', ValueError, r'unknown engine'),
@@ -365,6 +380,18 @@ def test_repr_mimebundle_image_jpeg_mocked(mocker, dot):
     mock_pipe.assert_called_once_with(format='jpeg')
 
 
+def test_repr_mimebundle_multi_mocked(mocker, dot):
+    mock_pipe_multi = mocker.patch.object(dot, 'pipe_multi', autospec=True,
+                                          return_value={'png': b'PNG',
+                                                        'svg': b'<svg/>\r\n'})
+
+    assert dot._repr_mimebundle_({'image/svg+xml', 'image/png'}) == {'image/png': b'PNG',
+                                                                     'image/svg+xml': '<svg/>\n'}
+
+    mock_pipe_multi.assert_called_once_with(mocker.ANY)
+    assert list(mock_pipe_multi.call_args.args[0]) == ['png', 'svg']
+
+
 @pytest.mark.exe
 def test_unflatten(cls, dot):
     result = dot.unflatten()
@@ -426,3 +453,276 @@ def test__view_mocked(mocker, sentinel, mock_platform, dot):
     assert dot._view(sentinel.name, format='png', **kwargs) is None
 
     _view_platform.assert_called_once_with(sentinel.name, **kwargs)
+
+
+def test_pipe_many_mocked(mocker, dot):
+    mock_pipe_batch = mocker.patch('graphviz.backend.pipe_batch', autospec=True,
+                                   return_value=[b'spam', b'eggs', b'ham'])
+    other = dot.copy()
+    other.format = 'svg'
+
+    assert graphviz.pipe_many([dot, other, dot], format='png', quiet=True,
+                              encoding='ascii') == ['spam', 'eggs', 'ham']
+
+    mock_pipe_batch.assert_called_once_with('dot', 'png', [dot.encoded_source,
+                                                           other.encoded_source,
+                                                           dot.encoded_source],
+                                            renderer=None, formatter=None,
+                                            neato_no_op=None, quiet=True)
+
+
+def test_pipe_many_groups_by_parameters_mocked(mocker, dot):
+    error = graphviz.BatchError(1, ['dot'], index=0, results=[None])
+    mock_pipe_batch = mocker.patch('graphviz.backend.pipe_batch', autospec=True,
+                                   side_effect=[[b'spam', b'eggs'], error])
+    other = dot.copy()
+    other.engine = 'neato'
+
+    with pytest.raises(graphviz.BatchError) as e:
+        graphviz.pipe_many([dot, other, dot])
+
+    assert e.value is error
+    assert e.value.index == 1
+    assert e.value.results == [b'spam', None, b'eggs']
+    assert [c.args[:2] for c in mock_pipe_batch.call_args_list] == [('dot', 'pdf'),
+                                                                    ('neato', 'pdf')]
+
+
+def test_pipe_many_continues_after_batch_error_mocked(mocker, dot):
+    error = graphviz.BatchError(1, ['dot'], index=1, results=[b'spam', None])
+    mocker.patch('graphviz.backend.pipe_batch', autospec=True,
+                 side_effect=[error, [b'eggs']])
+    other = dot.copy()
+    other.engine = 'neato'
+
+    with pytest.raises(graphviz.BatchError) as e:
+        graphviz.pipe_many([dot, other, dot])
+
+    assert e.value is error
+    assert e.value.index == 2
+    assert e.value.results == [b'spam', b'eggs', None]
+
+
+def test_render_many_mocked(mocker, tmp_path, dot):
+    mock_render_batch = mocker.patch('graphviz.backend.render_batch', autospec=True,
+                                     side_effect=lambda _, format, filepaths, **kwargs:
+                                     [f'{f}.{format}' for f in filepaths])
+    other = dot.copy()
+    other.filename = 'other.gv'
+    other.engine = 'neato'
+    dot.directory = other.directory = tmp_path
+
+    result = graphviz.render_many([dot, other], format='png')
+
+    assert result == [f'{dot.filepath}.png', f'{other.filepath}.png']
+    assert pathlib.Path(dot.filepath).read_text(encoding='utf-8') == dot.source
+    assert mock_render_batch.call_args_list == [
+        mocker.call('dot', 'png', [dot.filepath], renderer=None, formatter=None,
+                    neato_no_op=None, quiet=False),
+        mocker.call('neato', 'png', [other.filepath], renderer=None, formatter=None,
+                    neato_no_op=None, quiet=False)]
+
+
+def test_render_many_continues_after_batch_error_mocked(mocker, tmp_path, dot):
+    error = graphviz.BatchError(1, ['dot'], index=0, results=[None])
+    mock_render_batch = mocker.patch('graphviz.backend.render_batch', autospec=True,
+                                     side_effect=[error, ['other.gv.png']])
+    other = dot.copy()
+    other.filename = 'other.gv'
+    other.engine = 'neato'
+    dot.directory = other.directory = tmp_path
+
+    with pytest.raises(graphviz.BatchError) as e:
+        graphviz.render_many([dot, other], format='png')
+
+    assert e.value is error
+    assert e.value.index == 0
+    assert e.value.results == [None, 'other.gv.png']
+    assert mock_render_batch.call_count == 2
+
+
+def test_render_many_same_filepath(mocker, dot):
+    mock_render_batch = mocker.patch('graphviz.backend.render_batch', autospec=True)
+
+    with pytest.raises(ValueError, match=r'different filepath'):
+        graphviz.render_many([dot, dot.copy()])
+
+    mock_render_batch.assert_not_called()
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_pipe_parallel_mocked(mock_pipe_lines, dot, ordered):
+    mock_pipe_lines.side_effect = [b'spam', graphviz.CalledProcessError(1, ['dot'])]
+
+    results = dict(graphviz.pipe_parallel([dot, dot.copy()], 1, ordered=ordered,
+                                          format='svg', quiet=True))
+
+    assert results[0] == b'spam'
+    assert isinstance(results[1], graphviz.CalledProcessError)
+    assert mock_pipe_lines.call_count == 2
+    assert mock_pipe_lines.call_args.args[:2] == (dot.engine, 'svg')
+    assert mock_pipe_lines.call_args.kwargs['quiet'] is True
+
+
+def test_render_parallel_mocked(mocker, mock_render, dot):
+    mock_save = mocker.patch.object(dot, 'save', autospec=True, return_value='spam.gv')
+
+    results = list(graphviz.render_parallel([dot], format='svg'))
+
+    assert results == [(0, mock_render.return_value)]
+    mock_save.assert_called_once_with(None, directory=None, skip_existing=None)
+    mock_render.assert_called_once_with(dot.engine, 'svg', 'spam.gv',
+                                        renderer=None, formatter=None,
+                                        neato_no_op=None, quiet=False,
+                                        outfile=None,
+                                        raise_if_result_exists=False,
+                                        overwrite_filepath=False)
+
+
+def test_pipe_to_mocked(mocker, dot, chunk_size=4):
+    mock_pipe_lines_to = mocker.patch('graphviz.backend.piping.pipe_lines_to',
+                                      autospec=True)
+    sink = bytearray()
+
+    assert dot.pipe_to(sink, format='svg', chunk_size=chunk_size) is None
+
+    mock_pipe_lines_to.assert_called_once_with(dot.engine, 'svg', mocker.ANY, sink,
+                                               input_encoding=dot.encoding,
+                                               chunk_size=chunk_size,
+                                               renderer=None, formatter=None,
+                                               neato_no_op=None, quiet=False)
+    _, _, lines, _ = mock_pipe_lines_to.call_args.args
+    assert list(lines) == dot.source.splitlines(keepends=True)
+
+
+def test_pipe_multi_mocked(mocker, dot):
+    mock_pipe_multi = mocker.patch('graphviz.backend.piping.pipe_multi', autospec=True)
+
+    assert dot.pipe_multi(['svg', 'png', 'svg'],
+                          engine='neato') is mock_pipe_multi.return_value
+
+    mock_pipe_multi.assert_called_once_with('neato', ['svg', 'png'],
+                                            dot.source.encode(dot.encoding),
+                                            renderer=None, formatter=None,
+                                            neato_no_op=None, quiet=False)
+
+
+def test_pipe_multi_invalid_format(dot):
+    with pytest.raises(ValueError, match=r'unknown format'):
+        dot.pipe_multi(['svg', 'spam'])
+
+
+def test_pipe_iter_mocked(mocker, dot):
+    mock_pipe_lines_iter = mocker.patch('graphviz.backend.piping.pipe_lines_iter',
+                                        autospec=True)
+
+    assert dot.pipe_iter(quiet=True) is mock_pipe_lines_iter.return_value
+
+    mock_pipe_lines_iter.assert_called_once_with(dot.engine, dot.format, mocker.ANY,
+                                                 input_encoding=dot.encoding,
+                                                 chunk_size=2**16,
+                                                 renderer=None, formatter=None,
+                                                 neato_no_op=None, quiet=True)
+
+
+@pytest.mark.parametrize(
+    'encoding', [None, 'ascii', 'utf-8'])
+def test_pipe_async_mocked(mocker, dot, encoding):
+    mock_lines = mocker.patch('graphviz.backend.piping.pipe_lines_async', autospec=True)
+    mock_string = mocker.patch('graphviz.backend.piping.pipe_lines_string_async',
+                               autospec=True)
+    mock_lines.return_value = b'spam'
+
+    result = asyncio.run(dot.pipe_async(format='svg', encoding=encoding))
+
+    expected_kwargs = {'quiet': False,
+                       'renderer': None,
+                       'formatter': None,
+                       'neato_no_op': None}
+
+    if encoding == dot.encoding:
+        assert result is mock_string.return_value
+        mock_string.assert_awaited_once_with(dot.engine, 'svg', mocker.ANY,
+                                             encoding=encoding, **expected_kwargs)
+        return
+
+    assert result == (b'spam' if encoding is None else 'spam')
+    mock_lines.assert_awaited_once_with(dot.engine, 'svg', mocker.ANY,
+                                        input_encoding=dot.encoding,
+                                        **expected_kwargs)
+    _, _, lines = mock_lines.call_args.args
+    assert list(lines) == dot.source.splitlines(keepends=True)
+
+
+def test_pipe_async_called_process_error_mocked(mocker, dot, encoding='ascii'):
+    mock_lines = mocker.patch('graphviz.backend.piping.pipe_lines_async', autospec=True)
+    mock_lines.side_effect = graphviz.CalledProcessError(1, _common.INVALID_CMD,
+                                                         b'', b'fake syntax error')
+
+    with pytest.raises(graphviz.CalledProcessError, match=r'fake syntax error') as info:
+        asyncio.run(dot.pipe_async(encoding=encoding))
+
+    assert info.value.stderr == 'fake syntax error'
+
+
+def test_render_async_mocked(mocker, dot):
+    mock_render = mocker.patch('graphviz.backend.rendering.render_async', autospec=True)
+    mock_save = mocker.patch.object(dot, 'save', autospec=True)
+    mock_remove = mocker.patch('os.remove', autospec=True)
+
+    result = asyncio.run(dot.render_async(cleanup=True, format='svg'))
+
+    assert result is mock_render.return_value
+    mock_save.assert_called_once_with(None, directory=None, skip_existing=None)
+    mock_render.assert_awaited_once_with(dot.engine, 'svg',
+                                         mock_save.return_value,
+                                         renderer=None, formatter=None,
+                                         neato_no_op=None,
+                                         outfile=None,
+                                         raise_if_result_exists=False,
+                                         overwrite_filepath=False,
+                                         quiet=False)
+    mock_remove.assert_called_once_with(mock_save.return_value)
+
+
+def test_render_multi_mocked(mocker, dot):
+    mock_render_multi = mocker.patch('graphviz.backend.rendering.render_multi',
+                                     autospec=True)
+    mock_save = mocker.patch.object(dot, 'save', autospec=True)
+    mock_remove = mocker.patch('os.remove', autospec=True)
+
+    result = dot.render_multi(['svg', 'png', 'svg'], 'spam.gv', engine='neato', cleanup=True)
+
+    assert result is mock_render_multi.return_value
+    mock_save.assert_called_once_with('spam.gv', directory=None, skip_existing=None)
+    mock_render_multi.assert_called_once_with('neato', ['svg', 'png'],
+                                              mock_save.return_value,
+                                              renderer=None, formatter=None,
+                                              neato_no_op=None,
+                                              raise_if_result_exists=False,
+                                              quiet=False)
+    mock_remove.assert_called_once_with(mock_save.return_value)
+
+
+def test_render_multi_invalid_format(mocker, dot):
+    mock_save = mocker.patch.object(dot, 'save', autospec=True)
+
+    with pytest.raises(ValueError, match=r'unknown format'):
+        dot.render_multi(['svg', 'spam'])
+
+    mock_save.assert_not_called()
+
+
+def test_unflatten_async_mocked(mocker, dot):
+    mock_unflatten = mocker.patch('graphviz.backend.unflattening.unflatten_async',
+                                  autospec=True)
+    mock_unflatten.return_value = 'graph { spam }'
+
+    result = asyncio.run(dot.unflatten_async(stagger=3))
+
+    assert type(result) is graphviz.Source
+    assert result.source == 'graph { spam }\n'
+    assert result.engine == dot.engine
+    assert result.encoding == dot.encoding
+    mock_unflatten.assert_awaited_once_with(dot.source, stagger=3, fanout=False,
+                                            chain=None, encoding=dot.encoding)
@@ -0,0 +1,161 @@
+import array
+import json
+import math
+
+import pytest
+
+import graphviz
+from graphviz import columns
+
+import _common
+
+EDGE_POS = 'e,27,36.104 27,71.697 27,63.983 27,54.712 27,46.112'
+
+LAYOUT_JSON = json.dumps({'name': '%3', 'directed': True, 'bb': '0,0,54,108',
+                          '_subgraph_cnt': 1,
+                          'objects': [{'_gvid': 0, 'name': 'cluster_spam',
+                                       'bb': '8,8,46,100', 'nodes': [1, 2]},
+                                      {'_gvid': 1, 'name': 'spam', 'pos': '27,90',
+                                       'width': '0.75', 'height': '0.5'},
+                                      {'_gvid': 2, 'name': 'eggs "ham"', 'pos': '27,18',
+                                       'width': '1.5', 'height': '0.5'}],
+                          'edges': [{'_gvid': 0, 'tail': 1, 'head': 2, 'pos': EDGE_POS},
+                                    {'_gvid': 1, 'tail': 2, 'head': 2}]},
+                         indent=2)
+
+LAYOUT_PLAIN = ('graph 1 0.75 1.5\n'
+                'node spam 0.375 1.25 0.75 0.5 spam solid ellipse black lightgrey\n'
+                'node "eggs \\"ham\\"" 0.375 0.25 1.5 0.5 "eggs \\"ham\\"" solid ellipse'
+                ' black lightgrey\n'
+                'edge spam:s "eggs \\"ham\\"":n 4 0.375 0.99 0.375 0.88 0.375 0.76'
+                ' 0.375 0.65 solid black\n'
+                'edge "eggs \\"ham\\"" "eggs \\"ham\\"" 1 0.375 0.5 label 1 1 solid black\n'
+                'stop\n')
+
+
+@pytest.mark.parametrize(
+    'data', [LAYOUT_JSON, LAYOUT_JSON.encode('utf-8'),
+             _common.chunked(LAYOUT_JSON, 1), _common.chunked(LAYOUT_JSON, 7)])
+def test_layout_columns_from_json(data):
+    result = columns.LayoutColumns.from_json(data)
+
+    assert repr(result) == '<LayoutColumns nodes=2 edges=2 points=4>'
+    assert result.bb == (0.0, 0.0, 54.0, 108.0)
+    assert result.names == ['spam', 'eggs "ham"']
+    assert result.x == array.array('d', [27.0, 27.0])
+    assert result.y == array.array('d', [90.0, 18.0])
+    assert result.width == array.array('d', [0.75, 1.5])
+    assert result.height == array.array('d', [0.5, 0.5])
+    assert result.tails == array.array('q', [0, 1])
+    assert result.heads == array.array('q', [1, 1])
+    assert result.offsets == array.array('q', [0, 4, 4])
+    assert result.points_x == array.array('d', [27.0] * 4)
+    assert result.points_y == array.array('d', [71.697, 63.983, 54.712, 46.112])
+
+
+def test_layout_columns_from_json_without_pos():
+    result = columns.LayoutColumns.from_json('{"objects": [{"_gvid": 0, "name": "spam"}]}')
+
+    assert result.names == ['spam']
+    assert math.isnan(result.x[0]) and math.isnan(result.width[0])
+    assert result.bb is None
+
+
+@pytest.mark.parametrize(
+    'data, match',
+    [('', r"expected '{'"),
+     ('[]', r"expected '{'"),
+     ('{"objects": [{"name": "spam"}', r'invalid JSON'),
+     ('{"objects": [{"_gvid": 0}]}', r"invalid JSON layout output 'objects'"),
+     ('{"edges": [{"tail": 0, "head": 1}]}', r'unknown node'),
+     ('{"bb": "0,0"}', r'values to unpack')])
+def test_layout_columns_from_json_invalid(data, match):
+    with pytest.raises(ValueError, match=match):
+        columns.LayoutColumns.from_json(data)
+
+
+@pytest.mark.parametrize(
+    'data', [LAYOUT_PLAIN, _common.chunked(LAYOUT_PLAIN, 5)])
+def test_layout_columns_from_plain(data):
+    result = columns.LayoutColumns.from_plain(data)
+
+    assert result.bb == (0.0, 0.0, 54.0, 108.0)
+    assert result.names == ['spam', 'eggs "ham"']
+    assert result.x == array.array('d', [27.0, 27.0])
+    assert result.y == array.array('d', [90.0, 18.0])
+    assert result.width == array.array('d', [0.75, 1.5])
+    assert result.tails == array.array('q', [0, 1])
+    assert result.heads == array.array('q', [1, 1])
+    assert result.offsets == array.array('q', [0, 4, 5])
+    assert len(result.points_y) == 5
+    assert result.points_y[-1] == pytest.approx(36.0)
+
+
+def test_layout_columns_from_plain_html_label():
+    data = ('graph 1 1 1\n'
+            'node spam 0.5 0.5 1 0.5 <b>Spam and Eggs</b> solid box black lightgrey\n'
+            'stop\n')
+
+    result = columns.LayoutColumns.from_plain(data)
+
+    assert result.names == ['spam']
+    assert result.x == array.array('d', [36.0])
+
+
+@pytest.mark.parametrize(
+    'line', ['spam 1 2 3\n', 'node spam 1\n', 'edge spam eggs 1 2 3\n',
+             'edge spam spam 2 1 1 1\n'])
+def test_layout_columns_from_plain_invalid(line):
+    data = 'graph 1 1 1\nnode spam 1 1 1 1 spam solid ellipse black lightgrey\n' + line
+
+    with pytest.raises(ValueError, match=r'invalid plain layout output line 3'):
+        columns.LayoutColumns.from_plain(data)
+
+
+def test_layout_columns_to_numpy():
+    numpy = pytest.importorskip('numpy')
+    result = columns.LayoutColumns.from_json(LAYOUT_JSON)
+
+    arrays = result.to_numpy()
+
+    assert arrays['x'].dtype == numpy.float64
+    assert arrays['offsets'].tolist() == [0, 4, 4]
+    assert numpy.shares_memory(arrays['points_y'], result.points_y)
+
+
+@pytest.mark.parametrize(
+    'format_, data', [('json0', LAYOUT_JSON), ('plain-ext', LAYOUT_PLAIN)])
+def test_layout_columns_mocked(mocker, format_, data):
+    mock_pipe_lines_iter = mocker.patch('graphviz.backend.piping.pipe_lines_iter',
+                                        autospec=True,
+                                        return_value=_common.chunked(data, 16))
+    dot = graphviz.Digraph()
+    dot.edge('spam', 'eggs "ham"')
+
+    result = dot.layout_columns(format_, engine='neato', quiet=True)
+
+    assert result.names == ['spam', 'eggs "ham"']
+    mock_pipe_lines_iter.assert_called_once_with('neato', format_, mocker.ANY,
+                                                 input_encoding=dot.encoding,
+                                                 renderer=None, formatter=None,
+                                                 neato_no_op=None, quiet=True,
+                                                 chunk_size=mocker.ANY)
+
+
+def test_layout_columns_invalid_format():
+    with pytest.raises(ValueError, match=r'unknown layout output format'):
+        graphviz.Graph().layout_columns('svg')
+
+
+@pytest.mark.exe
+def test_layout_columns():
+    dot = graphviz.Digraph()
+    dot.edges(['AB', 'AC'])
+
+    for format_ in ('json0', 'xdot_json', 'plain'):
+        result = dot.layout_columns(format_)
+
+        assert result.names == ['A', 'B', 'C']
+        assert list(result.tails) == [0, 0]
+        assert list(result.heads) == [1, 2]
+        assert len(result.offsets) == 3
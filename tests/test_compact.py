@@ -0,0 +1,146 @@
+import pickle
+
+import pytest
+
+import graphviz
+from graphviz import compact
+
+BASE_GRAPHS = [graphviz.Graph, graphviz.Digraph]
+
+
+@pytest.fixture(params=BASE_GRAPHS)
+def cls(request):
+    return request.param
+
+
+def build(dot):
+    dot.attr('node', shape='box')
+    dot.node('A', 'King Arthur')
+    dot.edge('A', 'B')
+    dot.edges(['AB', 'BC'])
+    dot.edges(['spam eggs', 'A:n'], ['B', graphviz.nohtml('<>')])
+    dot.edge('A', 'C', color='red')
+    dot.edges(['A', 'B'], ['C', 'C'], color=['red', None])
+    dot.edge('C', '<>')
+    dot.body.append('\t// verbatim\n')
+    return dot
+
+
+def test_compact_source(cls):
+    expected = build(cls())
+    dot = build(cls(storage='compact'))
+
+    assert isinstance(dot.body, compact.CompactList)
+    assert dot.source == expected.source
+    assert dot.body == expected.body
+    assert len(dot.body) == len(expected.body)
+    assert [dot.body[i] for i in range(-len(expected.body), len(expected.body))] \
+        == expected.body * 2
+    assert dot.body[2:5] == expected.body[2:5]
+
+    with pytest.raises(IndexError):
+        dot.body[len(expected.body)]
+
+
+def test_compact_symbols(cls):
+    dot = cls(storage='compact')
+    dot.edges([('A', 'B'), ('B', 'A'), ('A', 'B')])
+    assert len(dot.body.symbols) == 2
+
+    dot.clear()
+    assert not dot.body
+    assert len(dot.body.symbols) == 0
+
+
+def test_compact_memory_usage(cls, n=10_000):
+    dot = cls(storage='compact')
+    dot.edges((f'node{i % 100}', f'node{i % 99}') for i in range(n))
+
+    lines = list(dot.body)
+    assert dot.body.memory_usage() < sum(map(len, lines))
+
+
+def test_compact_edges_atomic(cls):
+    dot = cls(storage='compact')
+    dot.edge('A', 'B')
+
+    with pytest.raises(ValueError, match=r'shorter'):
+        dot.edges(['A', 'B'], ['C'])
+    with pytest.raises(ValueError, match=r'unpack'):
+        dot.edges(['BC', 'ABC'])
+
+    assert len(dot.body) == 1
+    assert dot.source == cls(body=[dot.body[0]]).source
+
+
+def test_compact_add_mul(cls):
+    dot = cls(storage='compact')
+    dot.edges(['AB'])
+
+    assert dot.body + [] == list(dot.body) == [dot.body[0]]
+    assert [] + dot.body == 1 * dot.body == dot.body * 1 == [dot.body[0]]
+    assert ''.join(dot.body * 2) == dot.body[0] * 2
+
+
+def test_compact_pickle(cls):
+    dot = build(cls(storage='compact'))
+
+    result = pickle.loads(pickle.dumps(dot))
+
+    assert isinstance(result.body, compact.CompactList)
+    assert result.source == dot.source
+    assert len(result.body) == len(dot.body)
+    assert any(isinstance(i, compact.EdgeBlock) for i in result.body._iteritems())
+    result.edge('A', 'B')
+    assert len(result.body.symbols) == len(dot.body.symbols)
+
+
+def test_compact_copy(cls):
+    dot = cls(storage='compact')
+    dot.edge('A', 'B')
+
+    dup = dot.copy()
+    assert isinstance(dup.body, compact.CompactList)
+    assert dup.__dict__ == dot.__dict__
+
+    dup.edge('B', 'C')
+    assert len(dot.body) == 1
+    assert len(dup.body) == 2
+
+
+@pytest.mark.parametrize('change', [lambda body: body.__setitem__(1, '\tx\n'),
+                                    lambda body: body.__setitem__(slice(1, 3), ['\tx\n']),
+                                    lambda body: body.__delitem__(-2),
+                                    lambda body: body.__delitem__(slice(None, None, 2)),
+                                    lambda body: body.insert(1, '\tx\n'),
+                                    lambda body: body.insert(-9, '\tx\n'),
+                                    lambda body: body.insert(9, '\tx\n'),
+                                    lambda body: body.pop(),
+                                    lambda body: body.pop(1),
+                                    lambda body: body.remove(body[-1]),
+                                    lambda body: body.clear(),
+                                    lambda body: body.sort(),
+                                    lambda body: body.reverse(),
+                                    lambda body: body.__imul__(2),
+                                    lambda body: body.__imul__(0)])
+def test_compact_list_change(cls, change):
+    expected = cls()
+    dot = cls(storage='compact')
+    for d in (expected, dot):
+        d.edges(['AB', 'AC'])
+        d.node('D')
+        d.edges(['BC'])
+    expected = list(expected.body)
+
+    assert dot.body == expected
+    assert ('\tD\n' in dot.body, dot.body.index(expected[2]),
+            dot.body.count(expected[0])) == (True, 2, 1)
+
+    change(dot.body)
+    change(expected)
+    assert dot.body == expected and len(dot.body) == len(expected)
+    assert [dot.body[i] for i in range(len(expected))] == expected
+
+    dot.edge('C', 'D')
+    assert dot.body[-1] == dot._edge_plain(tail='C', head='D')
+    assert len(dot.body) == len(expected) + 1
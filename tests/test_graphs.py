@@ -1,4 +1,6 @@
+import hashlib
 import itertools
+import pickle
 
 import pytest
 
@@ -83,7 +85,7 @@ def test_clear(cls, keep_attrs):
 
 def test_iter_subgraph_strict(cls):
     with pytest.raises(ValueError, match=r'strict'):
-        cls().subgraph(cls(strict=True))
+        cls().subgraph(cls(strict=True), by_reference=True)
 
 
 @pytest.mark.parametrize(
@@ -145,6 +147,78 @@ def test_subgraph_graph_none(cls, expected):
     assert dot.source == expected
 
 
+@pytest.mark.parametrize('storage', ['lines', 'records', 'compact'])
+def test_subgraph_graph_none_does_not_copy_content(mocker, cls, storage):
+    dot = cls(graph_attr={'rankdir': 'LR'}, storage=storage)
+    dot.edge('A', 'B')
+    copy_kwargs = mocker.spy(graphviz.dot.Dot, '_copy_kwargs')
+
+    with dot.subgraph(name='cluster_spam') as child:
+        assert child.body == []
+        assert child.graph_attr == {}
+        assert type(child.body) is type(dot.body)
+
+    copy_kwargs.assert_not_called()
+    assert dot.source.count('cluster_spam') == 1
+
+
+@pytest.mark.parametrize('storage', ['lines', 'records', 'compact'])
+def test_subgraph_reference(cls, storage):
+    inner = cls(name='cluster_inner')
+    inner.edge('A', 'B')
+    middle = cls(name='cluster_middle')
+    middle.subgraph(inner, by_reference=True)
+    snapshot = cls(storage=storage)
+    snapshot.subgraph(middle)
+    dot = cls(storage=storage)
+    dot.subgraph(middle, by_reference=True)
+
+    assert dot.source == snapshot.source
+    assert dot.source.splitlines()[2:5] == ['\t\tsubgraph cluster_inner {',
+                                            f'\t\t\tA {"->" if inner.directed else "--"} B',
+                                            '\t\t}']
+    assert dot.body == ['\t// subgraph cluster_middle\n']
+    assert isinstance(dot.body[0], graphviz.dot.SubgraphRef)
+    assert dot.body[0].graph is middle
+    assert all(type(line) is str for line in snapshot.body)
+
+    inner.node('C')
+
+    assert '\t\t\tC\n' in dot
+    assert '\t\t\tC\n' not in snapshot
+
+    dup = pickle.loads(pickle.dumps(dot))
+    assert dup.body[0].graph.source == middle.source and dup.source == dot.source
+
+
+def test_subgraph_reference_reused(cls):
+    child = cls(name='cluster_child')
+    child.node('spam')
+    parents = [cls(), cls()]
+    for p in parents:
+        p.subgraph(child, by_reference=True)
+        with p.subgraph(name='cluster_spam', by_reference=True) as s:
+            s.subgraph(child, by_reference=True)
+
+    assert parents[0].source == parents[1].source
+    assert parents[0].source.count('spam\n') == 2
+
+
+def test_subgraph_reference_cycle(cls):
+    parent = cls()
+    child = cls()
+    parent.subgraph(child, by_reference=True)
+    child.subgraph(parent, by_reference=True)
+
+    with pytest.raises(ValueError, match=r'cycle'):
+        parent.source
+
+
+def test_subgraph_reference_strict(cls):
+    with pytest.raises(ValueError, match=r'strict'):
+        cls().subgraph(cls(strict=True), by_reference=True)
+
+
 def test_subgraph_graph_notsole(cls):
     with pytest.raises(ValueError, match=r'sole'):
         cls().subgraph(cls(), name='spam')
@@ -288,3 +362,196 @@ def test_label_html():
 \tstruct1:f2 -> struct3:here
 }
 '''
+
+
+@pytest.mark.parametrize(
+    'cls, expected',
+    [(graphviz.Graph, 'graph {\n\tA [label="King Arthur" shape=box]\n'
+                      '\t"B C" [shape=box]\n}\n'),
+     (graphviz.Digraph, 'digraph {\n\tA [label="King Arthur" shape=box]\n'
+                        '\t"B C" [shape=box]\n}\n')],
+    ids=lambda p: getattr(p, '__name__', '...'))
+def test_nodes(cls, expected):
+    dot = cls()
+    dot.nodes(iter(['A', 'B C']), label=['King Arthur', None], shape='box')
+    assert dot.source == expected
+
+
+def test_nodes_length_mismatch(cls):
+    with pytest.raises(ValueError, match=r'zip'):
+        cls().nodes(['A', 'B'], label=['spam'])
+
+
+@pytest.mark.parametrize(
+    'args, kwargs',
+    [([['A', 'A', 'B'], ['B', 'C', 'C']], {}),
+     ([[('A', 'B'), ('A', 'C'), ('B', 'C')]], {'constraint': 'false'}),
+     ([['A', 'A', 'B'], ['B', 'C', 'C']],
+      {'label': ['spam eggs', None, 'ham'], 'weight': [1, 2, 3], 'color': 'red'}),
+     ([['A', 'A', 'B'], ['B', 'C', 'C']], {'label': ('spam', 'eggs', 'ham'), 'weight': 2})])
+def test_edges_columns(cls, args, kwargs):
+    expected = cls()
+    columns = {k: v if isinstance(v, (list, tuple)) else [v] * 3 for k, v in kwargs.items()}
+    for tail, head, *values in zip(*args if len(args) == 2 else zip(*args[0]),
+                                   *columns.values()):
+        attrs = {k: str(v) for k, v in zip(columns, values) if v is not None}
+        expected.edge(tail, head, **attrs)
+
+    dot = cls()
+    dot.edges(*args, **kwargs)
+    assert dot.source == expected.source
+
+
+def test_edges_nohtml_not_conflated(cls):
+    dot = cls()
+    dot.edges(['A', 'B'], ['C', 'D'], label=['<>', graphviz.nohtml('<>')])
+    assert dot.body[0].endswith(' [label=<>]\n')
+    assert dot.body[1].endswith(' [label="<>"]\n')
+
+
+@pytest.mark.parametrize('storage', ['lines', 'records', 'compact'])
+def test_nodes_scalar_column(cls, storage):
+    dot = cls(storage=storage)
+    dot.nodes(['A', 'B'], label=['spam', 'eggs'], width=1.5)
+    assert dot.body == ['\tA [label=spam width=1.5]\n', '\tB [label=eggs width=1.5]\n']
+
+
+def test_edges_length_mismatch(cls):
+    with pytest.raises(ValueError, match=r'zip'):
+        cls().edges(['A', 'B'], ['C'])
+
+
+@pytest.mark.parametrize(
+    'change',
+    [lambda d: d.graph_attr.update(rankdir='LR'),
+     lambda d: d.node_attr.update(shape='box'),
+     lambda d: d.edge_attr.update(color='red'),
+     lambda d: setattr(d, 'name', 'spam'),
+     lambda d: setattr(d, 'comment', 'spam'),
+     lambda d: setattr(d, 'strict', True),
+     lambda d: d.body.__setitem__(0, '\tspam\n'),
+     lambda d: d.body.__delitem__(0),
+     lambda d: d.body.insert(0, '\tspam\n'),
+     lambda d: d.body.pop(),
+     lambda d: d.body.reverse(),
+     lambda d: d.clear(),
+     lambda d: d.node('spam'),
+     lambda d: d.edges(['AC']),
+     lambda d: setattr(d, 'body', ['\tspam\n'])])
+@pytest.mark.parametrize('storage', ['lines', 'records', 'compact'])
+def test_source_cache(cls, storage, change):
+    dot = cls(storage=storage)
+    dot.node('A')
+    dot.edges(['AB'])
+    source = dot.source
+    assert (dot.source is source) == (storage != 'records')
+
+    change(dot)
+
+    assert dot.source == ''.join(dot) != source
+
+
+def test_source_cache_append(mocker, cls):
+    dot = cls()
+    dot.node('A')
+    source = dot.source
+    iterfrom = mocker.spy(dot.body, '_iterfrom')
+
+    dot.edge('A', 'B')
+
+    assert dot.source == ''.join(dot) == source[:-2] + dot.body[-1] + '}\n'
+    iterfrom.assert_called_once_with(1)
+
+
+def test_source_cache_records_changed_in_place(cls):
+    dot = cls(storage='records')
+    dot.node('A')
+    assert 'red' not in dot.source
+
+    dot.body.node_records('A')[0].attrs['color'] = 'red'
+
+    assert 'red' in dot.source
+
+
+def test_source_cache_subgraph(cls):
+    child = cls(name='cluster_child')
+    dot = cls()
+    dot.subgraph(child, by_reference=True)
+    dot.node('A')
+    source = dot.source
+    assert dot.source is source
+
+    child.node('B')
+
+    assert dot.source == ''.join(dot) != source
+
+
+def test_source_cache_cycle(cls):
+    dot = cls()
+    child = cls()
+    dot.subgraph(child, by_reference=True)
+    assert dot.source
+
+    child.subgraph(dot, by_reference=True)
+
+    with pytest.raises(ValueError, match=r'cycle'):
+        dot.source
+
+
+def test_encoded_source(cls):
+    dot = cls(encoding='utf-8')
+    dot.node('Møøse')
+    encoded = dot.encoded_source
+    assert encoded == dot.source.encode('utf-8')
+    assert dot.encoded_source is encoded
+
+    dot.encoding = 'latin1'
+    assert dot.encoded_source == dot.source.encode('latin1')
+
+    dot.body = ['\tspam\n']
+    assert dot.encoded_source == ''.join(dot).encode('latin1')
+
+
+def test_fingerprint_incremental(mocker, cls):
+    def expected():
+        return hashlib.blake2b(''.join(dot).encode('utf-8'), digest_size=32).hexdigest()
+
+    dot = cls()
+    dot.node('A')
+    assert dot.fingerprint() == expected()
+    new_hasher = mocker.spy(graphviz.fingerprinting, 'new_hasher')
+
+    dot.edge('A', 'B')
+    dot.subgraph(cls(name='cluster_spam'))
+    fingerprint = dot.fingerprint()
+
+    new_hasher.assert_not_called()
+    assert fingerprint == expected()
+
+    dot.body[0] = '\tC\n'
+    assert dot.fingerprint() == expected() != fingerprint
+    new_hasher.assert_called_once()
+
+    dot.graph_attr['rankdir'] = 'LR'
+    assert dot.fingerprint() == expected()
+
+
+def test_copy_shares_body(cls):
+    dot = cls()
+    dot.edges(['AB', 'AC'])
+    source = dot.source
+
+    dup = dot.copy()
+    assert dup.body._base is dot.body
+    assert dup._source_cache.source is source
+
+    dup.node('B', color='red')
+    dot.node('C')
+
+    assert dup.source == ''.join(dup) == source[:-2] + '\tB [color=red]\n}\n'
+    assert dot.source == ''.join(dot) == source[:-2] + '\tC\n}\n'
+    assert dup.fingerprint() == graphviz.Source(dup.source).fingerprint()
+
+    dot.body[0] = '\t// spam\n'
+    assert dup.source == ''.join(dup) != dot.source
+    assert dup.body[0] != dot.body[0]
@@ -0,0 +1,216 @@
+import json
+
+import pytest
+
+import graphviz
+from graphviz import caching
+from graphviz import layouts
+
+LAYOUT_JSON = json.dumps({'name': '%3', 'bb': '0,0,54,108', '_subgraph_cnt': 1,
+                          'objects': [{'_gvid': 0, 'name': 'cluster_spam',
+                                       'bb': '8,8,46,100', 'nodes': [0]},
+                                      {'_gvid': 1, 'name': 'spam', 'pos': '27,90'},
+                                      {'_gvid': 2, 'name': 'spam eggs', 'pos': '27,18'}]})
+
+LAYOUT_XDOT = '''digraph {
+\tgraph [bb="0,0,62,108",
+\t\t_draw_="c 9 -#fffffe00 C 7 -#ffffff P 4 0 0 0 108 62 108 62 0 "];
+\tnode [label="\\N"];
+\tspam\t[height=0.5,
+\t\tlabel="spam; [1]",
+\t\tpos="27,90",
+\t\twidth=0.75];
+\t"spam \\"eggs\\""\t[pos="27,18"];
+\tspam -> "spam \\"eggs\\""\t[pos="e,27,36.104 27,71.697 27,63.983 27,54.712 27,\\
+46.112"];
+}
+'''
+
+
+@pytest.fixture
+def layout_cache():
+    old = caching.set_layout_cache_size(2)
+    yield caching.get_layout_cache()
+    caching.set_layout_cache_size(old)
+
+
+def test_positions_from_json():
+    positions = layouts.Positions.from_json(LAYOUT_JSON.encode('ascii'), engine='dot')
+
+    assert positions.engine == 'dot'
+    assert positions.nodes == {'spam': '27,90', 'spam eggs': '27,18'}
+    assert repr(positions) == "<Positions engine='dot' nodes=2>"
+
+
+@pytest.mark.parametrize(
+    'lines, expected',
+    [(['graph {\n', '}\n', '\n'],
+      ['graph {\n', '\tspam [pos="27,90"]\n', '\t"<eggs>" [pos="27,18"]\n', '}\n', '\n']),
+     (['graph { spam }'],
+      ['graph { spam \n', '\tspam [pos="27,90"]\n', '\t"<eggs>" [pos="27,18"]\n', '}'])])
+def test_positions_iterlines(lines, expected):
+    positions = layouts.Positions('dot', {'spam': '27,90', '<eggs>': '27,18'})
+
+    assert list(positions.iterlines(lines)) == expected
+
+
+def test_positions_iterlines_invalid():
+    positions = layouts.Positions('dot', {})
+
+    with pytest.raises(ValueError, match=r'closing brace'):
+        list(positions.iterlines(['graph {\n']))
+
+
+def test_layout_memoized_mocked(mocker, mock_pipe_lines, layout_cache):
+    mock_pipe_lines.return_value = LAYOUT_JSON.encode('ascii')
+    dot = graphviz.Graph()
+    dot.edge('spam', 'spam eggs')
+
+    positions = dot.layout(quiet=True)
+
+    assert dot.copy().layout() is positions
+    assert dot.layout(engine='neato') is not positions
+    mock_pipe_lines.assert_called_with('neato', 'json0', mocker.ANY,
+                                       input_encoding=dot.encoding, quiet=False)
+    assert mock_pipe_lines.call_count == 2
+    assert layout_cache.cache_info() == (1, 2, 0, 2, 2)
+
+
+def test_layout_restyled_mocked(mock_pipe_lines, layout_cache):
+    mock_pipe_lines.return_value = LAYOUT_JSON.encode('ascii')
+    dot = graphviz.Graph()
+    dot.edge('spam', 'spam eggs')
+    positions = dot.layout()
+
+    dot.graph_attr['bgcolor'] = 'black'
+    dot.node_attr.update(color='red', tooltip='Spam')
+
+    assert dot.layout() is positions
+    dot.node_attr['shape'] = 'box'
+    assert dot.layout() is not positions
+    assert mock_pipe_lines.call_count == 2
+
+
+def test_layout_invalid_engine():
+    with pytest.raises(ValueError, match=r'unknown engine'):
+        graphviz.Graph().layout(engine='spam')
+
+
+def test_layout_cache_disabled_mocked(mock_pipe_lines, layout_cache):
+    mock_pipe_lines.return_value = LAYOUT_JSON.encode('ascii')
+    caching.set_layout_cache_size(None)
+
+    assert caching.layout_cache_info() is None
+    graphviz.Graph().layout()
+    graphviz.Graph().layout()
+
+    assert mock_pipe_lines.call_count == 2
+
+
+def test_pipe_positioned_mocked(mocker, mock_pipe_lines):
+    positions = layouts.Positions('dot', {'spam': '27,90', 'eggs': '27,18'})
+    dot = graphviz.Graph()
+    dot.edge('spam', 'eggs')
+    dot.node('spam', color='red')
+
+    result = dot.pipe_positioned('svg', positions=positions)
+
+    assert result is mock_pipe_lines.return_value
+    mock_pipe_lines.assert_called_once_with('neato', 'svg', mocker.ANY,
+                                            input_encoding=dot.encoding,
+                                            renderer=None, formatter=None,
+                                            neato_no_op=2, quiet=False)
+    (_, _, lines), _ = mock_pipe_lines.call_args
+    pos_lines = '\tspam [pos="27,90"]\n\teggs [pos="27,18"]\n'
+    expected = dot.source.replace('}\n', pos_lines + '}\n')
+    assert ''.join(lines) == expected
+
+
+@pytest.mark.exe
+def test_pipe_positioned(format_='plain'):
+    dot = graphviz.Digraph()
+    dot.edges(['AB', 'AC'])
+    positions = dot.layout()
+
+    dot.node('A', shape='box')
+    result = dot.pipe_positioned(format_, positions=positions, encoding='ascii')
+
+    assert set(positions.nodes) == {'A', 'B', 'C'}
+    assert result.startswith('graph ')
+    assert 'box' in result
+
+
+def test_positions_from_dot():
+    positions = layouts.Positions.from_dot(LAYOUT_XDOT.encode('utf-8'), engine='neato')
+
+    assert positions.nodes == {'spam': '27,90', 'spam "eggs"': '27,18'}
+    assert positions.coordinates() == {'spam': (27.0, 90.0), 'spam "eggs"': (27.0, 18.0)}
+
+
+@pytest.mark.parametrize(
+    'head, expected',
+    [('\tspam', ['spam']),
+     ('\tspam -- eggs -- "ham:1":n:w ', ['spam', 'eggs', 'ham:1']),
+     ('\t-1.5 -> 42', ['-1.5', '42']),
+     ('\tgraph', None),
+     ('\trankdir=LR', None),
+     ('\tsubgraph cluster_spam', None),
+     ('\t{spam eggs} -- ham', None)])
+def test_node_names(head, expected):
+    assert layouts.node_names(head) == expected
+
+
+def test_incremental_layout_seed():
+    previous = layouts.Positions('neato', {'spam': '72,144', 'eggs': '0,0', 'gone': '1,1'})
+    session = layouts.IncrementalLayout(positions=previous)
+    lines = ['graph {\n', '\tspam -- eggs\n', '\tspam -- ham -- bacon\n',
+             '\tlonely\n', '}\n']
+
+    seed = session.seed(lines)
+
+    assert list(seed) == ['spam', 'eggs', 'ham', 'bacon']
+    assert seed['spam'] == '1,2'
+    assert seed['eggs'] == '0,0'
+    assert seed['ham'] == '1.5,2'
+    assert seed['bacon'] != seed['ham']
+
+
+def test_incremental_layout_seed_pin():
+    previous = layouts.Positions('neato', {'spam': '72,144'})
+    session = layouts.IncrementalLayout(pin=True, positions=previous)
+
+    assert session.seed(['graph {\n', '\tspam -- eggs\n', '}\n']) == {'spam': '1,2!',
+                                                                      'eggs': '1.5,2'}
+
+
+def test_incremental_layout_update_invalid():
+    session = layouts.IncrementalLayout()
+
+    with pytest.raises(ValueError, match=r'unknown layout output format'):
+        session.update(b'', format='plain')
+
+
+def test_incremental_layout_mocked(mocker, mock_pipe_lines):
+    mock_pipe_lines.return_value = LAYOUT_JSON.encode('ascii')
+    session = layouts.IncrementalLayout(engine='fdp')
+    dot = graphviz.Graph()
+    dot.edge('spam', 'spam eggs')
+
+    positions = session.layout(dot)
+
+    assert session.positions is positions
+    assert positions.engine == 'fdp'
+    (_, _, lines), _ = mock_pipe_lines.call_args
+    assert ''.join(lines) == dot.source
+
+    dot.edge('spam', 'ham')
+    assert session.update(LAYOUT_XDOT, format='xdot').nodes['spam'] == '27,90'
+    session.layout(dot, quiet=True)
+
+    mock_pipe_lines.assert_called_with('fdp', 'json0', mocker.ANY,
+                                       input_encoding=dot.encoding, quiet=True)
+    (_, _, lines), _ = mock_pipe_lines.call_args
+    pos_lines = ('\tspam [pos="0.375,1.25"]\n'
+                 '\t"spam eggs" [pos="0.875,1.25"]\n'
+                 '\tham [pos="0.00631556,1.58775"]\n')
+    assert ''.join(lines) == dot.source.replace('}\n', pos_lines + '}\n')
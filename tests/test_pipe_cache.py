@@ -0,0 +1,172 @@
+import sys
+import threading
+
+import pytest
+
+import graphviz
+from graphviz import caching
+
+
+def test_pipe_cache_get_decodes_once(mocker):
+    cache = caching.PipeCache(max_bytes=2**20)
+    pipe = mocker.Mock(return_value=b'sp\xc3\xa4m')
+    decode = mocker.Mock(side_effect=bytes.decode)
+
+    result = cache.get('key', pipe)
+    assert cache.get('key', pipe) is result
+    assert cache.get('key', pipe, encoding='utf-8', decode=decode) == 'sp\xe4m'
+    assert cache.get('key', pipe, encoding='utf-8', decode=decode) == 'sp\xe4m'
+
+    pipe.assert_called_once_with()
+    decode.assert_called_once_with(result, 'utf-8')
+    info = cache.cache_info()
+    assert (info.hits, info.misses, info.evictions) == (3, 1, 0)
+    assert info.currsize == sys.getsizeof(result) + sys.getsizeof('sp\xe4m')
+
+
+def test_pipe_cache_evicts_least_recently_used():
+    size = sys.getsizeof(b'spam')
+    cache = caching.PipeCache(max_bytes=2 * size)
+
+    for key in ['spam', 'eggs']:
+        cache.get(key, lambda: b'spam')
+    cache.get('spam', lambda: b'spam')  # mark as recently used
+    cache.get('ham', lambda: b'spam')
+
+    assert set(cache._entries) == {'spam', 'ham'}
+    assert cache.cache_info().evictions == 1
+    assert cache.cache_info().currsize == 2 * size
+
+
+def test_pipe_cache_pipe_raises():
+    cache = caching.PipeCache(max_bytes=2**20)
+
+    def pipe():
+        raise graphviz.CalledProcessError(1, ['dot'])
+
+    with pytest.raises(graphviz.CalledProcessError):
+        cache.get('key', pipe)
+
+    assert not cache._entries
+
+
+@pytest.mark.parametrize('fail', [False, True], ids=['result', 'exception'])
+def test_pipe_cache_concurrent_misses(mocker, fail):
+    cache = caching.PipeCache(max_bytes=2**20)
+    started = threading.Event()
+    release = threading.Event()
+    error = graphviz.CalledProcessError(1, ['dot'])
+
+    def pipe():
+        started.set()
+        assert release.wait(timeout=10)
+        if fail:
+            raise error
+        return b'spam'
+
+    pipe = mocker.Mock(side_effect=pipe)
+    results = []
+
+    def get():
+        try:
+            results.append(cache.get('key', pipe))
+        except graphviz.CalledProcessError as e:
+            results.append(e)
+
+    threads = [threading.Thread(target=get) for _ in range(2)]
+    threads[0].start()
+    assert started.wait(timeout=10)
+    threads[1].start()
+    while not cache.cache_info().hits:
+        threads[1].join(timeout=0.01)
+    release.set()
+    for t in threads:
+        t.join()
+
+    pipe.assert_called_once_with()
+    assert results == ([error] * 2 if fail else [b'spam'] * 2)
+    assert not cache._pending
+    assert cache.cache_info()[:2] == (1, 1)
+
+
+def test_pipe_cache_context_not_shared_with_threads(mocker):
+    mocker.patch('graphviz.caching._pipe_cache', None)
+    seen = []
+
+    with caching.pipe_cache() as cache:
+        thread = threading.Thread(target=lambda: seen.append(caching.get_pipe_cache()))
+        thread.start()
+        thread.join()
+        assert caching.get_pipe_cache() is cache
+
+    assert seen == [None]
+    assert caching.get_pipe_cache() is None
+
+
+def test_pipe_parallel_memoized(mock_pipe_lines):
+    mock_pipe_lines.return_value = b'<svg/>'
+    graphs = [graphviz.Graph(), graphviz.Graph()]
+
+    with caching.pipe_cache() as cache:
+        results = graphviz.pipe_parallel(graphs, max_workers=2, format='svg')
+        assert [r for _, r in results] == [b'<svg/>'] * 2
+
+    mock_pipe_lines.assert_called_once()
+    assert cache.cache_info()[:2] == (1, 1)
+
+
+def test_set_pipe_cache_size():
+    assert caching.set_pipe_cache_size(100) is None
+    try:
+        assert caching.pipe_cache_info().maxsize == 100
+    finally:
+        assert caching.set_pipe_cache_size(None) == 100
+    assert caching.get_pipe_cache() is None
+
+
+def test_graph_pipe_memoized(mock_pipe_lines, mock_pipe_lines_string):
+    mock_pipe_lines.return_value = b'<svg/>\r\n'
+    dot = graphviz.Digraph()
+    dot.edge('spam', 'eggs')
+
+    with caching.pipe_cache() as cache:
+        result = dot.pipe(format='svg')
+        assert dot.pipe(format='svg') is result
+        assert dot.copy().pipe(format='svg') is result
+        assert dot._repr_mimebundle_({'image/svg+xml'}) == {'image/svg+xml': '<svg/>\n'}
+        assert dot.pipe(format='svg', encoding='ascii') == '<svg/>\r\n'
+
+        dot.node('ham')
+        dot.pipe(format='svg')
+        dot.pipe(format='png', engine='neato')
+
+    assert caching.get_pipe_cache() is None
+    assert mock_pipe_lines.call_count == 3
+    mock_pipe_lines_string.assert_not_called()
+    info = cache.cache_info()
+    assert (info.hits, info.misses) == (4, 3)
+
+
+def test_graph_pipe_memoized_error_decoded(mock_pipe_lines):
+    mock_pipe_lines.side_effect = graphviz.CalledProcessError(1, ['dot'], b'',
+                                                              b'syntax error')
+    dot = graphviz.Source('graph {')
+
+    with caching.pipe_cache():
+        with pytest.raises(graphviz.CalledProcessError) as info:
+            dot.pipe(encoding='utf-8')
+
+    assert info.value.stderr == 'syntax error'
+
+
+def test_graph_pipe_multi_memoized(mocker):
+    mock_pipe_multi = mocker.patch('graphviz.backend.piping.pipe_multi', autospec=True,
+                                   return_value={'svg': b'<svg/>', 'png': b'PNG'})
+    dot = graphviz.Graph()
+
+    with caching.pipe_cache():
+        assert dot.pipe_multi(['svg', 'png']) == {'svg': b'<svg/>', 'png': b'PNG'}
+        assert dot.pipe_multi(['png', 'svg']) == {'png': b'PNG', 'svg': b'<svg/>'}
+        assert dot.pipe(format='png') == b'PNG'
+
+    mock_pipe_multi.assert_called_once()
@@ -0,0 +1,133 @@
+import pytest
+
+import graphviz
+from graphviz import plain
+
+import _common
+
+PLAIN_EXT = ('graph 1 0.75 1.5\n'
+             'node spam 0.375 1.25 0.75 0.5 spam solid ellipse black lightgrey\n'
+             'node "eggs \\"ham\\"" 0.375 0.25 1.5 0.5 "Eggs Ham" filled box red "#ff0000"\n'
+             'edge spam:s "eggs \\"ham\\"":n:w 2 0.375 0.99 0.375 0.65 solid black\n'
+             'edge spam spam 1 0.375 0.5 "self loop" 1 1.25 dashed blue\n'
+             'stop\n')
+
+
+@pytest.mark.parametrize(
+    'data', [PLAIN_EXT, PLAIN_EXT.encode('utf-8'), _common.chunked(PLAIN_EXT, 1)])
+def test_iterparse(data):
+    records = list(plain.iterparse(data))
+
+    assert records == [plain.PlainGraph(1.0, 0.75, 1.5),
+                       plain.PlainNode('spam', 0.375, 1.25, 0.75, 0.5, 'spam',
+                                       'solid', 'ellipse', 'black', 'lightgrey'),
+                       plain.PlainNode('eggs "ham"', 0.375, 0.25, 1.5, 0.5, 'Eggs Ham',
+                                       'filled', 'box', 'red', '"#ff0000"'),
+                       plain.PlainEdge('spam', 'eggs "ham"', ((0.375, 0.99), (0.375, 0.65)),
+                                       'solid', 'black', tailport='s', headport='n:w'),
+                       plain.PlainEdge('spam', 'spam', ((0.375, 0.5),), 'dashed', 'blue',
+                                       label='self loop', label_x=1.0, label_y=1.25),
+                       plain.PlainStop()]
+    assert records[0] != plain.PlainStop()
+    assert repr(records[0]) == 'PlainGraph(scale=1.0, width=0.75, height=1.5)'
+
+
+def test_iterparse_lazy():
+    consumed = []
+
+    def chunks():
+        try:
+            for line in PLAIN_EXT.encode('ascii').splitlines(keepends=True):
+                consumed.append(line)
+                yield line
+        finally:
+            consumed.append(None)
+
+    records = plain.iterparse(chunks())
+
+    assert next(records) == plain.PlainGraph(1.0, 0.75, 1.5)
+    assert len(consumed) == 1
+    records.close()
+    assert consumed[-1] is None
+
+
+@pytest.mark.parametrize(
+    'line, expected',
+    [('node a 1 2 3 4 <b>x y</b> solid ellipse black lightgrey\n',
+      plain.PlainNode('a', 1.0, 2.0, 3.0, 4.0, '<b>x y</b>',
+                      'solid', 'ellipse', 'black', 'lightgrey')),
+     ('node a 1 2 3 4 <<b>x y</b>> solid ellipse black lightgrey\n',
+      plain.PlainNode('a', 1.0, 2.0, 3.0, 4.0, '<<b>x y</b>>',
+                      'solid', 'ellipse', 'black', 'lightgrey')),
+     ('node a 1 2 3 4 <<font color="red">x  y</font>> solid box black lightgrey\n',
+      plain.PlainNode('a', 1.0, 2.0, 3.0, 4.0, '<<font color="red">x  y</font>>',
+                      'solid', 'box', 'black', 'lightgrey')),
+     ('edge a b 1 1 2 <<i>p q</i>> 3 4 solid black\n',
+      plain.PlainEdge('a', 'b', ((1.0, 2.0),), 'solid', 'black',
+                      label='<<i>p q</i>>', label_x=3.0, label_y=4.0)),
+     ('edge a b 1 1 2 <i>p q</i> 3 4 solid black\n',
+      plain.PlainEdge('a', 'b', ((1.0, 2.0),), 'solid', 'black',
+                      label='<i>p q</i>', label_x=3.0, label_y=4.0))])
+def test_iterparse_html_label(line, expected):
+    assert list(plain.iterparse(line.encode('utf-8'))) == [expected]
+
+
+@pytest.mark.parametrize(
+    'line, match',
+    [('graph 1 1\n', r'graph with 2 fields \(expected 3\)'),
+     ('node spam 1 1 1 1\n', r'node with 5 fields \(expected 10\)'),
+     ('edge spam eggs 1 1 1 black\n', r'edge with 1 points and 6 fields \(expected 7 or 10\)'),
+     ('stop now\n', r'stop with 1 fields \(expected 0\)'),
+     ('spam 1 2 3\n', r"unknown statement: 'spam'")])
+def test_iterparse_invalid_fields(line, match):
+    with pytest.raises(ValueError, match=match):
+        list(plain.iterparse(line))
+
+
+@pytest.mark.parametrize(
+    'line', ['spam 1 2 3\n', 'graph 1 1\n', 'node spam 1 1 1 1\n',
+             'edge spam eggs x 1 1 solid black\n', 'edge spam eggs 2 1 1 solid black\n',
+             'edge spam eggs 1 1 1 black\n', 'stop now\n'])
+def test_iterparse_invalid(line):
+    records = plain.iterparse('graph 1 1 1\n' + line)
+
+    assert next(records) == plain.PlainGraph(1.0, 1.0, 1.0)
+    with pytest.raises(ValueError, match=r'invalid plain layout output line 2'):
+        next(records)
+
+
+def test_iter_plain_mocked(mocker):
+    mock_pipe_lines_iter = mocker.patch('graphviz.backend.piping.pipe_lines_iter',
+                                        autospec=True,
+                                        return_value=_common.chunked(PLAIN_EXT, 16))
+    dot = graphviz.Graph()
+    dot.edge('spam', 'eggs "ham"')
+
+    records = dot.iter_plain('plain-ext', engine='neato', quiet=True, chunk_size=16)
+
+    assert [type(r).__name__ for r in records] == ['PlainGraph', 'PlainNode', 'PlainNode',
+                                                   'PlainEdge', 'PlainEdge', 'PlainStop']
+    mock_pipe_lines_iter.assert_called_once_with('neato', 'plain-ext', mocker.ANY,
+                                                 input_encoding=dot.encoding,
+                                                 renderer=None, formatter=None,
+                                                 neato_no_op=None, quiet=True,
+                                                 chunk_size=16)
+
+
+def test_iter_plain_invalid_format():
+    with pytest.raises(ValueError, match=r'unknown plain output format'):
+        graphviz.Graph().iter_plain('json')
+
+
+@pytest.mark.exe
+def test_iter_plain():
+    dot = graphviz.Digraph()
+    dot.edges(['AB', 'AC'])
+
+    records = list(dot.iter_plain())
+
+    assert isinstance(records[0], plain.PlainGraph)
+    assert [r.name for r in records if isinstance(r, plain.PlainNode)] == ['A', 'B', 'C']
+    assert [(r.tail, r.head) for r in records
+            if isinstance(r, plain.PlainEdge)] == [('A', 'B'), ('A', 'C')]
+    assert records[-1] == plain.PlainStop()
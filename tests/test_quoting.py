@@ -63,3 +63,43 @@ def test_nohtml(string, expected, expected_quoted):
     quoted = quoting.quote(result)
     assert isinstance(quoted, str)
     assert quoted == expected_quoted
+
+
+@pytest.fixture
+def quote_cache():
+    old = quoting.set_quote_cache_size(8)
+    yield
+    quoting.set_quote_cache_size(old)
+
+
+@pytest.mark.usefixtures('quote_cache')
+def test_quote_cache():
+    assert quoting.quote('spam eggs') == quoting.quote('spam eggs') == '"spam eggs"'
+    assert quoting.quote('spam') == 'spam'  # fast path
+
+    info = quoting.quote_cache_info()['quote']
+    assert (info.hits, info.misses, info.maxsize, info.currsize) == (1, 1, 8, 1)
+
+
+@pytest.mark.usefixtures('quote_cache')
+def test_quote_cache_nohtml():
+    assert quoting.quote('<>') == '<>'
+    assert quoting.quote(graphviz.nohtml('<>')) == '"<>"'
+    assert quoting.quote('<>') == '<>'
+    assert quoting.quote_cache_info()['quote'].currsize == 2
+
+
+@pytest.mark.usefixtures('quote_cache')
+@pytest.mark.parametrize(
+    'func, identifier', [(quoting.quote, 'spam\\'),
+                         (quoting.quote_edge, 'spam:eggs\\')])
+def test_quote_cache_warns_on_hit(func, identifier):
+    for _ in range(2):
+        with pytest.warns(graphviz.DotSyntaxWarning, match=r'syntax error'):
+            func(identifier)
+
+
+@pytest.mark.parametrize('maxsize', [-1])
+def test_set_quote_cache_size_invalid(maxsize):
+    with pytest.raises(ValueError, match=r'maxsize'):
+        quoting.set_quote_cache_size(maxsize)
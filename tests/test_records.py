@@ -0,0 +1,239 @@
+import pickle
+
+import pytest
+
+import graphviz
+from graphviz import records
+
+BASE_GRAPHS = [graphviz.Graph, graphviz.Digraph]
+
+
+@pytest.fixture(params=BASE_GRAPHS)
+def cls(request):
+    return request.param
+
+
+def build(dot):
+    dot.attr('graph', rankdir='LR')
+    dot.attr(spam='eggs')
+    dot.node('A', 'King Arthur', shape='box')
+    dot.node('B C', _attributes={'color': 'red'})
+    dot.edge('A:n', 'B C', label='spam', constraint='false')
+    dot.edges(['AB', 'BC'])
+    dot.edges(['A', 'B'], ['C', 'C'], color=['red', None])
+    dot.nodes(['D', 'E'], label=['ham', None], shape='oval')
+    with dot.subgraph(name='cluster_spam') as c:
+        c.node('F')
+        c.edge('F', 'A')
+    dot.body.append('\t// verbatim\n')
+    return dot
+
+
+def test_records_source(cls):
+    expected = build(cls())
+    dot = build(cls(storage='records'))
+
+    assert isinstance(dot.body, records.RecordList)
+    assert dot.source == expected.source
+    assert dot.body == expected.body
+    assert list(dot.body) == expected.body
+    assert dot.body[2] == expected.body[2]
+    assert dot.body[1:3] == expected.body[1:3]
+
+
+def test_records_invalid_storage(cls):
+    with pytest.raises(ValueError, match=r'unknown storage'):
+        cls(storage='spam')
+
+
+def test_records_update(cls):
+    dot = cls(storage='records')
+    dot.node('A')
+    dot.edge('A', 'B')
+    dot.edge('A', 'B', color='red')
+
+    node, = dot.body.node_records('A')
+    node.label = 'King Arthur'
+    node.attrs['shape'] = 'box'
+    for edge in dot.body.edge_records('A', 'B'):
+        edge.attrs['color'] = 'blue'
+
+    expected = cls()
+    expected.node('A', 'King Arthur', shape='box')
+    expected.edge('A', 'B', color='blue')
+    expected.edge('A', 'B', color='blue')
+    assert dot.source == expected.source
+
+
+def test_records_remove(cls):
+    dot = cls(storage='records')
+    dot.node('A')
+    dot.node('B')
+    dot.edge('A', 'B')
+
+    dot.body.remove_node('A')
+    dot.body.remove_edges('A', 'B')
+    assert dot.body.node_records('A') == []
+    assert len(dot.body) == 1
+    assert dot.body == ['\tB\n'] and dot.body[0] == '\tB\n'
+    assert dot.source == cls(body=['\tB\n']).source
+
+    dot.body.purge()
+    assert list.__len__(dot.body) == 1
+
+
+@pytest.mark.parametrize('change', [lambda body: body.__setitem__(0, '\tx\n'),
+                                    lambda body: body.__setitem__(slice(1, None), ['\tx\n']),
+                                    lambda body: body.__delitem__(0),
+                                    lambda body: body.insert(0, '\tx\n'),
+                                    lambda body: body.pop(0),
+                                    lambda body: body.remove('\tC\n'),
+                                    lambda body: body.clear(),
+                                    lambda body: body.sort(reverse=True),
+                                    lambda body: body.reverse(),
+                                    lambda body: body.__imul__(2),
+                                    lambda body: body.__imul__(0),
+                                    lambda body: body.append('\tx\n')])
+def test_records_list_change(cls, change):
+    dot = cls(storage='records')
+    dot.node('A')
+    dot.node('B')
+    dot.edge('A', 'B')
+    dot.node('C')
+    dot.body.remove_edges('A', 'B')
+    expected = ['\tA\n', '\tB\n', '\tC\n']
+
+    assert dot.body == expected
+    assert ('\tC\n' in dot.body, dot.body.index('\tC\n'),
+            dot.body.count('\tA\n')) == (True, 2, 1)
+    assert (dot.body[-1], dot.body[:2]) == (expected[-1], expected[:2])
+    assert list(reversed(dot.body)) == expected[::-1]
+
+    change(dot.body)
+    change(expected)
+    assert dot.body == expected and len(dot.body) == len(expected)
+    assert dot.source == cls(body=expected).source
+    assert dot.body.edge_records('A', 'B') == []
+
+
+def test_records_removed_set_directly(cls):
+    dot = cls(storage='records')
+    dot.node('A')
+    dot.node('B')
+    (record,) = dot.body.node_records('A')
+
+    record.removed = True
+    record.removed = True
+    assert len(dot.body) == 1 and dot.body == ['\tB\n']
+
+    del dot.body[-1]
+    assert len(dot.body) == 0 and dot.body == []
+
+    record.removed = False
+    assert len(dot.body) == 0 and dot.body == []
+
+
+def test_records_add_mul(cls):
+    dot = cls(storage='records')
+    dot.node('A')
+
+    assert dot.body + ['\tB\n'] == ['\tA\n', '\tB\n']
+    assert ['\tB\n'] + dot.body == ['\tB\n', '\tA\n']
+    assert ''.join(dot.body * 2) == ''.join(2 * dot.body) == '\tA\n\tA\n'
+
+
+def test_records_pickle(cls):
+    dot = cls(storage='records')
+    dot.node('A', color='red')
+    dot.node('B')
+    dot.body.remove_node('B')
+
+    result = pickle.loads(pickle.dumps(dot))
+
+    assert isinstance(result.body, records.RecordList)
+    assert result.body == ['\tA [color=red]\n'] and len(result.body) == 1
+    assert result.body.node_records('A')[0].attrs == {'color': 'red'}
+    assert result.source == dot.source
+
+
+def test_records_imul_copies(cls):
+    dot = cls(storage='records')
+    dot.node('A')
+
+    dot.body *= 2
+    dot.body.node_records('A')[0].attrs['color'] = 'red'
+
+    assert dot.body == ['\tA [color=red]\n', '\tA\n']
+
+
+def test_records_reindex(cls):
+    dot = cls(storage='records')
+    dot.node('A')
+    assert len(dot.body.node_records('A')) == 1
+
+    del dot.body[0]
+    assert dot.body.node_records('A') == []
+
+    dot.node('A')
+    dot.body.insert(0, '\t// spam\n')
+    assert len(dot.body.node_records('A')) == 1
+
+    dot.clear()
+    assert dot.body.node_records('A') == []
+
+
+def test_records_copy(cls):
+    dot = cls(storage='records')
+    dot.node('A')
+
+    dup = dot.copy()
+    assert isinstance(dup.body, records.RecordList)
+    assert dup.__dict__ == dot.__dict__
+
+    dup.body.node_records('A')[0].attrs['color'] = 'red'
+    assert dot.body.node_records('A')[0].attrs == {}
+
+
+def test_copy_on_write():
+    base = records.TrackedList(['a\n', 'b\n'])
+    dup = base.copy()
+    assert isinstance(dup, records.CopyOnWriteList)
+    assert list.__len__(dup) == 0
+
+    dup.append('c\n')
+    base.append('d\n')
+    assert dup == ['a\n', 'b\n', 'c\n'] and len(dup) == 3
+    assert (dup[0], dup[-1], dup[1:]) == ('a\n', 'c\n', ['b\n', 'c\n'])
+    assert 'b\n' in dup and 'd\n' not in dup
+    assert repr(dup) == "['a\\n', 'b\\n', 'c\\n']"
+
+    base[0] = 'spam\n'
+    assert type(dup) is records.TrackedList
+    assert dup == ['a\n', 'b\n', 'c\n']
+    assert base == ['spam\n', 'b\n', 'd\n']
+
+
+@pytest.mark.parametrize('change', [lambda items: items.__setitem__(0, 'x\n'),
+                                    lambda items: items.__delitem__(0),
+                                    lambda items: items.insert(0, 'x\n'),
+                                    lambda items: items.pop(0),
+                                    lambda items: items.remove('a\n'),
+                                    lambda items: items.clear(),
+                                    lambda items: items.sort(reverse=True),
+                                    lambda items: items.reverse(),
+                                    lambda items: items.__imul__(2),
+                                    lambda items: items.__imul__(0)])
+def test_copy_on_write_change(change):
+    base = records.TrackedList(['a\n', 'b\n'])
+    dup = base.copy()
+    dup.append('c\n')
+    nested = dup.copy()
+    expected = ['a\n', 'b\n', 'c\n']
+
+    change(dup)
+    assert type(dup) is records.TrackedList
+    assert base == ['a\n', 'b\n'] and nested == expected
+
+    expected_changed = list(expected)
+    change(expected_changed)
+    assert dup == expected_changed
@@ -1,5 +1,7 @@
 import functools
 import os
+import threading
+import time
 import warnings
 
 import pytest
@@ -66,3 +68,39 @@ def test_deprecate_positional_args_category_none_should_disable():
         warnings.simplefilter('error')  # should fail if warnings are emitted
         assert func('first', 'second', third='third', extra='extra') is result
         assert func('first', 'second', 'third', extra='extra') is result
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_map_parallel(ordered, n_items=4):
+    barrier = threading.Barrier(n_items, timeout=10)
+
+    def func(item):
+        barrier.wait()  # all items run concurrently
+        if item == 'spam':
+            raise RuntimeError(item)
+        return item.upper()
+
+    items = ['a', 'spam', 'b', 'c']
+    results = list(_tools.map_parallel(func, items, max_workers=n_items, ordered=ordered))
+
+    if ordered:
+        assert [i for i, _ in results] == list(range(n_items))
+    results.sort(key=lambda r: r[0])
+    assert [r for _, r in results if not isinstance(r, Exception)] == ['A', 'B', 'C']
+    assert isinstance(results[1][1], RuntimeError)
+
+
+def test_map_parallel_max_workers():
+    active = []
+    lock = threading.Lock()
+
+    def func(item):
+        with lock:
+            active.append(threading.current_thread().name)
+        time.sleep(0.01)
+        return item
+
+    results = dict(_tools.map_parallel(func, range(6), max_workers=2))
+
+    assert results == dict(enumerate(range(6)))
+    assert len(set(active)) <= 2
@@ -0,0 +1,102 @@
+import pytest
+
+import graphviz
+from graphviz import topology
+
+
+@pytest.fixture
+def cosmetic_attributes():
+    old = topology.get_cosmetic_attributes()
+    yield
+    topology.set_cosmetic_attributes(old)
+
+
+@pytest.mark.parametrize(
+    'line, expected',
+    [('\tspam\n', '\tspam\n'),
+     ('\tspam -> eggs\n', '\tspam -> eggs\n'),
+     ('\tsubgraph cluster_spam {\n', '\tsubgraph cluster_spam {\n'),
+     ('// comment\n', ''),
+     ('\tspam [label="Spam [1]" color=red]\n', '\tspam [label="Spam [1]"]\n'),
+     ('\t"spam [1]" [color="red" shape=box]\n', '\t"spam [1]" [shape=box]\n'),
+     ('\tspam [color = red, "shape"=box; style=filled]\n', '\tspam ["shape"=box]\n'),
+     ('\tspam [label=<<b>spam</b>> tooltip=<<i>eggs</i>>]\n',
+      '\tspam [label=<<b>spam</b>>]\n'),
+     ('\tspam [label="say \\"hi\\"" URL="https://example.org"]\n',
+      '\tspam [label="say \\"hi\\""]\n'),
+     ('\tnode [color=red]\n', '\tnode\n'),
+     ('\trankdir=LR bgcolor=black\n', '\trankdir=LR\n'),
+     ('\tbgcolor=black\n', ''),
+     ('\tspam [label="spam]\n', '\tspam [label="spam]\n'),
+     ('\tspam [label=<<b>spam]\n', '\tspam [label=<<b>spam]\n')])
+def test_strip_line(line, expected):
+    assert topology.strip_line(line) == expected
+
+
+def test_set_cosmetic_attributes(cosmetic_attributes):
+    old = topology.set_cosmetic_attributes(['label'])
+
+    assert old == topology.COSMETIC_ATTRIBUTES
+    assert topology.strip_line('\tspam [label=Spam color=red]\n') == '\tspam [color=red]\n'
+
+
+def test_set_cosmetic_attributes_invalid():
+    with pytest.raises(TypeError, match=r'iterable of names'):
+        topology.set_cosmetic_attributes('color')
+
+
+def _build(dot, *, color, tooltip):
+    dot.graph_attr.update(rankdir='LR', bgcolor=color)
+    dot.node('spam', 'Spam', color=color, tooltip=tooltip)
+    dot.edge('spam', 'eggs', _attributes={'color': color})
+    dot.edge('eggs', 'ham')
+    with dot.subgraph(name='cluster_bacon') as c:
+        c.attr(style='filled', fillcolor=color)
+        c.node('bacon', fontcolor=color)
+    return dot
+
+
+@pytest.mark.parametrize(
+    'storage', ['lines', 'records', 'compact'])
+def test_fingerprint_topology_ignores_cosmetic(storage):
+    red = _build(graphviz.Digraph(comment='red', storage=storage),
+                 color='red', tooltip='Spam')
+    blue = _build(graphviz.Digraph(storage=storage), color='blue', tooltip=None)
+
+    assert red.fingerprint() != blue.fingerprint()
+    assert red.fingerprint(topology=True) == blue.fingerprint(topology=True)
+
+    lines = _build(graphviz.Digraph(), color='green', tooltip=None)
+    assert red.fingerprint(topology=True) == lines.fingerprint(topology=True)
+
+    source = graphviz.Source(blue.source)
+    assert source.fingerprint(topology=True) == blue.fingerprint(topology=True)
+
+
+@pytest.mark.parametrize(
+    'change', [lambda d: d.node('spam', shape='box'),
+               lambda d: d.edge('ham', 'spam'),
+               lambda d: d.attr(rankdir='TB'),
+               lambda d: d.node_attr.update(fontsize='20')])
+def test_fingerprint_topology_changed(change):
+    dot = _build(graphviz.Digraph(), color='red', tooltip=None)
+    key = dot.fingerprint(topology=True)
+
+    change(dot)
+
+    assert dot.fingerprint(topology=True) != key
+
+
+def test_fingerprint_topology_records(cosmetic_attributes):
+    dot = graphviz.Graph(storage='records')
+    dot.node('spam', 'Spam', color='red')
+    key = dot.fingerprint(topology=True)
+
+    dot.body.node_records('spam')[0].attrs['color'] = 'blue'
+    assert dot.fingerprint(topology=True) == key
+
+    dot.body.remove_node('spam')
+    assert dot.fingerprint(topology=True) != key
+
+    topology.set_cosmetic_attributes({'label'})
+    assert graphviz.Graph(storage='records').fingerprint(topology=True) != key
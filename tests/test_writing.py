@@ -0,0 +1,226 @@
+import io
+import socket
+import subprocess
+
+import pytest
+
+import graphviz
+
+WRITER_CLASSES = [graphviz.GraphWriter, graphviz.DigraphWriter]
+
+GRAPH_CLASSES = {graphviz.GraphWriter: graphviz.Graph,
+                 graphviz.DigraphWriter: graphviz.Digraph}
+
+
+def build(dot):
+    dot.attr('node', shape='box')
+    dot.node('A', 'King Arthur')
+    dot.nodes(['B', 'L'], label=['Sir Bedevere', None])
+    dot.edge('A', 'B', color='red')
+    dot.edges(['AB', 'AL'])
+    with dot.subgraph(name='cluster_knights', graph_attr={'label': 'knights'}) as c:
+        c.edge('B', 'L')
+        with c.subgraph() as s:
+            s.node('spam')
+    dot.attr(rank='same')
+
+
+@pytest.fixture(params=WRITER_CLASSES, ids=lambda c: c.__name__)
+def cls(request):
+    return request.param
+
+
+def test_source(cls):
+    kwargs = {'name': 'round-table', 'comment': 'The Round Table',
+              'graph_attr': {'rankdir': 'LR'}, 'body': ['\t// spam\n']}
+    expected = GRAPH_CLASSES[cls](**kwargs)
+    build(expected)
+
+    buf = io.StringIO()
+    with cls(buf, **kwargs) as w:
+        build(w)
+        assert not w.closed
+
+    assert w.closed
+    assert buf.getvalue() == expected.source
+
+
+def test_streams_on_creation(cls):
+    buf = io.StringIO()
+    w = cls(buf, name='spam')
+    assert buf.getvalue().endswith('spam {\n')
+
+    w.edge('A', 'B')
+    assert buf.getvalue().endswith('\tA -- B\n' if not w.directed else '\tA -> B\n')
+
+    w.close()
+    w.close()
+    assert buf.getvalue().endswith('}\n')
+
+
+def test_subgraph_instance(cls):
+    graph = GRAPH_CLASSES[cls](name='cluster_spam')
+    graph.node('eggs')
+
+    buf = io.StringIO()
+    with cls(buf) as w:
+        w.subgraph(graph)
+
+    assert buf.getvalue().splitlines()[1:-1] == ['\tsubgraph cluster_spam {',
+                                                 '\t\teggs',
+                                                 '\t}']
+
+
+def test_binary_file(cls, encoding='latin1'):
+    buf = io.BytesIO()
+    with cls(buf, encoding=encoding) as w:
+        w.node('Møøse')
+
+    assert buf.getvalue().decode(encoding).splitlines()[1] == '\t"Møøse"'
+
+
+def test_path(cls, tmp_path):
+    filepath = tmp_path / 'spam.gv'
+    with cls(filepath) as w:
+        w.node('Møøse')
+
+    assert w._file.closed
+    assert filepath.read_text(encoding='utf-8').splitlines()[1] == '\t"Møøse"'
+
+
+def test_socket(cls):
+    reader, writer = socket.socketpair()
+    with reader, writer:
+        with cls(writer) as w:
+            w.node('spam')
+        writer.shutdown(socket.SHUT_WR)
+        with reader.makefile('rb') as f:
+            result = f.read()
+
+    assert result.decode('utf-8').splitlines()[1:] == ['\tspam', '}']
+
+
+def test_write_closed(cls):
+    w = cls(io.StringIO())
+    w.close()
+
+    with pytest.raises(ValueError, match=r'closed'):
+        w.node('spam')
+
+    with pytest.raises(ValueError, match=r'closed'):
+        w.subgraph(name='spam')
+
+
+def test_write_parent_while_subgraph_open(cls):
+    w = cls(io.StringIO())
+    with w.subgraph(name='spam') as s:
+        with pytest.raises(ValueError, match=r'subgraph is open'):
+            w.node('eggs')
+
+        with pytest.raises(ValueError, match=r'subgraph is open'):
+            w.subgraph(name='eggs')
+
+        s.node('ham')
+
+    w.node('eggs')
+
+
+def test_abort_on_exception(cls, tmp_path):
+    filepath = tmp_path / 'spam.gv'
+    with pytest.raises(RuntimeError, match=r'spam'):
+        with cls(filepath) as w:
+            w.node('spam')
+            raise RuntimeError('spam')
+
+    assert w.closed
+    assert w._file.closed
+    assert not filepath.read_text(encoding='utf-8').endswith('}\n')
+
+
+@pytest.mark.parametrize('method', ['__iter__', 'copy', 'clear'])
+def test_unsupported(cls, method):
+    w = cls(io.StringIO())
+    with pytest.raises(TypeError, match=r'writes its lines'):
+        getattr(w, method)()
+
+
+def test_missing_file(cls):
+    with pytest.raises(TypeError, match=r'missing file'):
+        cls()
+
+
+def test_popen_mocked(mocker, cls, quiet, outfile='spam.svg'):
+    mock_popen = mocker.patch('subprocess.Popen', autospec=True)
+    proc = mock_popen.return_value
+    proc.configure_mock(args=['dot'], returncode=0, stdin=io.BytesIO(),
+                        stdout=io.BytesIO(b'<svg/>'), stderr=io.BytesIO(b''))
+
+    w = cls.popen('neato', 'svg', outfile, quiet=quiet, name='spam')
+    w.edge('A', 'B')
+    written = proc.stdin.getvalue()
+    w.close()
+
+    assert written.startswith(b'graph spam {\n' if not w.directed
+                              else b'digraph spam {\n')
+    assert w.stdout == b'<svg/>'
+    assert proc.stdin.closed and proc.stdout.closed and proc.stderr.closed
+    assert mock_popen.call_args.args == ([graphviz.DOT_BINARY,
+                                          '-Kneato', '-Tsvg', '-o', outfile],)
+    assert mock_popen.call_args.kwargs['stdin'] is subprocess.PIPE
+    proc.wait.assert_called_once_with()
+    proc.communicate.assert_not_called()
+
+
+def test_popen_mocked_abort(mocker, cls):
+    mock_popen = mocker.patch('subprocess.Popen', autospec=True)
+    proc = mock_popen.return_value
+    proc.configure_mock(args=['dot'], returncode=-9, stdin=io.BytesIO(),
+                        stdout=io.BytesIO(), stderr=io.BytesIO())
+
+    with pytest.raises(RuntimeError):
+        with cls.popen('dot', 'svg') as w:
+            raise RuntimeError
+
+    proc.kill.assert_called_once_with()
+    proc.wait.assert_called_once_with()
+    assert w.stdout is None
+
+
+class BrokenPipe(io.BytesIO):
+
+    def __init__(self, *, after: int) -> None:
+        super().__init__()
+        self.after = after
+
+    def write(self, data: bytes) -> int:
+        if self.after <= 0:
+            raise BrokenPipeError
+        self.after -= 1
+        return super().write(data)
+
+
+@pytest.mark.parametrize('after', [0, 2])
+def test_popen_mocked_broken_pipe(mocker, capsys, cls, after):
+    mock_popen = mocker.patch('subprocess.Popen', autospec=True)
+    proc = mock_popen.return_value
+    proc.configure_mock(args=['dot'], returncode=1, stdin=BrokenPipe(after=after),
+                        stdout=io.BytesIO(), stderr=io.BytesIO(b'Error: spam\n'))
+
+    with pytest.raises(graphviz.CalledProcessError, match=r'spam') as info:
+        with cls.popen('dot', 'svg', quiet=True) as w:
+            with w.subgraph() as s:
+                s.edge('A', 'B')
+
+    assert info.value.returncode == 1
+    proc.wait.assert_called_once_with()
+    proc.kill.assert_not_called()
+    assert capsys.readouterr() == ('', '')
+
+
+@pytest.mark.exe
+def test_popen(cls):
+    with cls.popen('dot', 'plain') as w:
+        w.edge('spam', 'eggs')
+
+    assert w.stdout.startswith(b'graph ')
+    assert b'node spam ' in w.stdout